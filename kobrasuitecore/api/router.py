@@ -15,6 +15,7 @@ from homelife.views.medication_views import MedicationViewSet
 from homelife.views.pet_views import PetViewSet
 from homelife.views.shared_calendar_event_views import SharedCalendarEventViewSet
 from homelife.views.workout_routine_views import WorkoutRoutineViewSet
+from hq.views.agenda_views import AgendaViewSet
 from hq.views.task_category_progress_views import TaskCategoryProgressViewSet
 from hq.views.school_profile_views import SchoolProfileViewSet
 from hq.views.user_profile_views import UserProfileViewSet
@@ -52,6 +53,7 @@ profile_router.register('work_profile', WorkProfileViewSet, basename='work_profi
 profile_router.register('finance_profile', FinanceProfileViewSet, basename='finance_profile')
 profile_router.register('homelife_profile', HomeLifeProfileViewSet, basename='homelife_profile')
 profile_router.register('task', TaskCategoryProgressViewSet, basename='task_category_progress')
+profile_router.register('agenda', AgendaViewSet, basename='agenda')
 
 
 # SCHOOL
@@ -0,0 +1,103 @@
+"""
+------------------Prologue--------------------
+File Name: consumers.py
+Path: kobrasuitecore/finances/consumers.py
+
+Description:
+Defines a WebSocket consumer that streams live quotes for the tickers in a user's stock portfolios
+and watchlists. Sockets join one channel-layer group per ticker and the shared QuotePoller fans
+price changes out to those groups, so clients no longer poll the portfolio stocks endpoint.
+
+Input:
+WebSocket connections from authenticated users, plus 'refresh' and 'ping' messages.
+
+Output:
+An initial quote snapshot followed by per-ticker quote messages.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import json
+import logging
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from finances.models import PortfolioStock, WatchlistStock
+from finances.utils.quote_poller import get_quote_poller, quote_group, quote_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+class PortfolioQuotesConsumer(AsyncWebsocketConsumer):
+    async def connect(self):
+        user = self.scope['user']
+        self.tickers = set()
+        if not user.is_authenticated:
+            logger.warning("Quote stream rejected: unauthenticated user")
+            await self.close(code=4003)
+            return
+        await self.accept()
+        await self._subscribe(await self.load_tickers())
+        logger.info(f"User '{user.username}' subscribed to quotes for {sorted(self.tickers)}")
+
+    async def disconnect(self, close_code):
+        await self._unsubscribe(set(self.tickers))
+        logger.info(f"Quote stream closed with code {close_code}")
+
+    async def receive(self, text_data=None, bytes_data=None):
+        if not text_data:
+            return
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON received: {e}")
+            return
+
+        msg_type = data.get("type")
+        if msg_type == "refresh":
+            tickers = await self.load_tickers()
+            await self._unsubscribe(self.tickers - tickers)
+            await self._subscribe(tickers - self.tickers)
+        elif msg_type == "ping":
+            await self.send(text_data=json.dumps({"type": "pong", "timestamp": quote_timestamp()}))
+        else:
+            logger.debug(f"Unhandled message type: {msg_type}")
+
+    async def quote_tick(self, event):
+        await self.send(text_data=json.dumps({
+            "type": "quote",
+            "ticker": event.get("ticker"),
+            "price": event.get("price"),
+            "timestamp": event.get("timestamp"),
+        }))
+
+    async def _subscribe(self, tickers):
+        if not tickers:
+            return
+        for t in tickers:
+            await self.channel_layer.group_add(quote_group(t), self.channel_name)
+        self.tickers |= tickers
+        poller = get_quote_poller()
+        await poller.subscribe(tickers)
+        prices = await poller.fetch(tickers)
+        await self.send(text_data=json.dumps({
+            "type": "snapshot",
+            "quotes": {t: prices.get(t) for t in sorted(tickers)},
+            "timestamp": quote_timestamp(),
+        }))
+
+    async def _unsubscribe(self, tickers):
+        if not tickers:
+            return
+        for t in tickers:
+            await self.channel_layer.group_discard(quote_group(t), self.channel_name)
+        self.tickers -= tickers
+        await get_quote_poller().unsubscribe(tickers)
+
+    @database_sync_to_async
+    def load_tickers(self):
+        profile = self.scope['user'].profile.finance_profile
+        held = PortfolioStock.objects.filter(portfolio__finance_profile=profile).values_list('ticker', flat=True)
+        watched = WatchlistStock.objects.filter(portfolio__finance_profile=profile).values_list('ticker', flat=True)
+        return {t.upper() for t in (*held, *watched)}
@@ -0,0 +1,74 @@
+"""
+------------------Prologue--------------------
+File Name: benchmark_windowing.py
+Path: kobrasuitecore/finances/management/commands/benchmark_windowing.py
+
+Description:
+Micro-benchmark comparing the strided LSTM sequence builder with the list-append loop it replaced,
+on a synthetic five-year daily feature matrix for each horizon's sequence length.
+
+Input:
+Optional --bars, --features and --repeat arguments.
+
+Output:
+Timing and peak memory per sequence length, printed to stdout.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import timeit
+import tracemalloc
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from finances.services.stock_prediction_services import SEQUENCE_LENGTHS
+from finances.utils.windowing import sequence_dataset
+
+
+def loop_sequences(fx, fy, seq_len):
+    X_seq = []
+    Y_seq = []
+    for i in range(len(fy)-seq_len):
+        X_seq.append(fx[i:i+seq_len])
+        Y_seq.append(fy[i+seq_len-1])
+    return np.array(X_seq), np.array(Y_seq)
+
+
+def peak_bytes(fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the LSTM sequence builder against the original Python loop.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bars', type=int, default=5 * 252, help='Daily bars (default: five years).')
+        parser.add_argument('--features', type=int, default=20, help='Feature columns per bar.')
+        parser.add_argument('--repeat', type=int, default=50, help='Timed runs per implementation.')
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        fx = rng.random((options['bars'], options['features']))
+        fy = rng.random((options['bars'], 1))
+        runs = options['repeat']
+        self.stdout.write(f"{options['bars']} bars x {options['features']} features, {runs} runs")
+        for seq_len in sorted(set(SEQUENCE_LENGTHS.values())):
+            X_loop, Y_loop = loop_sequences(fx, fy, seq_len)
+            X_view, Y_view = sequence_dataset(fx, fy, seq_len)
+            if not (np.array_equal(X_loop, X_view) and np.array_equal(Y_loop, Y_view)):
+                self.stderr.write(self.style.ERROR(f'seq_len={seq_len}: outputs differ'))
+                continue
+            loop_ms = timeit.timeit(lambda: loop_sequences(fx, fy, seq_len), number=runs) / runs * 1000
+            view_ms = timeit.timeit(lambda: sequence_dataset(fx, fy, seq_len), number=runs) / runs * 1000
+            loop_kb = peak_bytes(loop_sequences, fx, fy, seq_len) / 1024
+            view_kb = peak_bytes(sequence_dataset, fx, fy, seq_len) / 1024
+            self.stdout.write(
+                f'seq_len={seq_len:>2}  loop {loop_ms:8.3f} ms {loop_kb:10.1f} KiB  |  '
+                f'windows {view_ms:8.3f} ms {view_kb:10.1f} KiB  |  {loop_ms / view_ms:6.1f}x'
+            )
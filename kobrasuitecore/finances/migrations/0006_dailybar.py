@@ -0,0 +1,30 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0005_rename_profile_bankaccount_finance_profile_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=12)),
+                ('date', models.DateField()),
+                ('open', models.FloatField()),
+                ('high', models.FloatField()),
+                ('low', models.FloatField()),
+                ('close', models.FloatField()),
+                ('volume', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['ticker', 'date'],
+                'unique_together': {('ticker', 'date')},
+            },
+        ),
+    ]
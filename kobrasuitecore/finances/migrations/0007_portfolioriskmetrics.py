@@ -0,0 +1,31 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0006_dailybar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioRiskMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('expected_return', models.FloatField()),
+                ('risk', models.FloatField()),
+                ('sharpe_ratio', models.FloatField()),
+                ('diversification_ratio', models.FloatField()),
+                ('alpha', models.FloatField()),
+                ('beta', models.FloatField()),
+                ('sortino_ratio', models.FloatField()),
+                ('max_drawdown', models.FloatField()),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('portfolio', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='risk_metrics', to='finances.stockportfolio')),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:29
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0007_portfolioriskmetrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PredictionModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=12)),
+                ('indicator_key', models.CharField(max_length=64)),
+                ('horizon', models.PositiveSmallIntegerField()),
+                ('data_as_of', models.DateField()),
+                ('artifact_dir', models.CharField(max_length=255)),
+                ('metrics', models.JSONField(blank=True, default=dict)),
+                ('trained_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['ticker', 'indicator_key', 'horizon', '-data_as_of'],
+                'unique_together': {('ticker', 'indicator_key', 'horizon', 'data_as_of')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0008_predictionmodel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndicatorState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=12, unique=True)),
+                ('last_date', models.DateField(blank=True, null=True)),
+                ('state', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='dailybar',
+            name='indicators',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.20 on 2026-10-18 08:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0009_indicator_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioValuationSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('current_value', models.FloatField()),
+                ('total_invested', models.FloatField()),
+                ('profit_loss', models.FloatField()),
+                ('profit_loss_percentage', models.FloatField()),
+                ('portfolio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='valuation_snapshots', to='finances.stockportfolio')),
+            ],
+            options={
+                'ordering': ['portfolio', '-taken_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PositionValuationSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(max_length=12)),
+                ('number_of_shares', models.IntegerField()),
+                ('pps_at_purchase', models.FloatField()),
+                ('close_price', models.FloatField()),
+                ('current_value', models.FloatField()),
+                ('total_invested', models.FloatField()),
+                ('profit_loss', models.FloatField()),
+                ('profit_loss_percentage', models.FloatField()),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='positions', to='finances.portfoliovaluationsnapshot')),
+            ],
+            options={
+                'ordering': ['snapshot', 'ticker'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='portfoliovaluationsnapshot',
+            index=models.Index(fields=['portfolio', 'taken_at'], name='finances_po_portfol_19973e_idx'),
+        ),
+    ]
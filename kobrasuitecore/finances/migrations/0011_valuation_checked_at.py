@@ -0,0 +1,26 @@
+# Generated by Django 4.2.20 on 2026-10-18 15:10
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def copy_taken_at(apps, schema_editor):
+    PortfolioValuationSnapshot = apps.get_model('finances', 'PortfolioValuationSnapshot')
+    PortfolioValuationSnapshot.objects.update(checked_at=F('taken_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0010_valuation_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfoliovaluationsnapshot',
+            name='checked_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(copy_taken_at, migrations.RunPython.noop),
+    ]
@@ -55,6 +55,140 @@ class WatchlistStock(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
 
 
+class PortfolioRiskMetrics(models.Model):
+    portfolio = models.OneToOneField(
+        StockPortfolio,
+        on_delete=models.CASCADE,
+        related_name='risk_metrics'
+    )
+    expected_return = models.FloatField()
+    risk = models.FloatField()
+    sharpe_ratio = models.FloatField()
+    diversification_ratio = models.FloatField()
+    alpha = models.FloatField()
+    beta = models.FloatField()
+    sortino_ratio = models.FloatField()
+    max_drawdown = models.FloatField()
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    def as_dict(self):
+        """
+        Returns the metrics in the shape served by the portfolio analysis endpoint.
+        """
+        return {
+            'expected_return': self.expected_return,
+            'risk': self.risk,
+            'sharpe_ratio': self.sharpe_ratio,
+            'diversification_ratio': self.diversification_ratio,
+            'alpha': self.alpha,
+            'beta': self.beta,
+            'sortino_ratio': self.sortino_ratio,
+            'max_drawdown': self.max_drawdown,
+            'computed_at': self.computed_at,
+        }
+
+
+class PortfolioValuationSnapshot(models.Model):
+    portfolio = models.ForeignKey(
+        StockPortfolio,
+        on_delete=models.CASCADE,
+        related_name='valuation_snapshots'
+    )
+    taken_at = models.DateTimeField(default=timezone.now)
+    # Last time the scheduled job re-priced the portfolio and found these totals unchanged.
+    checked_at = models.DateTimeField(default=timezone.now)
+    current_value = models.FloatField()
+    total_invested = models.FloatField()
+    profit_loss = models.FloatField()
+    profit_loss_percentage = models.FloatField()
+
+    class Meta:
+        ordering = ['portfolio', '-taken_at']
+        indexes = [models.Index(fields=['portfolio', 'taken_at'])]
+
+    def __str__(self):
+        return f'Portfolio {self.portfolio_id} at {self.taken_at}: {self.current_value}'
+
+
+class PositionValuationSnapshot(models.Model):
+    snapshot = models.ForeignKey(
+        PortfolioValuationSnapshot,
+        on_delete=models.CASCADE,
+        related_name='positions'
+    )
+    ticker = models.CharField(max_length=12)
+    number_of_shares = models.IntegerField()
+    pps_at_purchase = models.FloatField()
+    close_price = models.FloatField()
+    current_value = models.FloatField()
+    total_invested = models.FloatField()
+    profit_loss = models.FloatField()
+    profit_loss_percentage = models.FloatField()
+
+    class Meta:
+        ordering = ['snapshot', 'ticker']
+
+    def as_dict(self):
+        """
+        Returns the position in the shape served by the portfolio stocks endpoint.
+        """
+        return {
+            'ticker': self.ticker,
+            'number_of_shares': self.number_of_shares,
+            'pps_at_purchase': self.pps_at_purchase,
+            'close_price': self.close_price,
+            'current_value': self.current_value,
+            'total_invested': self.total_invested,
+            'profit_loss': self.profit_loss,
+            'profit_loss_percentage': self.profit_loss_percentage,
+        }
+
+
+class DailyBar(models.Model):
+    ticker = models.CharField(max_length=12)
+    date = models.DateField()
+    open = models.FloatField()
+    high = models.FloatField()
+    low = models.FloatField()
+    close = models.FloatField()
+    volume = models.BigIntegerField(default=0)
+    indicators = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ['ticker', 'date']
+        unique_together = ('ticker', 'date')
+
+    def __str__(self):
+        return f'{self.ticker} {self.date} {self.close}'
+
+
+class IndicatorState(models.Model):
+    ticker = models.CharField(max_length=12, unique=True)
+    last_date = models.DateField(null=True, blank=True)
+    state = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.ticker} indicators through {self.last_date}'
+
+
+class PredictionModel(models.Model):
+    ticker = models.CharField(max_length=12)
+    indicator_key = models.CharField(max_length=64)
+    horizon = models.PositiveSmallIntegerField()
+    data_as_of = models.DateField()
+    artifact_dir = models.CharField(max_length=255)
+    metrics = models.JSONField(default=dict, blank=True)
+    trained_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['ticker', 'indicator_key', 'horizon', '-data_as_of']
+        unique_together = ('ticker', 'indicator_key', 'horizon', 'data_as_of')
+
+    def __str__(self):
+        return f'{self.ticker} [{self.indicator_key}] h{self.horizon} as of {self.data_as_of}'
+
+
 class BankAccount(models.Model):
     finance_profile = models.ForeignKey(
         FinanceProfile,
@@ -0,0 +1,28 @@
+"""
+------------------Prologue--------------------
+File Name: routing.py
+Path: kobrasuitecore/finances/routing.py
+
+Description:
+Defines WebSocket URL routing patterns for the finances app.
+Maps the portfolio quote stream URL to the PortfolioQuotesConsumer.
+
+Input:
+WebSocket connection requests for the quote stream.
+
+Output:
+WebSocket connections routed to the quote stream consumer.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+from django.urls import re_path
+from .consumers import PortfolioQuotesConsumer
+
+websocket_urlpatterns = [
+    re_path(
+        r'^ws/finances/quotes/$',
+        PortfolioQuotesConsumer.as_asgi(),
+        name='portfolio_quotes'
+    ),
+]
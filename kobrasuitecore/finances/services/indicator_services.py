@@ -0,0 +1,94 @@
+"""
+------------------Prologue--------------------
+File Name: indicator_services.py
+Path: kobrasuitecore/finances/services/indicator_services.py
+
+Description:
+Keeps technical indicators for every stored daily bar up to date. The IndicatorEngine state for
+each ticker is persisted in IndicatorState, so each sync only feeds the newly stored bars through
+the engine. A full recompute rebuilds the state from the first stored bar and is used when the
+store was rewritten, or on request to check the stored values against the pandas implementations.
+
+Input:
+Ticker symbols.
+
+Output:
+Indicator values written to DailyBar.indicators, and indicator series for the chart endpoint.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+
+from finances.models import DailyBar, IndicatorState
+from finances.utils.indicator_engine import INDICATOR_COLUMNS, IndicatorEngine
+
+logger = logging.getLogger(__name__)
+
+
+def update_indicators(ticker, full=False):
+    """
+    Brings the stored indicators for `ticker` up to date and returns the number of bars
+    updated. Only bars after the saved engine state are processed unless `full` is set,
+    no state exists yet, or bars were inserted before the state's last date.
+    """
+    ticker = ticker.upper()
+    bars = DailyBar.objects.filter(ticker=ticker)
+    with transaction.atomic():
+        record, _ = IndicatorState.objects.select_for_update().get_or_create(ticker=ticker)
+        if not full and record.last_date is not None:
+            full = bars.filter(date__lte=record.last_date).count() != record.state.get('count')
+        if full or record.last_date is None:
+            engine = IndicatorEngine()
+            pending = list(bars.order_by('date'))
+        else:
+            engine = IndicatorEngine.from_state(record.state)
+            pending = list(bars.filter(date__gt=record.last_date).order_by('date'))
+        if not pending:
+            return 0
+        for bar in pending:
+            bar.indicators = engine.update(bar.open, bar.high, bar.low, bar.close, bar.volume)
+        DailyBar.objects.bulk_update(pending, ['indicators'], batch_size=500)
+        record.last_date = pending[-1].date
+        record.state = engine.to_state()
+        record.save()
+    return len(pending)
+
+
+def indicator_frame(rows):
+    """
+    Expands a sequence of DailyBar.indicators dictionaries into a float DataFrame
+    with one column per indicator (NaN where an indicator is still warming up).
+    """
+    return pd.DataFrame.from_records(list(rows), columns=list(INDICATOR_COLUMNS)).astype(float)
+
+
+def verify_indicators(ticker):
+    """
+    Recomputes every indicator for `ticker` with the pandas implementations and returns
+    the largest absolute difference from the stored values per indicator.
+    """
+    from finances.services.stock_prediction_services import (
+        add_atr, add_bbands, add_ema, add_macd, add_rsi, add_sma, add_vwap,
+    )
+    from finances.services.price_history_services import get_daily_bars
+
+    df = get_daily_bars(ticker, sync=False, indicators=True)
+    if df.empty:
+        return {}
+    expected = df[['Open', 'High', 'Low', 'Close', 'Volume']].astype(float)
+    for add in (add_macd, add_rsi, add_sma, add_ema, add_atr, add_bbands, add_vwap):
+        expected = add(expected)
+    diffs = {}
+    for col in INDICATOR_COLUMNS:
+        stored, full = df[col].to_numpy(), expected[col].to_numpy()
+        if not np.array_equal(np.isnan(stored), np.isnan(full)):
+            diffs[col] = float('inf')
+            continue
+        mask = ~np.isnan(full)
+        diffs[col] = float(np.max(np.abs(stored[mask] - full[mask]))) if mask.any() else 0.0
+    return diffs
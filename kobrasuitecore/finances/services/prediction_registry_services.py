@@ -0,0 +1,286 @@
+"""
+------------------Prologue--------------------
+File Name: prediction_registry_services.py
+Path: kobrasuitecore/finances/services/prediction_registry_services.py
+
+Description:
+Model registry for the stock prediction service. Trained classifiers, LSTM regressors, their
+scalers and evaluation metrics are stored under MEDIA_ROOT and indexed by PredictionModel rows
+keyed by (ticker, indicator set, horizon, data-as-of date). Training runs in a Celery task and
+stores each horizon's prediction for its data with the model, so the request path for current
+models is a registry lookup. After a new daily bar, the newest fully registered models keep
+serving (inference on the latest features, kept warm in an in-process LRU and cached per day)
+while retraining runs in the background.
+
+Input:
+Ticker symbols and indicator flag dictionaries.
+
+Output:
+Prediction payloads in the same shape as get_predictions, or None while training is pending.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import logging
+import shutil
+from datetime import timedelta
+from pathlib import Path
+
+import joblib
+import keras
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from finances.models import DailyBar, PredictionModel
+from finances.services.price_history_services import sync_daily_bars
+from finances.services.stock_prediction_services import (
+    HORIZON_LABELS,
+    build_features,
+    predict_classification,
+    predict_regression,
+    train_horizons,
+)
+from finances.utils.market_data import LRUCache, _MISSING
+
+logger = logging.getLogger(__name__)
+
+INDICATOR_FLAGS = ('MACD', 'RSI', 'SMA', 'EMA', 'ATR', 'BBands', 'VWAP')
+ARTIFACT_ROOT = 'prediction_models'
+TRAINING_LOCK_SECONDS = 60 * 60
+FAILURE_TTL_SECONDS = 15 * 60
+FALLBACK_TTL_SECONDS = 24 * 60 * 60
+
+_loaded_models = LRUCache(maxsize=48)
+
+
+def indicator_key(flags):
+    """
+    Canonical registry key for a set of indicator flags, e.g. 'MACD+RSI' or 'none'.
+    """
+    enabled = [name for name in INDICATOR_FLAGS if flags.get(name)]
+    return '+'.join(enabled) or 'none'
+
+
+def _indicator_kwargs(flags):
+    return {name: bool(flags.get(name)) for name in INDICATOR_FLAGS}
+
+
+def _artifact_dir(ticker, key, as_of, horizon):
+    return Path(ARTIFACT_ROOT) / ticker / key / as_of.isoformat() / f'h{horizon}'
+
+
+def _latest_bar_date(ticker):
+    sync_daily_bars(ticker)
+    return (DailyBar.objects
+            .filter(ticker=ticker)
+            .order_by('-date')
+            .values_list('date', flat=True)
+            .first())
+
+
+def _training_cache_key(ticker, key, as_of, state):
+    return f'prediction_registry:{state}:{ticker}:{key}:{as_of}'
+
+
+def train_and_register(ticker, flags):
+    """
+    Trains every horizon for (ticker, flags) on the stored bars and registers the
+    artifacts. Returns the number of horizons registered.
+    """
+    ticker = ticker.upper()
+    key = indicator_key(flags)
+    as_of = _latest_bar_date(ticker)
+    timings = {}
+    df = build_features(ticker, timings, **_indicator_kwargs(flags))
+    if df is None or as_of is None:
+        return 0
+    registered = 0
+    for horizon, (cfit, rfit) in train_horizons(df, timings).items():
+        if not (cfit and rfit):
+            continue
+        classifier, classification = cfit
+        regression_artifacts, regression = rfit
+        relative_dir = _artifact_dir(ticker, key, as_of, horizon)
+        directory = Path(settings.MEDIA_ROOT) / relative_dir
+        directory.mkdir(parents=True, exist_ok=True)
+        joblib.dump(
+            {
+                'classifier': classifier,
+                'scaler_x': regression_artifacts['scaler_x'],
+                'scaler_y': regression_artifacts['scaler_y'],
+                'seq_len': regression_artifacts['seq_len'],
+            },
+            directory / 'estimators.joblib',
+        )
+        regression_artifacts['model'].save(directory / 'regressor.keras')
+        with transaction.atomic():
+            PredictionModel.objects.update_or_create(
+                ticker=ticker,
+                indicator_key=key,
+                horizon=horizon,
+                data_as_of=as_of,
+                defaults={
+                    'artifact_dir': str(relative_dir),
+                    'metrics': {
+                        'classification': classification,
+                        'regression': regression,
+                        'timings': {
+                            'features': timings['features'],
+                            'classify': timings['classify'][horizon],
+                            'regress': timings['regress'][horizon],
+                        },
+                    },
+                    'trained_at': timezone.now(),
+                },
+            )
+        registered += 1
+    logger.info(f"Registered {registered} prediction models for {ticker} [{key}] as of {as_of}; timings {timings}")
+    return registered
+
+
+def load_artifacts(entry):
+    """
+    Loads a registry entry's estimators and LSTM, keeping recently used ones in memory.
+    """
+    artifacts = _loaded_models.get(entry.pk)
+    if artifacts is not _MISSING:
+        return artifacts
+    directory = Path(settings.MEDIA_ROOT) / entry.artifact_dir
+    artifacts = joblib.load(directory / 'estimators.joblib')
+    artifacts['model'] = keras.models.load_model(directory / 'regressor.keras')
+    _loaded_models.set(entry.pk, artifacts, None)
+    return artifacts
+
+
+def _newest_complete_as_of(ticker, key):
+    """
+    Newest data_as_of with models registered for every horizon, or None.
+    """
+    return (PredictionModel.objects
+            .filter(ticker=ticker, indicator_key=key)
+            .values('data_as_of')
+            .annotate(horizons=Count('horizon', distinct=True))
+            .filter(horizons=len(HORIZON_LABELS))
+            .order_by('-data_as_of')
+            .values_list('data_as_of', flat=True)
+            .first())
+
+
+def _stored_results(entries):
+    return {
+        HORIZON_LABELS[entry.horizon]: {
+            'classification': dict(entry.metrics['classification']),
+            'regression': dict(entry.metrics['regression']),
+        }
+        for entry in entries
+    }
+
+
+def _infer_results(ticker, flags, entries):
+    df = build_features(ticker, **_indicator_kwargs(flags))
+    if df is None:
+        return None
+    results = _stored_results(entries)
+    for entry in entries:
+        artifacts = load_artifacts(entry)
+        label = HORIZON_LABELS[entry.horizon]
+        results[label]['classification']['today_prediction'] = predict_classification(
+            artifacts['classifier'], df, entry.horizon,
+        )
+        results[label]['regression']['prediction'] = predict_regression(artifacts, df, entry.horizon)
+    return results
+
+
+def predict_from_registry(ticker, flags):
+    """
+    Returns predictions for (ticker, flags), or None if no data date has models for
+    every horizon yet. Models trained on the latest stored bar answer from the
+    predictions stored with them. Otherwise the newest complete set runs on the latest
+    features (cached for the day) and a retrain for the new bar is queued.
+    """
+    ticker = ticker.upper()
+    key = indicator_key(flags)
+    as_of = _latest_bar_date(ticker)
+    if as_of is None:
+        return None
+    trained_as_of = _newest_complete_as_of(ticker, key)
+    if trained_as_of is None:
+        return None
+    entries = sorted(
+        PredictionModel.objects.filter(ticker=ticker, indicator_key=key, data_as_of=trained_as_of),
+        key=lambda e: e.horizon,
+    )
+    if trained_as_of == as_of:
+        return _stored_results(entries)
+    request_training(ticker, flags)
+    fallback_key = f'prediction_registry:fallback:{ticker}:{key}:{trained_as_of}:{as_of}'
+    results = cache.get(fallback_key)
+    if results is None:
+        results = _infer_results(ticker, flags, entries)
+        if results is not None:
+            cache.set(fallback_key, results, FALLBACK_TTL_SECONDS)
+    return results
+
+
+def _is_fully_registered(ticker, key, as_of):
+    horizons = (PredictionModel.objects
+                .filter(ticker=ticker, indicator_key=key, data_as_of=as_of)
+                .values_list('horizon', flat=True))
+    return set(horizons) == set(HORIZON_LABELS)
+
+
+def request_training(ticker, flags):
+    """
+    Enqueues a training job for (ticker, flags) unless models for every horizon of the
+    latest data are already registered ('ready') or a job is already queued ('pending').
+    Returns 'failed' if the last attempt left any horizon untrained.
+    """
+    from finances.tasks import train_prediction_models
+
+    ticker = ticker.upper()
+    key = indicator_key(flags)
+    as_of = _latest_bar_date(ticker)
+    if as_of is None or cache.get(_training_cache_key(ticker, key, as_of, 'failed')):
+        return 'failed'
+    if _is_fully_registered(ticker, key, as_of):
+        return 'ready'
+    if cache.add(_training_cache_key(ticker, key, as_of, 'pending'), True, TRAINING_LOCK_SECONDS):
+        train_prediction_models.delay(ticker, _indicator_kwargs(flags))
+    if cache.get(_training_cache_key(ticker, key, as_of, 'failed')):
+        return 'failed'
+    if _is_fully_registered(ticker, key, as_of):
+        return 'ready'
+    return 'pending'
+
+
+def record_training_result(ticker, flags, registered):
+    """
+    Clears the pending marker for a finished training job and remembers failures
+    (including jobs that trained only some horizons) briefly so clients stop polling
+    for tickers that cannot be trained.
+    """
+    ticker = ticker.upper()
+    key = indicator_key(flags)
+    as_of = (DailyBar.objects
+             .filter(ticker=ticker)
+             .order_by('-date')
+             .values_list('date', flat=True)
+             .first())
+    cache.delete(_training_cache_key(ticker, key, as_of, 'pending'))
+    if registered < len(HORIZON_LABELS):
+        cache.set(_training_cache_key(ticker, key, as_of, 'failed'), True, FAILURE_TTL_SECONDS)
+
+
+def prune_prediction_models(keep_days=7):
+    """
+    Deletes registry entries and artifacts trained on data older than `keep_days`.
+    """
+    cutoff = timezone.localdate() - timedelta(days=keep_days)
+    stale = PredictionModel.objects.filter(data_as_of__lt=cutoff)
+    for entry in stale:
+        shutil.rmtree(Path(settings.MEDIA_ROOT) / entry.artifact_dir, ignore_errors=True)
+    count, _ = stale.delete()
+    return count
@@ -0,0 +1,154 @@
+"""
+------------------Prologue--------------------
+File Name: price_history_services.py
+Path: kobrasuitecore/finances/services/price_history_services.py
+
+Description:
+Maintains a local store of daily OHLCV bars (the DailyBar table) so analysis and prediction
+read price history from the database instead of re-downloading five years of data per request.
+Only closed sessions are stored, and each sync fetches just the trailing days that are missing
+and updates the stored technical indicators for the new bars.
+
+Input:
+Ticker symbols and optional start dates.
+
+Output:
+DailyBar rows and pandas DataFrames aligned by trading date.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import logging
+from datetime import date, timedelta
+
+import pandas as pd
+from django.core.cache import cache
+from django.db import transaction
+
+from finances.models import DailyBar
+from finances.services.indicator_services import indicator_frame, update_indicators
+from finances.utils.indicator_engine import INDICATOR_COLUMNS
+from finances.utils.market_data import get_market_data
+
+logger = logging.getLogger(__name__)
+
+HISTORY_YEARS = 5
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _history_start(today):
+    return today - timedelta(days=HISTORY_YEARS * 365)
+
+
+def sync_daily_bars(ticker, full=False):
+    """
+    Appends any closed daily bars missing from the store for `ticker` and returns
+    the number of rows written. A ticker is fetched at most once per day unless
+    `full` is set, which re-downloads the whole window (e.g. after a split).
+    """
+    ticker = ticker.upper()
+    today = date.today()
+    synced_key = f'price_store:synced:{ticker}:{today.isoformat()}'
+    if not full and cache.get(synced_key):
+        return 0
+    last = None
+    if not full:
+        last = (DailyBar.objects
+                .filter(ticker=ticker)
+                .order_by('-date')
+                .values_list('date', flat=True)
+                .first())
+    start = last + timedelta(days=1) if last else _history_start(today)
+    if len(pd.bdate_range(start, today - timedelta(days=1))) == 0:
+        cache.set(synced_key, True, 24 * 60 * 60)
+        return 0
+    # a full resync (e.g. after a split) must not reuse a cached pre-adjustment frame
+    df = get_market_data().history(ticker, start=start, end=today, refresh=full)
+    if df is None or df.empty:
+        logger.info(f"No new daily bars for {ticker} since {start}")
+        cache.set(synced_key, True, 60 * 60)
+        return 0
+    bars = [
+        DailyBar(
+            ticker=ticker,
+            date=ts.date(),
+            open=float(row.Open),
+            high=float(row.High),
+            low=float(row.Low),
+            close=float(row.Close),
+            volume=int(row.Volume),
+        )
+        for ts, row in df[BAR_COLUMNS].dropna().iterrows()
+        if ts.date() < today
+    ]
+    # A full re-download replaces the stored window; readers never see it half written.
+    with transaction.atomic():
+        if full:
+            DailyBar.objects.filter(ticker=ticker).delete()
+        DailyBar.objects.bulk_create(bars, batch_size=500, ignore_conflicts=True)
+        update_indicators(ticker, full=full)
+    cache.set(synced_key, True, 24 * 60 * 60)
+    return len(bars)
+
+
+def get_daily_bars(ticker, start=None, sync=True, indicators=False):
+    """
+    Returns the stored bars for `ticker` as a DataFrame shaped like yfinance history
+    (Date index; Open, High, Low, Close, Volume columns), syncing missing days first.
+    With `indicators`, the stored indicator columns are appended.
+    """
+    ticker = ticker.upper()
+    if sync:
+        sync_daily_bars(ticker)
+        if indicators:
+            update_indicators(ticker)
+    qs = DailyBar.objects.filter(ticker=ticker)
+    if start:
+        qs = qs.filter(date__gte=start)
+    fields = ['date', 'open', 'high', 'low', 'close', 'volume'] + (['indicators'] if indicators else [])
+    rows = list(qs.order_by('date').values_list(*fields))
+    if not rows:
+        return pd.DataFrame(columns=BAR_COLUMNS + (list(INDICATOR_COLUMNS) if indicators else []))
+    df = pd.DataFrame([row[:6] for row in rows], columns=['Date', *BAR_COLUMNS])
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.set_index('Date')
+    if indicators:
+        values = indicator_frame(row[6] for row in rows)
+        values.index = df.index
+        df = df.join(values)
+    return df
+
+
+def get_indicator_chart(ticker, limit=60):
+    """
+    Returns the last `limit` stored bars with their indicator values as a list of
+    dictionaries (None for indicators still warming up), or None if nothing is stored.
+    """
+    df = get_daily_bars(ticker, indicators=True)
+    if df.empty:
+        return None
+    df = df.tail(limit).astype(object).where(df.tail(limit).notna(), None).reset_index()
+    return df.to_dict(orient='records')
+
+
+def get_close_matrix(tickers, start=None, sync=True, dropna=True):
+    """
+    Returns closing prices for `tickers` as one DataFrame (one column per ticker),
+    aligned on the trading dates every ticker has a bar for. With dropna=False the
+    union of dates is kept and missing bars are left as NaN for the caller to mask.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    if sync:
+        for t in tickers:
+            sync_daily_bars(t)
+    qs = DailyBar.objects.filter(ticker__in=tickers)
+    if start:
+        qs = qs.filter(date__gte=start)
+    rows = list(qs.values_list('date', 'ticker', 'close'))
+    if not rows:
+        return pd.DataFrame(columns=tickers)
+    df = pd.DataFrame(rows, columns=['Date', 'ticker', 'close'])
+    matrix = df.pivot(index='Date', columns='ticker', values='close').reindex(columns=tickers)
+    matrix.index = pd.to_datetime(matrix.index)
+    matrix = matrix.sort_index()
+    return matrix.dropna() if dropna else matrix
@@ -0,0 +1,148 @@
+"""
+------------------Prologue--------------------
+File Name: risk_services.py
+Path: kobrasuitecore/finances/services/risk_services.py
+
+Description:
+Scores stock portfolios with the vectorized risk engine. All requested portfolios share one
+batched price lookup and one returns matrix over the union of their tickers, read from the
+local daily-bar store; gaps stay NaN and the engine masks them per portfolio, so a recently
+listed ticker only shortens the history of the portfolios that hold it. Portfolios holding a
+ticker with no stored history are not scored. The results are persisted as
+PortfolioRiskMetrics rows so the analysis endpoint only reads them.
+
+Input:
+StockPortfolio querysets or ids.
+
+Output:
+PortfolioRiskMetrics rows, created or updated in bulk.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from finances.models import PortfolioRiskMetrics, PortfolioStock, StockPortfolio
+from finances.services.price_history_services import HISTORY_YEARS, get_close_matrix
+from finances.utils.risk_engine import METRIC_NAMES, compute_risk_metrics
+from finances.utils.stock_utils import get_current_prices
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_TICKER = 'SPY'
+
+
+def build_weights(holdings, prices, tickers):
+    """
+    Turns {portfolio_id: {TICKER: shares}} into market-value weights over `tickers`.
+    Returns (portfolio_ids, weights) and skips portfolios with no priced value.
+    """
+    column = {t: i for i, t in enumerate(tickers)}
+    portfolio_ids, rows = [], []
+    for portfolio_id, positions in holdings.items():
+        row = np.zeros(len(tickers))
+        for ticker, shares in positions.items():
+            price = prices.get(ticker)
+            if price is None:
+                row = None
+                break
+            row[column[ticker]] += shares * price
+        if row is None or row.sum() == 0:
+            continue
+        portfolio_ids.append(portfolio_id)
+        rows.append(row / row.sum())
+    return portfolio_ids, np.array(rows).reshape(len(rows), len(tickers))
+
+
+def analyze_holdings(holdings):
+    """
+    Scores {portfolio_id: {TICKER: shares}} in one engine pass and returns
+    {portfolio_id: {metric: value}} for every portfolio that could be priced. Portfolios
+    holding a ticker without any stored history (or too little overlapping history)
+    are left out rather than scored on their remaining holdings.
+    """
+    tickers = sorted({t for positions in holdings.values() for t in positions})
+    if not tickers:
+        return {}
+    start = date.today() - timedelta(days=HISTORY_YEARS * 365)
+    closes = get_close_matrix([*tickers, BENCHMARK_TICKER], start=start, dropna=False)
+    missing = {t for t in tickers if t not in closes or closes[t].isna().all()}
+    if missing:
+        logger.info(f"Not scoring portfolios holding tickers with no price history: {sorted(missing)}")
+        holdings = {pid: positions for pid, positions in holdings.items() if missing.isdisjoint(positions)}
+        tickers = [t for t in tickers if t not in missing]
+    if not tickers or len(closes) < 2:
+        return {}
+    prices = get_current_prices(tickers)
+    portfolio_ids, weights = build_weights(holdings, prices, tickers)
+    if not portfolio_ids:
+        return {}
+    returns = closes.pct_change(fill_method=None).iloc[1:]
+    benchmark = None
+    if BENCHMARK_TICKER in returns and not returns[BENCHMARK_TICKER].isna().all():
+        benchmark = returns[BENCHMARK_TICKER].to_numpy()
+    metrics = compute_risk_metrics(returns[tickers].to_numpy(), weights, benchmark=benchmark)
+    return {
+        pid: {name: float(metrics[name][i]) for name in METRIC_NAMES}
+        for i, pid in enumerate(portfolio_ids)
+        if np.isfinite(metrics['risk'][i])
+    }
+
+
+def score_portfolios(portfolios=None):
+    """
+    Computes and stores risk metrics for the given portfolios (all of them by default).
+    Returns the number of portfolios scored.
+    """
+    stocks = PortfolioStock.objects.all()
+    if portfolios is not None:
+        stocks = stocks.filter(portfolio__in=portfolios)
+    holdings = defaultdict(lambda: defaultdict(float))
+    for portfolio_id, ticker, shares in stocks.values_list('portfolio_id', 'ticker', 'number_of_shares'):
+        holdings[portfolio_id][ticker.upper()] += shares
+    results = analyze_holdings(holdings)
+    if not results:
+        return 0
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = {
+            m.portfolio_id: m
+            for m in PortfolioRiskMetrics.objects.select_for_update().filter(portfolio_id__in=results)
+        }
+        to_create, to_update = [], []
+        for portfolio_id, values in results.items():
+            obj = existing.get(portfolio_id)
+            if obj is None:
+                to_create.append(PortfolioRiskMetrics(portfolio_id=portfolio_id, computed_at=now, **values))
+                continue
+            for name, value in values.items():
+                setattr(obj, name, value)
+            obj.computed_at = now
+            to_update.append(obj)
+        PortfolioRiskMetrics.objects.bulk_create(to_create, batch_size=500)
+        PortfolioRiskMetrics.objects.bulk_update(to_update, [*METRIC_NAMES, 'computed_at'], batch_size=500)
+    logger.info(f"Scored risk metrics for {len(results)} portfolios")
+    return len(results)
+
+
+def get_portfolio_risk_metrics(portfolio):
+    """
+    Returns the stored metrics for a portfolio, scoring it on demand when no
+    metrics exist yet (e.g. holdings changed since the nightly run).
+    """
+    metrics = PortfolioRiskMetrics.objects.filter(portfolio=portfolio).first()
+    if metrics is None:
+        score_portfolios(StockPortfolio.objects.filter(pk=portfolio.pk))
+        metrics = PortfolioRiskMetrics.objects.filter(portfolio=portfolio).first()
+    return metrics
+
+
+def invalidate_portfolio_risk_metrics(portfolio):
+    PortfolioRiskMetrics.objects.filter(portfolio=portfolio).delete()
@@ -6,7 +6,8 @@ Path: kobrasuitecore/finances/services/stock_prediction_services.py
 Description:
 Contains functions for retrieving stock data, engineering technical indicators, and
 running classification/regression models (including LSTM networks) to generate predictions.
-Employs concurrency for horizon-based forecasting.
+Horizons are trained concurrently on a configurable backend (inline, thread or process pool)
+and the time spent building features, classifying and regressing is recorded per stage.
 
 Input:
 Stock ticker symbols and optional indicator flags for feature expansion.
@@ -18,28 +19,52 @@ Collaborators: SPENCER SLIFFE
 ---------------------------------------------
 """
 import logging
+import time
 import numpy as np
 import pandas as pd
-import yfinance as yf
 import keras
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.optimizers import Adam
 from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
 from sklearn.preprocessing import MinMaxScaler
-from sklearn.utils import class_weight
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score, accuracy_score, classification_report
+from finances.services.price_history_services import get_daily_bars
+from finances.utils.training_pool import (
+    attach_frame,
+    get_process_pool,
+    release_frame,
+    share_frame,
+    shutdown_process_pool,
+    worker_count,
+)
+from finances.utils.windowing import sequence_dataset
+from finances.utils.indicator_engine import INDICATOR_GROUPS
 
+logger = logging.getLogger(__name__)
 
-def retrieve_data(ticker):
+HORIZON_LABELS = {1: 'Tomorrow', 2: 'Week', 3: 'Month'}
+TARGET_COLUMNS = ['Tomorrow', 'Week', 'Month', 'Close_Tomorrow', 'Close_NextWeek', 'Close_NextMonth']
+SEQUENCE_LENGTHS = {1: 5, 2: 7, 3: 10}
+LSTM_EPOCHS = 25
+TRAINING_BACKENDS = ('inline', 'thread', 'process')
+DEFAULT_PREDICTION_TRAINING = {
+    'BACKEND': 'thread',
+    'MAX_WORKERS': None,
+}
+
+
+def retrieve_data(ticker, indicators=False):
     now = datetime.now()
-    start_date = (now - timedelta(days=5*365)).strftime('%Y-%m-%d')
-    end_date = (now - timedelta(days=1)).strftime('%Y-%m-%d')
-    df = yf.Ticker(ticker).history(start=start_date, end=end_date)
+    start_date = (now - timedelta(days=5*365)).date()
+    df = get_daily_bars(ticker, start=start_date, indicators=indicators)
     if df.empty:
         return None
-    df.drop(['Dividends', 'Stock Splits'], axis=1, inplace=True, errors='ignore')
     df['Tomorrow'] = (df['Close'].shift(-1) > df['Close']).astype(int)
     df['Week'] = (df['Close'].shift(-5) > df['Close']).astype(int)
     df['Month'] = (df['Close'].shift(-21) > df['Close']).astype(int)
@@ -117,7 +142,26 @@ def add_indicators(df, MACD=False, RSI=False, SMA=False, EMA=False, ATR=False, B
     return df
 
 
-def train_classification(df, horizon):
+def select_indicators(df, **indicators):
+    """
+    Keeps the stored indicator columns for the requested flags (as returned by
+    retrieve_data(..., indicators=True)) and drops incomplete rows, mirroring add_indicators.
+    """
+    unused = [col for name, cols in INDICATOR_GROUPS.items() if not indicators.get(name) for col in cols]
+    df = df.drop(columns=unused)
+    df.dropna(inplace=True)
+    return df
+
+
+def _feature_frame(df):
+    return df.select_dtypes(include=[np.number]).drop(columns=TARGET_COLUMNS, errors='ignore')
+
+
+def fit_classification(df, horizon):
+    """
+    Fits the LDA direction classifier for a horizon and returns (model, result),
+    or None when there is not enough data.
+    """
     if df.shape[0] < 50:
         return None
     target_map = {1: 'Tomorrow', 2: 'Week', 3: 'Month'}
@@ -125,26 +169,40 @@ def train_classification(df, horizon):
     if target_col not in df.columns:
         return None
     df = df.dropna(subset=[target_col])
-    X = df.select_dtypes(include=[np.number]).drop(columns=[
-        'Tomorrow','Week','Month','Close_Tomorrow','Close_NextWeek','Close_NextMonth'
-    ], errors='ignore')
+    X = _feature_frame(df)
     y = df[target_col].astype(int)
     train_size = int(len(X)*0.8)
     X_train, X_test = X.iloc[:train_size], X.iloc[train_size:]
     y_train, y_test = y.iloc[:train_size], y.iloc[train_size:]
-    classes = np.unique(y_train)
-    cw = class_weight.compute_class_weight('balanced', classes=classes, y=y_train)
-    cw_dict = dict(zip(classes, cw))
     model = LinearDiscriminantAnalysis()
     model.fit(X_train, y_train)
     preds = model.predict(X_test)
     acc = accuracy_score(y_test, preds)
     rep = classification_report(y_test, preds)
-    next_data = X.iloc[[-1]]
-    next_pred = model.predict(next_data)[0]
-    return {'accuracy': acc, 'classification_report': rep, 'today_prediction': int(next_pred)}
+    next_pred = predict_classification(model, df, horizon)
+    return model, {'accuracy': acc, 'classification_report': rep, 'today_prediction': next_pred}
 
-def train_regression(df, horizon):
+
+def predict_classification(model, df, horizon):
+    """
+    Predicts the direction for the most recent feature row with a fitted classifier.
+    """
+    target_col = {1: 'Tomorrow', 2: 'Week', 3: 'Month'}[horizon]
+    X = _feature_frame(df.dropna(subset=[target_col]))
+    return int(model.predict(X.iloc[[-1]])[0])
+
+
+def train_classification(df, horizon):
+    fitted = fit_classification(df, horizon)
+    return fitted[1] if fitted else None
+
+
+def fit_regression(df, horizon, epochs=None):
+    """
+    Fits the LSTM price regressor for a horizon and returns (artifacts, result), where
+    artifacts holds the model, both scalers and the sequence length; None when there is
+    not enough data. `epochs` defaults to LSTM_EPOCHS.
+    """
     if df.shape[0] < 50:
         return None
     target_map = {1: 'Close_Tomorrow', 2: 'Close_NextWeek', 3: 'Close_NextMonth'}
@@ -152,22 +210,14 @@ def train_regression(df, horizon):
     if not target_col:
         return None
     df = df.dropna(subset=[target_col])
-    features = df.select_dtypes(include=[np.number]).drop(columns=[
-        'Tomorrow','Week','Month','Close_Tomorrow','Close_NextWeek','Close_NextMonth'
-    ], errors='ignore').values
+    features = _feature_frame(df).values
     targets = df[target_col].values
-    seq_len = {1: 5, 2: 7, 3: 10}.get(horizon, 5)
+    seq_len = SEQUENCE_LENGTHS.get(horizon, 5)
     scaler_x = MinMaxScaler()
     scaler_y = MinMaxScaler()
     fx = scaler_x.fit_transform(features)
     fy = scaler_y.fit_transform(targets.reshape(-1,1))
-    X_seq = []
-    Y_seq = []
-    for i in range(len(fy)-seq_len):
-        X_seq.append(fx[i:i+seq_len])
-        Y_seq.append(fy[i+seq_len-1])
-    X_seq = np.array(X_seq)
-    Y_seq = np.array(Y_seq)
+    X_seq, Y_seq = sequence_dataset(fx, fy, seq_len)
     if X_seq.shape[0] < 10:
         return None
     idx = int(len(X_seq)*0.8)
@@ -178,35 +228,122 @@ def train_regression(df, horizon):
     model.add(Dropout(0.2))
     model.add(Dense(1))
     model.compile(optimizer=Adam(learning_rate=0.001), loss='mean_squared_error')
-    model.fit(X_train, Y_train, epochs=25, batch_size=32, verbose=0)
-    preds = model.predict(X_test)
+    model.fit(X_train, Y_train, epochs=epochs or LSTM_EPOCHS, batch_size=32, verbose=0)
+    preds = model.predict(X_test, verbose=0)
     preds_rescaled = scaler_y.inverse_transform(preds)
     y_test_rescaled = scaler_y.inverse_transform(Y_test)
     mse = mean_squared_error(y_test_rescaled, preds_rescaled)
     mae = mean_absolute_error(y_test_rescaled, preds_rescaled)
     r2 = r2_score(y_test_rescaled, preds_rescaled)
-    last_block = fx[-seq_len:]
+    artifacts = {'model': model, 'scaler_x': scaler_x, 'scaler_y': scaler_y, 'seq_len': seq_len}
+    final_pred = predict_regression(artifacts, df, horizon)
+    return artifacts, {'mse': mse, 'mae': mae, 'r2': r2, 'prediction': final_pred}
+
+
+def predict_regression(artifacts, df, horizon):
+    """
+    Predicts the horizon's closing price from the most recent feature window.
+    """
+    target_col = {1: 'Close_Tomorrow', 2: 'Close_NextWeek', 3: 'Close_NextMonth'}[horizon]
+    features = _feature_frame(df.dropna(subset=[target_col])).values
+    seq_len = artifacts['seq_len']
+    last_block = artifacts['scaler_x'].transform(features[-seq_len:])
     last_block = np.expand_dims(last_block, axis=0)
-    p = model.predict(last_block)
-    final_pred = scaler_y.inverse_transform(p)[0][0]
-    return {'mse': mse, 'mae': mae, 'r2': r2, 'prediction': round(final_pred, 2)}
+    p = artifacts['model'].predict(last_block, verbose=0)
+    final_pred = artifacts['scaler_y'].inverse_transform(p)[0][0]
+    return round(float(final_pred), 2)
+
+
+def train_regression(df, horizon):
+    fitted = fit_regression(df, horizon)
+    return fitted[1] if fitted else None
+
+
+def build_features(ticker, timings=None, **indicators):
+    """
+    Loads the stored bars for a ticker with the requested indicators, read from the
+    incrementally maintained indicator store. The elapsed time is recorded under
+    timings['features'] when a timings dict is passed.
+    """
+    started = time.perf_counter()
+    df = retrieve_data(ticker, indicators=True)
+    if df is not None:
+        df = select_indicators(df, **indicators)
+    if timings is not None:
+        timings['features'] = round(time.perf_counter() - started, 3)
+    return df
+
+
+def _fit_horizon(df, horizon, epochs=None):
+    started = time.perf_counter()
+    cfit = fit_classification(df, horizon)
+    classified = time.perf_counter()
+    rfit = fit_regression(df, horizon, epochs)
+    regressed = time.perf_counter()
+    return horizon, cfit, rfit, {'classify': classified - started, 'regress': regressed - classified}
+
+
+def _fit_shared_horizon(spec, horizon, epochs):
+    shm, df = attach_frame(spec)
+    try:
+        return _fit_horizon(df, horizon, epochs)
+    finally:
+        del df
+        release_frame(shm)
+
+
+def _training_config():
+    config = {**DEFAULT_PREDICTION_TRAINING, **getattr(settings, 'PREDICTION_TRAINING', {})}
+    if config['BACKEND'] not in TRAINING_BACKENDS:
+        raise ImproperlyConfigured(
+            f"PREDICTION_TRAINING['BACKEND'] must be one of {TRAINING_BACKENDS}, got {config['BACKEND']!r}"
+        )
+    return config
+
+
+def train_horizons(df, timings=None):
+    """
+    Fits the classifier and regressor for every horizon on the configured backend and
+    returns {horizon: (classification_fit, regression_fit)}. The process backend places
+    the feature matrix in shared memory once and the workers attach to it. Per-horizon
+    classify/regress seconds are recorded in `timings` when a dict is passed.
+    """
+    config = _training_config()
+    horizons = list(HORIZON_LABELS)
+    workers = worker_count(config['MAX_WORKERS'], len(horizons))
+    if config['BACKEND'] == 'inline':
+        outcomes = [_fit_horizon(df, h, LSTM_EPOCHS) for h in horizons]
+    elif config['BACKEND'] == 'thread':
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            outcomes = list(ex.map(_fit_horizon, repeat(df), horizons, repeat(LSTM_EPOCHS)))
+    else:
+        shm, spec = share_frame(df.select_dtypes(include=[np.number]))
+        try:
+            pool = get_process_pool(workers)
+            outcomes = list(pool.map(_fit_shared_horizon, repeat(spec), horizons, repeat(LSTM_EPOCHS)))
+        except BrokenProcessPool:
+            shutdown_process_pool(workers)
+            raise
+        finally:
+            shm.close()
+            shm.unlink()
+    fits = {}
+    for horizon, cfit, rfit, stage_times in outcomes:
+        fits[horizon] = (cfit, rfit)
+        if timings is not None:
+            for stage, seconds in stage_times.items():
+                timings.setdefault(stage, {})[horizon] = round(seconds, 3)
+    return fits
 
 
 def get_predictions(ticker, MACD=False, RSI=False, SMA=False, EMA=False, ATR=False, BBands=False, VWAP=False):
-    df = retrieve_data(ticker)
+    timings = {}
+    df = build_features(ticker, timings, MACD=MACD, RSI=RSI, SMA=SMA, EMA=EMA, ATR=ATR, BBands=BBands, VWAP=VWAP)
     if df is None:
         return None
-    df = add_indicators(df, MACD=MACD, RSI=RSI, SMA=SMA, EMA=EMA, ATR=ATR, BBands=BBands, VWAP=VWAP)
     results = {}
-    def train_for_horizon(h):
-        c = train_classification(df.copy(), h)
-        r = train_regression(df.copy(), h)
-        return (h, c, r)
-    with ThreadPoolExecutor(max_workers=3) as ex:
-        futures = [ex.submit(train_for_horizon, h) for h in [1,2,3]]
-        for f in as_completed(futures):
-            horizon, cresult, rresult = f.result()
-            if cresult and rresult:
-                lab = {1:'Tomorrow',2:'Week',3:'Month'}[horizon]
-                results[lab] = {'classification': cresult, 'regression': rresult}
-    return results if results else None
\ No newline at end of file
+    for horizon, (cfit, rfit) in train_horizons(df, timings).items():
+        if cfit and rfit:
+            results[HORIZON_LABELS[horizon]] = {'classification': cfit[1], 'regression': rfit[1]}
+    logger.info(f"Prediction training for {ticker} took {timings}")
+    return results if results else None
@@ -0,0 +1,249 @@
+"""
+------------------Prologue--------------------
+File Name: valuation_services.py
+Path: kobrasuitecore/finances/services/valuation_services.py
+
+Description:
+Maintains denormalized valuation snapshots for stock portfolios. A periodic job prices every
+held ticker in one batched lookup and stores a timestamped snapshot per portfolio plus one row per
+position, so the stocks endpoint serves the latest snapshot instead of recomputing from live prices
+and performance charts read a range of snapshots by (portfolio, taken_at). The periodic job only
+writes during market hours and only for portfolios whose value changed, bumping the newest
+snapshot's checked_at for the others; staleness counts only market hours since that check.
+Snapshots older than the VALUATION_SNAPSHOTS retention window are downsampled to one per
+portfolio per market day.
+
+Input:
+StockPortfolio instances and their PortfolioStock holdings.
+
+Output:
+PortfolioValuationSnapshot and PositionValuationSnapshot rows, and payloads built from them.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, prefetch_related_objects
+from django.utils import timezone
+
+from finances.models import (
+    PortfolioValuationSnapshot,
+    PositionValuationSnapshot,
+    StockPortfolio,
+)
+from finances.utils.stock_utils import get_current_prices
+
+SNAPSHOT_STALE_AFTER = timedelta(minutes=30)
+DEFAULT_VALUATION_SNAPSHOTS = {
+    'MARKET_HOURS_ONLY': True,
+    'RAW_DAYS': 7,
+}
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = time(9, 30)
+# Leaves room for the closing prints to land in the last snapshot of the day.
+MARKET_CLOSE = time(16, 15)
+DELETE_BATCH_SIZE = 500
+PERFORMANCE_FIELDS = ('taken_at', 'current_value', 'total_invested', 'profit_loss', 'profit_loss_percentage')
+
+
+def value_position(stock, price):
+    """
+    Values one PortfolioStock at `price` (0 when no price is available).
+    """
+    cp = price or 0
+    val = stock.number_of_shares * cp
+    invest = stock.number_of_shares * stock.pps_at_purchase
+    pl = val - invest
+    pct = (pl / invest) * 100 if invest != 0 else 0
+    return {
+        'ticker': stock.ticker,
+        'number_of_shares': stock.number_of_shares,
+        'pps_at_purchase': stock.pps_at_purchase,
+        'close_price': cp,
+        'current_value': val,
+        'total_invested': invest,
+        'profit_loss': pl,
+        'profit_loss_percentage': pct,
+    }
+
+
+def _totals(positions):
+    value = sum(p['current_value'] for p in positions)
+    invested = sum(p['total_invested'] for p in positions)
+    pl = value - invested
+    return {
+        'current_value': value,
+        'total_invested': invested,
+        'profit_loss': pl,
+        'profit_loss_percentage': (pl / invested) * 100 if invested != 0 else 0,
+    }
+
+
+def _config():
+    return {**DEFAULT_VALUATION_SNAPSHOTS, **getattr(settings, 'VALUATION_SNAPSHOTS', {})}
+
+
+def market_is_open(now=None):
+    """
+    True during the regular US equity session on a weekday. Exchange holidays are not
+    modelled; on those days prices don't move, so unchanged portfolios are skipped anyway.
+    """
+    local = timezone.localtime(now or timezone.now(), MARKET_TZ)
+    return local.weekday() < 5 and MARKET_OPEN <= local.time() <= MARKET_CLOSE
+
+
+def market_time_between(start, end):
+    """
+    Returns how much of the interval [start, end] falls inside weekday market sessions.
+    """
+    start, end = timezone.localtime(start, MARKET_TZ), timezone.localtime(end, MARKET_TZ)
+    total = timedelta()
+    day = start.date()
+    while day <= end.date():
+        if day.weekday() < 5:
+            opens = datetime.combine(day, MARKET_OPEN, MARKET_TZ)
+            closes = datetime.combine(day, MARKET_CLOSE, MARKET_TZ)
+            overlap = min(end, closes) - max(start, opens)
+            if overlap > timedelta():
+                total += overlap
+        day += timedelta(days=1)
+    return total
+
+
+def _latest_totals(portfolio_ids):
+    """
+    Returns {portfolio_id: (snapshot_pk, current_value, total_invested)} for each
+    portfolio's newest snapshot.
+    """
+    newest = (PortfolioValuationSnapshot.objects
+              .filter(portfolio=OuterRef('portfolio'))
+              .order_by('-taken_at')
+              .values('pk')[:1])
+    rows = (PortfolioValuationSnapshot.objects
+            .filter(portfolio_id__in=portfolio_ids, pk=Subquery(newest))
+            .values_list('portfolio_id', 'pk', 'current_value', 'total_invested'))
+    return {pid: (pk, value, invested) for pid, pk, value, invested in rows}
+
+
+def take_valuation_snapshots(portfolios=None, skip_unchanged=False):
+    """
+    Snapshots the given portfolios (default: every portfolio holding stock) using one
+    batched price lookup for all their tickers. With skip_unchanged, portfolios whose
+    value and invested total match their newest snapshot only have that snapshot's
+    checked_at bumped. Returns the created snapshots.
+    """
+    if portfolios is None:
+        portfolios = StockPortfolio.objects.filter(stocks__isnull=False).distinct()
+    portfolios = list(portfolios)
+    prefetch_related_objects(portfolios, 'stocks')
+    holdings = {p.pk: list(p.stocks.all()) for p in portfolios}
+    prices = get_current_prices({s.ticker for stocks in holdings.values() for s in stocks})
+    latest = _latest_totals(list(holdings)) if skip_unchanged else {}
+    now = timezone.now()
+    snapshots, valued, unchanged = [], [], []
+    for portfolio in portfolios:
+        positions = [value_position(s, prices.get(s.ticker.upper())) for s in holdings[portfolio.pk]]
+        if not positions:
+            continue
+        totals = _totals(positions)
+        newest = latest.get(portfolio.pk)
+        if newest and newest[1:] == (totals['current_value'], totals['total_invested']):
+            unchanged.append(newest[0])
+            continue
+        snapshots.append(PortfolioValuationSnapshot(portfolio=portfolio, taken_at=now, checked_at=now, **totals))
+        valued.append(positions)
+    with transaction.atomic():
+        if unchanged:
+            PortfolioValuationSnapshot.objects.filter(pk__in=unchanged).update(checked_at=now)
+        PortfolioValuationSnapshot.objects.bulk_create(snapshots, batch_size=500)
+        PositionValuationSnapshot.objects.bulk_create(
+            [
+                PositionValuationSnapshot(snapshot=snapshot, **position)
+                for snapshot, positions in zip(snapshots, valued)
+                for position in positions
+            ],
+            batch_size=500,
+        )
+    return snapshots
+
+
+def take_scheduled_snapshots(now=None):
+    """
+    The periodic snapshot job: does nothing outside market hours (unless MARKET_HOURS_ONLY
+    is off) and skips portfolios whose value hasn't changed. Returns the created snapshots.
+    """
+    if _config()['MARKET_HOURS_ONLY'] and not market_is_open(now):
+        return []
+    return take_valuation_snapshots(skip_unchanged=True)
+
+
+def downsample_valuation_snapshots(now=None, lookback_days=30):
+    """
+    Keeps only the last snapshot per portfolio per market day for snapshots older than
+    RAW_DAYS. Only the `lookback_days` before that cutoff are scanned, since older days
+    were thinned by earlier runs. Returns the number of snapshots deleted.
+    """
+    cutoff = (now or timezone.now()) - timedelta(days=_config()['RAW_DAYS'])
+    rows = (PortfolioValuationSnapshot.objects
+            .filter(taken_at__lt=cutoff, taken_at__gte=cutoff - timedelta(days=lookback_days))
+            .order_by('portfolio_id', 'taken_at')
+            .values_list('pk', 'portfolio_id', 'taken_at'))
+    keep, drop = {}, []
+    for pk, portfolio_id, taken_at in rows.iterator():
+        day = (portfolio_id, timezone.localtime(taken_at, MARKET_TZ).date())
+        if day in keep:
+            drop.append(keep[day])
+        keep[day] = pk
+    deleted = 0
+    for i in range(0, len(drop), DELETE_BATCH_SIZE):
+        batch = drop[i:i + DELETE_BATCH_SIZE]
+        PortfolioValuationSnapshot.objects.filter(pk__in=batch).delete()
+        deleted += len(batch)
+    return deleted
+
+
+def get_latest_valuation(portfolio, now=None):
+    """
+    Returns (snapshot, stale) for the portfolio's newest snapshot, taking a fresh one
+    when none exists or the holdings changed after it was taken. `stale` is True when
+    more than SNAPSHOT_STALE_AFTER of market hours passed since the snapshot was last
+    checked, so nights and weekends don't age it. Returns (None, False) for a portfolio
+    with no holdings.
+    """
+    snapshot = (PortfolioValuationSnapshot.objects
+                .filter(portfolio=portfolio)
+                .prefetch_related('positions')
+                .order_by('-taken_at')
+                .first())
+    if snapshot is None or snapshot.taken_at < portfolio.updated_at:
+        created = take_valuation_snapshots([portfolio])
+        if not created:
+            return None, False
+        snapshot = (PortfolioValuationSnapshot.objects
+                    .prefetch_related('positions')
+                    .get(pk=created[0].pk))
+    return snapshot, market_time_between(snapshot.checked_at, now or timezone.now()) > SNAPSHOT_STALE_AFTER
+
+
+def get_valuation_history(portfolio, start=None, end=None):
+    """
+    Returns the portfolio's snapshot totals between `start` and `end` (inclusive),
+    oldest first, for performance charts.
+    """
+    qs = PortfolioValuationSnapshot.objects.filter(portfolio=portfolio)
+    if start:
+        qs = qs.filter(taken_at__gte=start)
+    if end:
+        qs = qs.filter(taken_at__lte=end)
+    return list(qs.order_by('taken_at').values(*PERFORMANCE_FIELDS))
+
+
+def invalidate_portfolio_valuation(portfolio):
+    """
+    Marks the portfolio's holdings as changed so the next read takes a fresh snapshot.
+    """
+    StockPortfolio.objects.filter(pk=portfolio.pk).update(updated_at=timezone.now())
@@ -0,0 +1,70 @@
+"""
+------------------Prologue--------------------
+File Name: tasks.py
+Path: kobrasuitecore/finances/tasks.py
+
+Description:
+Defines asynchronous Celery tasks for background processing within the finances module.
+Tasks include the nightly risk scoring of every stock portfolio, periodic portfolio
+valuation snapshots and their nightly downsampling, and training prediction models for
+the model registry.
+
+Input:
+Scheduled task triggers.
+
+Output:
+Background operations that update the database and log task outcomes.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import logging
+from celery import shared_task
+from .services.risk_services import score_portfolios
+from .services.valuation_services import downsample_valuation_snapshots, take_scheduled_snapshots
+from .services.prediction_registry_services import (
+    train_and_register,
+    record_training_result,
+    prune_prediction_models,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def score_portfolio_risk():
+    count = score_portfolios()
+    logger.info(f"Nightly risk scoring finished. Portfolios scored: {count}")
+    return count
+
+
+@shared_task
+def snapshot_portfolio_valuations():
+    count = len(take_scheduled_snapshots())
+    logger.info(f"Portfolio valuation snapshots taken: {count}")
+    return count
+
+
+@shared_task
+def downsample_portfolio_valuations():
+    count = downsample_valuation_snapshots()
+    logger.info(f"Downsampled portfolio valuation snapshots. Deleted: {count}")
+    return count
+
+
+@shared_task
+def train_prediction_models(ticker, flags):
+    registered = 0
+    try:
+        registered = train_and_register(ticker, flags)
+    finally:
+        record_training_result(ticker, flags, registered)
+    logger.info(f"Trained prediction models for {ticker}. Horizons registered: {registered}")
+    return registered
+
+
+@shared_task
+def prune_stale_prediction_models(keep_days=7):
+    count = prune_prediction_models(keep_days)
+    logger.info(f"Pruned {count} stale prediction models.")
+    return count
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from django.core.cache import cache
+
+from finances.utils import market_data
+from finances.utils.market_data import LocalMarketDataProvider, set_market_data_provider
+
+
+def make_history(days=30, start_price=100.0, seed=0, end=None):
+    """
+    Builds a deterministic OHLCV frame shaped like yfinance's Ticker.history output.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end or pd.Timestamp.today().normalize())
+    index = pd.bdate_range(end=end, periods=days, tz='America/New_York', name='Date')
+    close = start_price * np.cumprod(1 + rng.normal(0, 0.01, days))
+    return pd.DataFrame({
+        'Open': close * 0.995,
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, days),
+    }, index=index)
+
+
+@pytest.fixture
+def local_provider():
+    """
+    Installs an offline LocalMarketDataProvider behind the market data cache.
+    """
+    cache.clear()
+    previous = market_data._market_data
+    provider = LocalMarketDataProvider(
+        histories={
+            'AAPL': make_history(seed=1, start_price=190.0),
+            'MSFT': make_history(seed=2, start_price=410.0),
+            'SPY': make_history(seed=3, start_price=520.0),
+        },
+        infos={
+            'AAPL': {'symbol': 'AAPL', 'shortName': 'Apple Inc.', 'regularMarketOpen': 190.0,
+                     'regularMarketPrice': 191.0, 'currentPrice': 191.0},
+        },
+    )
+    set_market_data_provider(provider)
+    yield provider
+    market_data._market_data = previous
+    cache.clear()
+
+
+@pytest.fixture
+def finance_profile(django_user_model):
+    """
+    A user's FinanceProfile; the customer signals also create its first StockPortfolio.
+    """
+    user = django_user_model.objects.create_user(username='investor', password='pass12345')
+    return user.profile.finance_profile
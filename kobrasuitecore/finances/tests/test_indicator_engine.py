@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finances.models import DailyBar, IndicatorState
+from finances.services.indicator_services import update_indicators, verify_indicators
+from finances.services.price_history_services import get_daily_bars, get_indicator_chart, sync_daily_bars
+from finances.services.stock_prediction_services import add_indicators, select_indicators
+from finances.tests.conftest import make_history
+from finances.utils.indicator_engine import INDICATOR_COLUMNS, IndicatorEngine
+
+ALL_FLAGS = dict(MACD=True, RSI=True, SMA=True, EMA=True, ATR=True, BBands=True, VWAP=True)
+
+
+def engine_frame(df, engine=None):
+    engine = engine or IndicatorEngine()
+    rows = [engine.update(r.Open, r.High, r.Low, r.Close, r.Volume) for r in df.itertuples()]
+    return pd.DataFrame.from_records(rows, columns=list(INDICATOR_COLUMNS), index=df.index).astype(float)
+
+
+class TestIndicatorEngine:
+    def test_matches_pandas_indicators(self):
+        df = make_history(days=120, seed=7)
+        expected = add_indicators(df.copy().astype(float), **ALL_FLAGS)
+        actual = engine_frame(df).loc[expected.index]
+        for col in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(actual[col], expected[col], rtol=1e-9, err_msg=col)
+
+    def test_warmup_values_are_missing(self):
+        values = engine_frame(make_history(days=25, seed=8))
+        assert values['SMA'].isna().sum() == 13
+        assert values['BB_Upper'].isna().sum() == 19
+        assert values['EMA'].notna().all()
+
+    def test_state_round_trip_resumes_exactly(self):
+        df = make_history(days=60, seed=9)
+        full = engine_frame(df)
+        first = IndicatorEngine()
+        engine_frame(df.iloc[:40], first)
+        resumed = engine_frame(df.iloc[40:], IndicatorEngine.from_state(first.to_state()))
+        pd.testing.assert_frame_equal(resumed, full.iloc[40:])
+
+
+@pytest.mark.django_db
+class TestIndicatorStore:
+    def test_sync_stores_indicators_incrementally(self, local_provider):
+        local_provider.histories['AAPL'] = make_history(days=60, seed=1)
+        sync_daily_bars('AAPL')
+        state = IndicatorState.objects.get(ticker='AAPL')
+        assert state.state['count'] == DailyBar.objects.filter(ticker='AAPL').count()
+        last = DailyBar.objects.filter(ticker='AAPL').last()
+        assert set(last.indicators) == set(INDICATOR_COLUMNS)
+        assert state.last_date == last.date
+
+        DailyBar.objects.create(ticker='AAPL', date=last.date + pd.Timedelta(days=3),
+                                open=last.close, high=last.close * 1.02, low=last.close * 0.98,
+                                close=last.close * 1.01, volume=2_000_000)
+        assert update_indicators('AAPL') == 1
+        assert update_indicators('AAPL') == 0
+        assert max(verify_indicators('AAPL').values()) < 1e-9
+
+    def test_backfilled_bars_trigger_full_recompute(self, local_provider):
+        local_provider.histories['AAPL'] = make_history(days=60, seed=1)
+        sync_daily_bars('AAPL')
+        first = DailyBar.objects.filter(ticker='AAPL').first()
+        DailyBar.objects.create(ticker='AAPL', date=first.date - pd.Timedelta(days=7),
+                                open=1, high=2, low=1, close=1.5, volume=100)
+        assert update_indicators('AAPL') == DailyBar.objects.filter(ticker='AAPL').count()
+        assert max(verify_indicators('AAPL').values()) < 1e-9
+
+    def test_stored_features_match_recomputed_features(self, local_provider):
+        local_provider.histories['AAPL'] = make_history(days=80, seed=1)
+        stored = select_indicators(get_daily_bars('AAPL', indicators=True), RSI=True, BBands=True)
+        recomputed = add_indicators(get_daily_bars('AAPL').astype(float), RSI=True, BBands=True)
+        assert list(stored.columns) == list(recomputed.columns)
+        pd.testing.assert_frame_equal(stored.astype(float), recomputed, rtol=1e-9)
+
+    def test_indicator_chart_serves_store(self, local_provider):
+        chart = get_indicator_chart('AAPL', limit=5)
+        assert len(chart) == 5
+        assert chart[-1]['EMA'] is not None
+        assert chart[-1]['BB_Upper'] is not None
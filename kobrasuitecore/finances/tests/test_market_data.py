@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from finances.utils.market_data import LRUCache, _MISSING, get_market_data
+from finances.utils.stock_utils import (
+    check_stock_validity,
+    get_current_stock_price,
+    get_stock_chart,
+    get_stock_price_at_date,
+    get_stock_results_data,
+)
+
+
+class TestLRUCache:
+
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(maxsize=2)
+        lru.set('a', 1, None)
+        lru.set('b', 2, None)
+        lru.get('a')
+        lru.set('c', 3, None)
+        assert lru.get('b') is _MISSING
+        assert lru.get('a') == 1
+
+    def test_expired_entries_are_dropped(self):
+        lru = LRUCache()
+        lru.set('a', 1, -1)
+        assert lru.get('a') is _MISSING
+
+
+class TestMarketDataCache:
+
+    def test_quote_is_fetched_once(self, local_provider):
+        first = get_current_stock_price('aapl')
+        second = get_current_stock_price('AAPL')
+        assert first == second == pytest.approx(local_provider.histories['AAPL']['Close'].iloc[-1])
+        assert local_provider.calls.count(('history', 'AAPL')) == 1
+
+    def test_shared_tier_survives_process_cache_clear(self, local_provider):
+        get_current_stock_price('MSFT')
+        get_market_data().clear()
+        get_current_stock_price('MSFT')
+        assert local_provider.calls.count(('history', 'MSFT')) == 1
+
+    def test_info_backs_validity_and_results(self, local_provider):
+        assert check_stock_validity('AAPL') is True
+        assert get_stock_results_data('AAPL')['name'] == 'Apple Inc.'
+        assert local_provider.calls.count(('info', 'AAPL')) == 1
+        assert check_stock_validity('NOPE') is False
+
+    def test_cached_history_is_not_mutated_by_callers(self, local_provider):
+        chart = get_stock_chart('AAPL')
+        assert len(chart) == 30
+        assert 'Date' in chart[0]
+        assert get_market_data().history('AAPL', period='5y').index.name == 'Date'
+        assert local_provider.calls.count(('history', 'AAPL')) == 1
+
+    def test_price_at_past_date_uses_closed_history(self, local_provider):
+        frame = local_provider.histories['MSFT']
+        target = frame.index[-10]
+        price = get_stock_price_at_date('MSFT', target)
+        assert price == pytest.approx(frame['Close'].iloc[-10])
+        get_stock_price_at_date('MSFT', target)
+        assert local_provider.calls.count(('history', 'MSFT')) == 1
+        assert get_market_data().ttls['closed_history'] == 24 * 60 * 60
+
+    def test_missing_data_is_not_cached(self, local_provider):
+        assert get_current_stock_price('NOPE') is None
+        assert get_current_stock_price('NOPE') is None
+        assert local_provider.calls.count(('history', 'NOPE')) == 2
+        assert get_market_data().history('NOPE', period='1d').equals(pd.DataFrame())
@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+
+from finances.models import PredictionModel
+from finances.services import prediction_registry_services as registry
+from finances.services import stock_prediction_services
+from finances.tests.conftest import make_history
+from finances.utils import market_data
+from finances.utils.market_data import LocalMarketDataProvider, set_market_data_provider
+
+FLAGS = {'RSI': True, 'SMA': True}
+
+
+@pytest.fixture
+def trainable(settings, tmp_path, monkeypatch):
+    """
+    Offline provider with enough history to train every horizon, fast LSTM fits and
+    artifacts written to a temporary MEDIA_ROOT.
+    """
+    settings.MEDIA_ROOT = tmp_path
+    monkeypatch.setattr(stock_prediction_services, 'LSTM_EPOCHS', 1)
+    cache.clear()
+    registry._loaded_models.clear()
+    previous = market_data._market_data
+    provider = LocalMarketDataProvider(histories={'AAPL': make_history(days=160, seed=4, start_price=180.0)})
+    set_market_data_provider(provider)
+    yield tmp_path
+    market_data._market_data = previous
+    registry._loaded_models.clear()
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestPredictionRegistry:
+    def test_indicator_key_is_canonical(self):
+        assert registry.indicator_key({'SMA': True, 'RSI': True, 'MACD': False}) == 'RSI+SMA'
+        assert registry.indicator_key({}) == 'none'
+
+    def test_predict_returns_none_before_training(self, trainable):
+        assert registry.predict_from_registry('AAPL', FLAGS) is None
+
+    def test_train_registers_artifacts_per_horizon(self, trainable):
+        assert registry.train_and_register('aapl', FLAGS) == 3
+        entries = PredictionModel.objects.filter(ticker='AAPL', indicator_key='RSI+SMA')
+        assert sorted(entries.values_list('horizon', flat=True)) == [1, 2, 3]
+        for entry in entries:
+            directory = trainable / entry.artifact_dir
+            assert (directory / 'estimators.joblib').exists()
+            assert (directory / 'regressor.keras').exists()
+            assert set(entry.metrics) == {'classification', 'regression', 'timings'}
+
+    def test_predict_serves_registered_models(self, trainable):
+        registry.train_and_register('AAPL', FLAGS)
+        result = registry.predict_from_registry('AAPL', FLAGS)
+        assert list(result) == ['Tomorrow', 'Week', 'Month']
+        assert result['Week']['classification']['today_prediction'] in (0, 1)
+        assert isinstance(result['Month']['regression']['prediction'], float)
+        assert registry.predict_from_registry('AAPL', {'MACD': True}) is None
+
+    def test_partially_trained_models_are_not_served(self, trainable, monkeypatch):
+        registry.train_and_register('AAPL', FLAGS)
+        PredictionModel.objects.filter(ticker='AAPL', horizon=3).delete()
+        assert registry.predict_from_registry('AAPL', FLAGS) is None
+        monkeypatch.setattr('finances.tasks.train_prediction_models.delay', lambda t, f: None)
+        assert registry.request_training('AAPL', FLAGS) == 'pending'
+
+    def test_current_models_answer_from_the_registry(self, trainable, monkeypatch):
+        registry.train_and_register('AAPL', FLAGS)
+        expected = PredictionModel.objects.get(horizon=2).metrics['regression']['prediction']
+        monkeypatch.setattr(registry, 'build_features', lambda *a, **k: pytest.fail('rebuilt features'))
+        monkeypatch.setattr(registry.keras.models, 'load_model', lambda *a, **k: pytest.fail('loaded model'))
+        assert registry.predict_from_registry('AAPL', FLAGS)['Week']['regression']['prediction'] == expected
+
+    def test_previous_models_serve_while_retraining(self, trainable, monkeypatch):
+        registry.train_and_register('AAPL', FLAGS)
+        as_of = PredictionModel.objects.first().data_as_of
+        PredictionModel.objects.update(data_as_of=as_of - timedelta(days=1))
+        queued, built = [], []
+        build_features = registry.build_features
+        monkeypatch.setattr('finances.tasks.train_prediction_models.delay', lambda t, f: queued.append(t))
+        monkeypatch.setattr(registry, 'build_features', lambda *a, **k: built.append(a) or build_features(*a, **k))
+        result = registry.predict_from_registry('AAPL', FLAGS)
+        assert list(result) == ['Tomorrow', 'Week', 'Month']
+        monkeypatch.setattr(registry.keras.models, 'load_model', lambda *a, **k: pytest.fail('reloaded'))
+        assert registry.predict_from_registry('AAPL', FLAGS) == result
+        assert queued == ['AAPL'] and len(built) == 1
+
+    def test_request_training_runs_task_once(self, trainable, monkeypatch):
+        calls = []
+        original = registry.train_and_register
+        monkeypatch.setattr('finances.tasks.train_and_register', lambda t, f: calls.append(t) or original(t, f))
+        assert registry.request_training('AAPL', FLAGS) == 'ready'
+        assert registry.request_training('AAPL', FLAGS) == 'ready'
+        assert calls == ['AAPL']
+        assert registry.predict_from_registry('AAPL', FLAGS) is not None
+
+    def test_request_training_dedupes_pending_jobs(self, trainable, monkeypatch):
+        calls = []
+        monkeypatch.setattr('finances.tasks.train_prediction_models.delay', lambda t, f: calls.append(t))
+        assert registry.request_training('AAPL', FLAGS) == 'pending'
+        assert registry.request_training('AAPL', FLAGS) == 'pending'
+        assert calls == ['AAPL']
+
+    def test_request_training_reports_failure(self, trainable, monkeypatch):
+        monkeypatch.setattr('finances.tasks.train_and_register', lambda t, f: 0)
+        assert registry.request_training('AAPL', FLAGS) == 'failed'
+        assert registry.request_training('AAPL', FLAGS) == 'failed'
+
+    def test_prune_removes_stale_entries(self, trainable):
+        registry.train_and_register('AAPL', FLAGS)
+        entry = PredictionModel.objects.first()
+        assert registry.prune_prediction_models(keep_days=-1) == 3
+        assert not (trainable / entry.artifact_dir).exists()
+
+    def test_registry_records_stage_timings(self, trainable):
+        registry.train_and_register('AAPL', FLAGS)
+        timings = PredictionModel.objects.get(horizon=1).metrics['timings']
+        assert set(timings) == {'features', 'classify', 'regress'}
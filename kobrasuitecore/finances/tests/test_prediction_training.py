@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from finances.services import stock_prediction_services
+from finances.services.stock_prediction_services import add_indicators, train_horizons
+from finances.tests.conftest import make_history
+from finances.utils.training_pool import (
+    attach_frame,
+    get_process_pool,
+    release_frame,
+    share_frame,
+    shutdown_process_pool,
+    worker_count,
+)
+
+
+def training_frame():
+    df = make_history(days=140, seed=5, start_price=90.0)
+    df['Tomorrow'] = (df['Close'].shift(-1) > df['Close']).astype(int)
+    df['Week'] = (df['Close'].shift(-5) > df['Close']).astype(int)
+    df['Month'] = (df['Close'].shift(-21) > df['Close']).astype(int)
+    df['Close_Tomorrow'] = df['Close'].shift(-1)
+    df['Close_NextWeek'] = df['Close'].shift(-5)
+    df['Close_NextMonth'] = df['Close'].shift(-21)
+    return add_indicators(df, RSI=True, SMA=True)
+
+
+@pytest.fixture
+def fast_lstm(monkeypatch):
+    monkeypatch.setattr(stock_prediction_services, 'LSTM_EPOCHS', 1)
+
+
+class TestTrainingPool:
+    def test_worker_count_is_bounded(self):
+        assert worker_count(2, 3) == 2
+        assert worker_count(8, 3) == 3
+        assert worker_count(None, 1) == 1
+
+    def test_pools_are_kept_per_worker_count(self):
+        try:
+            one = get_process_pool(1)
+            assert get_process_pool(1) is one
+            assert get_process_pool(2) is not one
+            assert get_process_pool(2)._max_workers == 2
+        finally:
+            shutdown_process_pool(1)
+            shutdown_process_pool(2)
+
+    def test_shared_frame_round_trip(self):
+        df = training_frame()
+        shm, spec = share_frame(df)
+        try:
+            view_shm, view = attach_frame(spec)
+            assert list(view.columns) == list(df.columns)
+            assert view.index.equals(df.index)
+            np.testing.assert_allclose(view.to_numpy(), df.to_numpy(dtype=float), equal_nan=True)
+            del view
+            release_frame(view_shm)
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+class TestTrainingBackends:
+    @pytest.mark.parametrize('backend', ['inline', 'thread'])
+    def test_in_process_backends_fit_every_horizon(self, settings, fast_lstm, backend):
+        settings.PREDICTION_TRAINING = {'BACKEND': backend, 'MAX_WORKERS': 2}
+        timings = {}
+        fits = train_horizons(training_frame(), timings)
+        assert sorted(fits) == [1, 2, 3]
+        assert all(cfit and rfit for cfit, rfit in fits.values())
+        assert set(timings) == {'classify', 'regress'}
+        assert sorted(timings['regress']) == [1, 2, 3]
+
+    def test_process_backend_returns_usable_models(self, settings, fast_lstm):
+        settings.PREDICTION_TRAINING = {'BACKEND': 'process', 'MAX_WORKERS': 2}
+        df = training_frame()
+        timings = {}
+        fits = train_horizons(df, timings)
+        assert sorted(fits) == [1, 2, 3]
+        artifacts, result = fits[2][1]
+        assert isinstance(result['prediction'], float)
+        assert stock_prediction_services.predict_regression(artifacts, df, 2) == pytest.approx(result['prediction'])
+        assert stock_prediction_services.predict_classification(fits[1][0][0], df, 1) in (0, 1)
+        assert sorted(timings['classify']) == [1, 2, 3]
+
+    def test_unknown_backend_is_rejected(self, settings):
+        settings.PREDICTION_TRAINING = {'BACKEND': 'gpu'}
+        with pytest.raises(ImproperlyConfigured):
+            train_horizons(training_frame())
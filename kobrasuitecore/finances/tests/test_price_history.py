@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+
+from finances.models import DailyBar
+from finances.services import price_history_services
+from finances.services.price_history_services import get_close_matrix, get_daily_bars, sync_daily_bars
+from finances.services.stock_services import portfolio_analysis
+from finances.tests.conftest import make_history
+
+
+def closed(df):
+    return df[df.index.date < date.today()]
+
+
+@pytest.mark.django_db
+class TestDailyBarStore:
+
+    def test_sync_stores_closed_sessions_once(self, local_provider):
+        written = sync_daily_bars('AAPL')
+        assert written == DailyBar.objects.filter(ticker='AAPL').count()
+        assert not DailyBar.objects.filter(date__gte=date.today()).exists()
+        assert sync_daily_bars('AAPL') == 0
+        assert local_provider.calls.count(('history', 'AAPL')) == 1
+
+    def test_only_trailing_days_are_appended(self, local_provider):
+        full = closed(local_provider.histories['AAPL'])
+        local_provider.histories['AAPL'] = full.iloc[:-3]
+        first = sync_daily_bars('AAPL')
+        local_provider.histories['AAPL'] = full
+        cache.clear()
+        assert sync_daily_bars('AAPL') == 3
+        assert DailyBar.objects.filter(ticker='AAPL').count() == first + 3 == len(full)
+
+    def test_full_resync_bypasses_the_cached_history(self, local_provider):
+        sync_daily_bars('AAPL')
+        adjusted = local_provider.histories['AAPL'].copy()
+        adjusted[['Open', 'High', 'Low', 'Close']] /= 2
+        local_provider.histories['AAPL'] = adjusted
+        sync_daily_bars('AAPL', full=True)
+        stored = DailyBar.objects.filter(ticker='AAPL').order_by('date').values_list('close', flat=True)
+        assert list(stored) == pytest.approx(closed(adjusted)['Close'].tolist())
+
+    def test_failed_full_resync_keeps_stored_bars(self, local_provider, monkeypatch):
+        stored = sync_daily_bars('AAPL')
+
+        def broken(ticker, full=False):
+            raise RuntimeError('indicator update failed')
+
+        monkeypatch.setattr(price_history_services, 'update_indicators', broken)
+        with pytest.raises(RuntimeError):
+            sync_daily_bars('AAPL', full=True)
+        assert DailyBar.objects.filter(ticker='AAPL').count() == stored
+
+    def test_frames_match_provider_history(self, local_provider):
+        df = get_daily_bars('MSFT')
+        source = closed(local_provider.histories['MSFT'])
+        assert list(df.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert df['Close'].tolist() == pytest.approx(source['Close'].tolist())
+
+    def test_close_matrix_aligns_tickers(self, local_provider):
+        local_provider.histories['NEW'] = make_history(days=10, seed=9)
+        matrix = get_close_matrix(['AAPL', 'new'])
+        assert list(matrix.columns) == ['AAPL', 'NEW']
+        assert len(matrix) == len(closed(local_provider.histories['NEW']))
+        assert not matrix.isna().any().any()
+
+    def test_portfolio_analysis_reads_local_store(self, local_provider):
+        metrics = portfolio_analysis({'AAPL': 10, 'MSFT': 5})
+        assert metrics is not None
+        assert set(metrics) >= {'expected_return', 'risk', 'sharpe_ratio', 'beta'}
+        calls = len(local_provider.calls)
+        portfolio_analysis({'AAPL': 10, 'MSFT': 5})
+        assert len(local_provider.calls) == calls
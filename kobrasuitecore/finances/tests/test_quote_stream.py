@@ -0,0 +1,148 @@
+from datetime import datetime
+
+import pytest
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+
+from finances.models import PortfolioStock, WatchlistStock
+from finances.routing import websocket_urlpatterns
+from finances.utils.quote_poller import QuotePoller, get_quote_poller, quote_group, reset_quote_poller
+
+
+class FakeFeed:
+    """
+    Local quote source that records every batch it is asked for.
+    """
+    def __init__(self, prices):
+        self.prices = dict(prices)
+        self.calls = []
+
+    def __call__(self, tickers):
+        self.calls.append(tuple(tickers))
+        return {t: self.prices.get(t) for t in tickers}
+
+
+@pytest.fixture
+def feed(settings):
+    feed = FakeFeed({'AAPL': 190.0, 'MSFT': 410.0})
+    settings.QUOTE_STREAM = {'SOURCE': feed, 'INTERVAL': 3600}
+    cache.clear()
+    reset_quote_poller()
+    yield feed
+    reset_quote_poller()
+    cache.clear()
+
+
+@pytest.fixture
+def investors(django_user_model):
+    users = []
+    for name, held, watched in (('alice', ['AAPL'], ['msft']), ('bob', ['AAPL'], [])):
+        user = django_user_model.objects.create_user(username=name, password='pass12345')
+        portfolio = user.profile.finance_profile.stock_portfolios.first()
+        for t in held:
+            PortfolioStock.objects.create(portfolio=portfolio, ticker=t, number_of_shares=1, pps_at_purchase=100)
+        for t in watched:
+            WatchlistStock.objects.create(portfolio=portfolio, ticker=t)
+        users.append(user)
+    return users
+
+
+async def connect(user):
+    communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), '/ws/finances/quotes/')
+    communicator.scope['user'] = user
+    connected, _ = await communicator.connect()
+    return communicator, connected
+
+
+async def drain(communicator):
+    messages = []
+    while not await communicator.receive_nothing(timeout=0.1):
+        messages.append(await communicator.receive_json_from())
+    return messages
+
+
+@database_sync_to_async
+def first_portfolio(user):
+    return user.profile.finance_profile.stock_portfolios.first()
+
+
+@database_sync_to_async
+def create_watch(portfolio, ticker):
+    return WatchlistStock.objects.create(portfolio=portfolio, ticker=ticker)
+
+
+class TestQuoteGroups:
+    def test_group_names_are_channel_layer_safe(self):
+        assert quote_group('brk-b') == 'quotes.BRK-B'
+        assert quote_group('^GSPC') == 'quotes._GSPC'
+
+
+class TestQuoteLeases:
+    async def test_only_the_lease_holder_polls_a_ticker(self, feed):
+        first, second = QuotePoller(feed, 3600), QuotePoller(feed, 3600)
+        first.subscriptions.update(['AAPL'])
+        second.subscriptions.update(['AAPL', 'MSFT'])
+        assert await first.poll_once() == 1
+        assert await second.poll_once() == 1
+        assert feed.calls == [('AAPL',), ('MSFT',)]
+
+        await first.unsubscribe(['AAPL'])
+        feed.calls.clear()
+        assert await second.poll_once() == 1
+        assert feed.calls == [('AAPL', 'MSFT')]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPortfolioQuotesConsumer:
+    async def test_rejects_anonymous_users(self, feed):
+        communicator, connected = await connect(AnonymousUser())
+        assert connected is False
+
+    async def test_snapshot_covers_holdings_and_watchlist(self, feed, investors):
+        alice, _ = investors
+        communicator, connected = await connect(alice)
+        assert connected
+        snapshot = await communicator.receive_json_from()
+        assert snapshot['type'] == 'snapshot'
+        assert snapshot['quotes'] == {'AAPL': 190.0, 'MSFT': 410.0}
+        assert datetime.fromisoformat(snapshot['timestamp']).utcoffset().total_seconds() == 0
+        await communicator.disconnect()
+
+    async def test_shared_poller_fetches_each_ticker_once(self, feed, investors):
+        alice, bob = investors
+        first, _ = await connect(alice)
+        second, _ = await connect(bob)
+        await drain(first)
+        await drain(second)
+        poller = get_quote_poller()
+        assert poller.subscriptions == {'AAPL': 2, 'MSFT': 1}
+
+        feed.prices['AAPL'] = 191.5
+        feed.calls.clear()
+        assert await poller.poll_once() == 1
+        assert feed.calls == [('AAPL', 'MSFT')]
+        for communicator in (first, second):
+            tick = await communicator.receive_json_from()
+            assert (tick['type'], tick['ticker'], tick['price']) == ('quote', 'AAPL', 191.5)
+            assert await communicator.receive_nothing(timeout=0.1)
+
+        await first.disconnect()
+        assert poller.subscriptions == {'AAPL': 1}
+        await second.disconnect()
+        assert not poller.subscriptions
+        assert poller._task is None
+
+    async def test_refresh_picks_up_new_positions(self, feed, investors):
+        _, bob = investors
+        communicator, _ = await connect(bob)
+        await drain(communicator)
+        portfolio = await first_portfolio(bob)
+        await create_watch(portfolio, 'MSFT')
+        await communicator.send_json_to({'type': 'refresh'})
+        snapshot = await communicator.receive_json_from()
+        assert snapshot == {**snapshot, 'type': 'snapshot', 'quotes': {'MSFT': 410.0}}
+        assert get_quote_poller().subscriptions == {'AAPL': 1, 'MSFT': 1}
+        await communicator.disconnect()
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finances.models import PortfolioRiskMetrics, PortfolioStock, StockPortfolio
+from finances.services.risk_services import analyze_holdings, get_portfolio_risk_metrics, score_portfolios
+from finances.services.stock_services import add_stock_to_portfolio
+from finances.tasks import score_portfolio_risk
+from finances.tests.conftest import make_history
+from finances.utils.risk_engine import METRIC_NAMES, compute_risk_metrics
+
+
+def reference_metrics(returns, weights, bench):
+    """
+    The per-portfolio pandas pipeline the engine replaces.
+    """
+    mu = returns.mean() * 252
+    cov = returns.cov() * 252
+    er = float(weights.dot(mu))
+    risk = float(np.sqrt(weights.T.dot(cov).dot(weights)))
+    pdaily = (returns * weights).sum(axis=1)
+    b, a = np.polyfit(bench, pdaily, 1)
+    ex_ret = pdaily - 0.02 / 252
+    dn = ex_ret[ex_ret < 0]
+    dn_dev = dn.pow(2).mean() ** 0.5 * 252 ** 0.5
+    cumret = (1 + pdaily).cumprod()
+    dd = (cumret - cumret.cummax()) / cumret.cummax()
+    return {
+        'expected_return': er,
+        'risk': risk,
+        'sharpe_ratio': (er - 0.02) / risk,
+        'diversification_ratio': weights.dot(returns.std() * 252 ** 0.5) / risk,
+        'alpha': a,
+        'beta': b,
+        'sortino_ratio': (er - 0.02) / dn_dev,
+        'max_drawdown': dd.min(),
+    }
+
+
+class TestRiskEngine:
+
+    def test_batched_metrics_match_per_portfolio_pipeline(self):
+        rng = np.random.default_rng(7)
+        returns = pd.DataFrame(rng.normal(0.0005, 0.01, (300, 4)), columns=list('ABCD'))
+        bench = pd.Series(rng.normal(0.0004, 0.008, 300))
+        weights = rng.dirichlet(np.ones(4), size=5)
+        batched = compute_risk_metrics(returns.to_numpy(), weights, benchmark=bench.to_numpy())
+        for i, w in enumerate(weights):
+            expected = reference_metrics(returns, w, bench)
+            for name in METRIC_NAMES:
+                assert batched[name][i] == pytest.approx(expected[name], rel=1e-9), name
+
+    def test_gaps_are_masked_per_portfolio(self):
+        rng = np.random.default_rng(11)
+        returns = pd.DataFrame(rng.normal(0.0005, 0.01, (200, 3)), columns=list('ABC'))
+        bench = pd.Series(rng.normal(0.0004, 0.008, 200))
+        returns.iloc[:120, 2] = np.nan
+        weights = np.array([[0.6, 0.4, 0.0], [0.2, 0.3, 0.5]])
+        batched = compute_risk_metrics(returns.to_numpy(), weights, benchmark=bench.to_numpy())
+        for i, columns, rows in ((0, ['A', 'B'], slice(None)), (1, ['A', 'B', 'C'], slice(120, None))):
+            w = weights[i][[list('ABC').index(c) for c in columns]]
+            expected = reference_metrics(returns[columns].iloc[rows], w, bench.iloc[rows])
+            for name in METRIC_NAMES:
+                assert batched[name][i] == pytest.approx(expected[name], rel=1e-9), name
+
+    def test_single_asset_portfolio(self):
+        returns = np.array([[0.01], [-0.02], [0.015], [0.0]])
+        metrics = compute_risk_metrics(returns, [[1.0]])
+        assert metrics['diversification_ratio'][0] == pytest.approx(1.0)
+        assert metrics['beta'][0] == 1.0
+
+
+@pytest.mark.django_db
+class TestPortfolioScoring:
+
+    def test_nightly_task_scores_every_portfolio(self, local_provider, finance_profile):
+        first = finance_profile.stock_portfolios.first()
+        second = StockPortfolio.objects.create(finance_profile=finance_profile)
+        PortfolioStock.objects.create(portfolio=first, ticker='AAPL', number_of_shares=3, pps_at_purchase=150)
+        PortfolioStock.objects.create(portfolio=second, ticker='MSFT', number_of_shares=1, pps_at_purchase=300)
+        PortfolioStock.objects.create(portfolio=second, ticker='AAPL', number_of_shares=2, pps_at_purchase=150)
+        assert score_portfolio_risk.delay().get() == 2
+        assert PortfolioRiskMetrics.objects.count() == 2
+        assert local_provider.calls.count(('quotes', ('AAPL', 'MSFT'))) == 1
+        score_portfolios()
+        assert PortfolioRiskMetrics.objects.count() == 2
+
+    def test_holdings_change_invalidates_stored_metrics(self, local_provider, finance_profile):
+        portfolio = finance_profile.stock_portfolios.first()
+        PortfolioStock.objects.create(portfolio=portfolio, ticker='AAPL', number_of_shares=3, pps_at_purchase=150)
+        metrics = get_portfolio_risk_metrics(portfolio)
+        assert metrics.as_dict()['risk'] > 0
+        assert add_stock_to_portfolio(finance_profile, portfolio.pk, 'MSFT', 1) is True
+        assert not PortfolioRiskMetrics.objects.filter(portfolio=portfolio).exists()
+        assert get_portfolio_risk_metrics(portfolio).pk != metrics.pk
+
+    def test_ticker_without_history_only_skips_its_portfolio(self, local_provider, finance_profile):
+        first = finance_profile.stock_portfolios.first()
+        second = StockPortfolio.objects.create(finance_profile=finance_profile)
+        PortfolioStock.objects.create(portfolio=first, ticker='AAPL', number_of_shares=3, pps_at_purchase=150)
+        PortfolioStock.objects.create(portfolio=second, ticker='ZZZZ', number_of_shares=1, pps_at_purchase=10)
+        PortfolioStock.objects.create(portfolio=second, ticker='MSFT', number_of_shares=1, pps_at_purchase=300)
+        assert score_portfolios() == 1
+        assert list(PortfolioRiskMetrics.objects.values_list('portfolio_id', flat=True)) == [first.pk]
+
+    def test_recent_listing_only_shortens_its_own_portfolios(self, local_provider):
+        local_provider.histories['NEW'] = make_history(days=5, seed=9)
+        both = analyze_holdings({1: {'AAPL': 1}, 2: {'AAPL': 1, 'NEW': 1}})
+        alone = analyze_holdings({1: {'AAPL': 1}})
+        assert set(both) == {1, 2}
+        assert both[1] == pytest.approx(alone[1])
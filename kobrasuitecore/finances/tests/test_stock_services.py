@@ -0,0 +1,35 @@
+import pytest
+
+from finances.models import PortfolioStock
+from finances.services.stock_services import get_portfolio_stocks
+from finances.utils.stock_utils import get_current_prices
+
+
+class TestBatchQuotes:
+
+    def test_tickers_are_deduplicated_into_one_fetch(self, local_provider):
+        prices = get_current_prices(['aapl', 'AAPL', 'MSFT', 'NOPE'])
+        assert set(prices) == {'AAPL', 'MSFT', 'NOPE'}
+        assert prices['NOPE'] is None
+        assert local_provider.calls == [('quotes', ('AAPL', 'MSFT', 'NOPE'))]
+
+    def test_cached_quotes_are_not_refetched(self, local_provider):
+        get_current_prices(['AAPL'])
+        get_current_prices(['AAPL', 'MSFT'])
+        assert local_provider.calls == [('quotes', ('AAPL',)), ('quotes', ('MSFT',))]
+
+
+@pytest.mark.django_db
+class TestPortfolioStocks:
+
+    def test_positions_are_valued_with_one_round_trip(self, local_provider, finance_profile):
+        portfolio = finance_profile.stock_portfolios.first()
+        for ticker in ['AAPL', 'MSFT', 'SPY']:
+            PortfolioStock.objects.create(portfolio=portfolio, ticker=ticker, number_of_shares=2, pps_at_purchase=100)
+        data = get_portfolio_stocks(finance_profile, portfolio.pk)
+        assert len(data) == 3
+        assert len(local_provider.calls) == 1
+        aapl = next(d for d in data if d['ticker'] == 'AAPL')
+        close = local_provider.histories['AAPL']['Close'].iloc[-1]
+        assert aapl['current_value'] == pytest.approx(2 * close)
+        assert aapl['profit_loss'] == pytest.approx(2 * close - 200)
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from finances.models import PortfolioStock, PortfolioValuationSnapshot, PositionValuationSnapshot
+from finances.services.stock_services import add_stock_to_portfolio, get_portfolio_stocks
+from finances.services.valuation_services import (
+    MARKET_TZ,
+    downsample_valuation_snapshots,
+    get_latest_valuation,
+    get_valuation_history,
+    market_is_open,
+    take_scheduled_snapshots,
+    take_valuation_snapshots,
+)
+from finances.views.stock_views import StockPortfolioViewSet
+
+
+@pytest.fixture
+def portfolio(finance_profile):
+    portfolio = finance_profile.stock_portfolios.first()
+    PortfolioStock.objects.create(portfolio=portfolio, ticker='AAPL', number_of_shares=10, pps_at_purchase=150)
+    PortfolioStock.objects.create(portfolio=portfolio, ticker='MSFT', number_of_shares=2, pps_at_purchase=400)
+    return portfolio
+
+
+@pytest.mark.django_db
+class TestValuationSnapshots:
+    def test_snapshot_matches_live_valuation(self, local_provider, finance_profile, portfolio):
+        live = get_portfolio_stocks(finance_profile, portfolio.pk)
+        (snapshot,) = take_valuation_snapshots()
+        positions = [p.as_dict() for p in snapshot.positions.all()]
+        assert positions == sorted(live, key=lambda p: p['ticker'])
+        assert snapshot.current_value == pytest.approx(sum(p['current_value'] for p in live))
+        assert snapshot.total_invested == 10 * 150 + 2 * 400
+
+    def test_prices_are_fetched_in_one_batch(self, local_provider, django_user_model, portfolio):
+        other = django_user_model.objects.create_user(username='second', password='pass12345')
+        other_portfolio = other.profile.finance_profile.stock_portfolios.first()
+        PortfolioStock.objects.create(portfolio=other_portfolio, ticker='AAPL', number_of_shares=1, pps_at_purchase=100)
+        local_provider.calls.clear()
+        assert len(take_valuation_snapshots()) == 2
+        assert [sorted(c[1]) for c in local_provider.calls if c[0] == 'quotes'] == [['AAPL', 'MSFT']]
+        assert PositionValuationSnapshot.objects.count() == 3
+
+    def test_latest_valuation_is_reused_until_holdings_change(self, local_provider, finance_profile, portfolio):
+        first, stale = get_latest_valuation(portfolio)
+        assert not stale
+        portfolio.refresh_from_db()
+        assert get_latest_valuation(portfolio)[0].pk == first.pk
+        add_stock_to_portfolio(finance_profile, portfolio.pk, 'SPY', 1)
+        portfolio.refresh_from_db()
+        second, _ = get_latest_valuation(portfolio)
+        assert second.pk != first.pk
+        assert {p.ticker for p in second.positions.all()} == {'AAPL', 'MSFT', 'SPY'}
+
+    def test_staleness_counts_only_market_hours(self, local_provider, portfolio):
+        (snapshot,) = take_valuation_snapshots()
+        friday = datetime(2024, 3, 8, 16, 0, tzinfo=MARKET_TZ)
+        PortfolioValuationSnapshot.objects.filter(pk=snapshot.pk).update(
+            taken_at=friday - timedelta(days=1), checked_at=friday,
+        )
+        portfolio.updated_at = friday - timedelta(days=2)
+        assert get_latest_valuation(portfolio, now=friday + timedelta(days=2, hours=17)) == (snapshot, False)
+        assert get_latest_valuation(portfolio, now=friday + timedelta(days=2, hours=17, minutes=40)) == (snapshot, False)
+        assert get_latest_valuation(portfolio, now=friday + timedelta(days=2, hours=18)) == (snapshot, True)
+
+    def test_history_is_a_range_scan(self, local_provider, portfolio):
+        now = timezone.now()
+        for hours in (48, 24, 1):
+            (snapshot,) = take_valuation_snapshots([portfolio])
+            PortfolioValuationSnapshot.objects.filter(pk=snapshot.pk).update(taken_at=now - timedelta(hours=hours))
+        history = get_valuation_history(portfolio, start=now - timedelta(hours=30))
+        assert [row['taken_at'] for row in history] == [now - timedelta(hours=24), now - timedelta(hours=1)]
+        assert set(history[0]) == {'taken_at', 'current_value', 'total_invested', 'profit_loss', 'profit_loss_percentage'}
+
+
+@pytest.mark.django_db
+class TestScheduledSnapshots:
+    session = datetime(2024, 3, 5, 11, 0, tzinfo=MARKET_TZ)
+
+    def test_market_hours(self):
+        assert market_is_open(self.session)
+        assert not market_is_open(self.session.replace(hour=20))
+        assert not market_is_open(self.session + timedelta(days=4))
+
+    def test_closed_market_and_unchanged_prices_write_nothing(self, local_provider, portfolio):
+        assert take_scheduled_snapshots(self.session.replace(hour=20)) == []
+        assert len(take_scheduled_snapshots(self.session)) == 1
+        assert take_scheduled_snapshots(self.session) == []
+        (snapshot,) = PortfolioValuationSnapshot.objects.all()
+        PortfolioValuationSnapshot.objects.update(checked_at=timezone.now() - timedelta(hours=3))
+        assert take_scheduled_snapshots(self.session) == []
+        snapshot.refresh_from_db()
+        assert timezone.now() - snapshot.checked_at < timedelta(minutes=1)
+        PortfolioStock.objects.filter(portfolio=portfolio, ticker='MSFT').update(number_of_shares=3)
+        assert len(take_scheduled_snapshots(self.session)) == 1
+
+    def test_downsampling_keeps_the_last_snapshot_per_day(self, local_provider, portfolio):
+        now = timezone.now()
+        old_day = timezone.localtime(now - timedelta(days=10), MARKET_TZ).replace(hour=10, minute=0)
+        taken = [old_day + timedelta(minutes=15 * n) for n in range(4)] + [now - timedelta(hours=1), now]
+        for when in taken:
+            (snapshot,) = take_valuation_snapshots([portfolio])
+            PortfolioValuationSnapshot.objects.filter(pk=snapshot.pk).update(taken_at=when)
+        assert downsample_valuation_snapshots(now) == 3
+        assert list(PortfolioValuationSnapshot.objects.order_by('taken_at').values_list('taken_at', flat=True)) == [
+            taken[3], taken[4], taken[5],
+        ]
+        assert PositionValuationSnapshot.objects.count() == 6
+        assert downsample_valuation_snapshots(now) == 0
+
+
+@pytest.mark.django_db
+class TestValuationEndpoints:
+    def call(self, action, finance_profile, portfolio, **params):
+        request = APIRequestFactory().get('/', params)
+        user = finance_profile.profile.user
+        force_authenticate(request, user=user)
+        view = StockPortfolioViewSet.as_view({'get': action})
+        return view(request, pk=portfolio.pk, user_pk=user.pk,
+                    user_profile_pk=finance_profile.profile_id, finance_profile_pk=finance_profile.pk)
+
+    def test_stocks_serves_snapshot_with_staleness_headers(self, local_provider, finance_profile, portfolio):
+        response = self.call('stocks', finance_profile, portfolio)
+        assert response.status_code == 200
+        assert [row['ticker'] for row in response.data] == ['AAPL', 'MSFT']
+        assert response['X-Valuation-Stale'] == 'false'
+        assert response['X-Valuation-As-Of']
+
+    def test_performance_rejects_bad_bounds(self, local_provider, finance_profile, portfolio):
+        take_valuation_snapshots([portfolio])
+        assert len(self.call('performance', finance_profile, portfolio).data) == 1
+        assert self.call('performance', finance_profile, portfolio, start='yesterday').status_code == 400
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from finances.management.commands.benchmark_windowing import loop_sequences
+from finances.utils.windowing import sequence_dataset, sliding_windows
+
+
+class TestWindowing:
+    @pytest.mark.parametrize('seq_len', [5, 7, 10])
+    def test_matches_original_loop(self, seq_len):
+        rng = np.random.default_rng(seq_len)
+        fx, fy = rng.random((60, 4)), rng.random((60, 1))
+        X, Y = sequence_dataset(fx, fy, seq_len)
+        X_loop, Y_loop = loop_sequences(fx, fy, seq_len)
+        assert X.shape == (60 - seq_len, seq_len, 4)
+        np.testing.assert_array_equal(X, X_loop)
+        np.testing.assert_array_equal(Y, Y_loop)
+
+    def test_windows_are_views(self):
+        fx = np.arange(24, dtype=float).reshape(12, 2)
+        windows = sliding_windows(fx, 3)
+        assert np.shares_memory(windows, fx)
+        np.testing.assert_array_equal(windows[4], fx[4:7])
+
+    def test_short_input_yields_no_sequences(self):
+        X, Y = sequence_dataset(np.ones((4, 3)), np.ones((4, 1)), 5)
+        assert X.shape == (0, 5, 3)
+        assert Y.shape == (0, 1)
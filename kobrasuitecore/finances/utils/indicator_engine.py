@@ -0,0 +1,167 @@
+"""
+------------------Prologue--------------------
+File Name: indicator_engine.py
+Path: kobrasuitecore/finances/utils/indicator_engine.py
+
+Description:
+Incremental technical-indicator engine. Keeps the rolling windows, exponential averages and
+cumulative sums behind MACD, RSI, SMA, EMA, ATR, Bollinger Bands and VWAP, so appending a daily
+bar updates every indicator in constant time. Values match the pandas implementations in
+stock_prediction_services (ewm with adjust=False, rolling means with full windows, sample
+standard deviation) and the state round-trips through JSON for storage between syncs.
+
+Input:
+Daily OHLCV bars, one at a time and in date order.
+
+Output:
+A dictionary of indicator values per bar (None while an indicator is still warming up).
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import math
+from collections import deque
+
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+RSI_WINDOW = 14
+SMA_WINDOW = 14
+EMA_SPAN = 14
+ATR_WINDOW = 14
+BBANDS_WINDOW = 20
+
+INDICATOR_GROUPS = {
+    'MACD': ('MACD_Line', 'MACD_Signal', 'MACD_Hist'),
+    'RSI': ('RSI',),
+    'SMA': ('SMA',),
+    'EMA': ('EMA',),
+    'ATR': ('ATR',),
+    'BBands': ('BB_Middle', 'BB_Upper', 'BB_Lower'),
+    'VWAP': ('VWAP',),
+}
+INDICATOR_COLUMNS = tuple(col for cols in INDICATOR_GROUPS.values() for col in cols)
+
+
+def _ewm(previous, value, span):
+    if previous is None:
+        return value
+    alpha = 2 / (span + 1)
+    return (1 - alpha) * previous + alpha * value
+
+
+def _window_mean(window, size):
+    return sum(window) / size if len(window) == size else None
+
+
+def _finite(value):
+    return value if value is not None and math.isfinite(value) else None
+
+
+class IndicatorEngine:
+    """
+    Rolling indicator state for one ticker. Feed bars in date order with `update`;
+    persist with `to_state` and resume with `from_state`.
+    """
+    def __init__(self):
+        self.count = 0
+        self.prev_close = None
+        self.ema_fast = None
+        self.ema_slow = None
+        self.macd_signal = None
+        self.ema = None
+        self.gains = deque(maxlen=RSI_WINDOW)
+        self.losses = deque(maxlen=RSI_WINDOW)
+        self.closes = deque(maxlen=max(SMA_WINDOW, BBANDS_WINDOW))
+        self.true_ranges = deque(maxlen=ATR_WINDOW)
+        self.vwap_numerator = 0.0
+        self.vwap_volume = 0.0
+
+    def update(self, open_, high, low, close, volume):
+        """
+        Applies one bar and returns the indicator values as of that bar.
+        """
+        self.ema_fast = _ewm(self.ema_fast, close, MACD_FAST)
+        self.ema_slow = _ewm(self.ema_slow, close, MACD_SLOW)
+        macd_line = self.ema_fast - self.ema_slow
+        self.macd_signal = _ewm(self.macd_signal, macd_line, MACD_SIGNAL)
+        self.ema = _ewm(self.ema, close, EMA_SPAN)
+
+        delta = close - self.prev_close if self.prev_close is not None else 0.0
+        self.gains.append(delta if delta > 0 else 0.0)
+        self.losses.append(-delta if delta < 0 else 0.0)
+        gain = _window_mean(self.gains, RSI_WINDOW)
+        loss = _window_mean(self.losses, RSI_WINDOW)
+        if gain is None or (gain == 0 and loss == 0):
+            rsi = None
+        elif loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + gain / loss))
+
+        if self.prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.true_ranges.append(true_range)
+
+        self.closes.append(close)
+        recent = list(self.closes)
+        sma = _window_mean(recent[-SMA_WINDOW:], SMA_WINDOW)
+        bb_middle = _window_mean(recent[-BBANDS_WINDOW:], BBANDS_WINDOW)
+        if bb_middle is not None:
+            variance = sum((c - bb_middle) ** 2 for c in recent[-BBANDS_WINDOW:]) / (BBANDS_WINDOW - 1)
+            std = math.sqrt(variance)
+            bb_upper, bb_lower = bb_middle + 2 * std, bb_middle - 2 * std
+        else:
+            bb_upper = bb_lower = None
+
+        self.vwap_numerator += volume * (high + low + close) / 3
+        self.vwap_volume += volume
+        vwap = self.vwap_numerator / self.vwap_volume if self.vwap_volume else None
+
+        self.prev_close = close
+        self.count += 1
+        return {
+            'MACD_Line': macd_line,
+            'MACD_Signal': self.macd_signal,
+            'MACD_Hist': macd_line - self.macd_signal,
+            'RSI': _finite(rsi),
+            'SMA': sma,
+            'EMA': self.ema,
+            'ATR': _window_mean(self.true_ranges, ATR_WINDOW),
+            'BB_Middle': bb_middle,
+            'BB_Upper': bb_upper,
+            'BB_Lower': bb_lower,
+            'VWAP': _finite(vwap),
+        }
+
+    def to_state(self):
+        return {
+            'count': self.count,
+            'prev_close': self.prev_close,
+            'ema_fast': self.ema_fast,
+            'ema_slow': self.ema_slow,
+            'macd_signal': self.macd_signal,
+            'ema': self.ema,
+            'gains': list(self.gains),
+            'losses': list(self.losses),
+            'closes': list(self.closes),
+            'true_ranges': list(self.true_ranges),
+            'vwap_numerator': self.vwap_numerator,
+            'vwap_volume': self.vwap_volume,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        engine = cls()
+        if not state:
+            return engine
+        for field in ('count', 'prev_close', 'ema_fast', 'ema_slow', 'macd_signal', 'ema',
+                      'vwap_numerator', 'vwap_volume'):
+            setattr(engine, field, state[field])
+        engine.gains.extend(state['gains'])
+        engine.losses.extend(state['losses'])
+        engine.closes.extend(state['closes'])
+        engine.true_ranges.extend(state['true_ranges'])
+        return engine
@@ -0,0 +1,372 @@
+"""
+------------------Prologue--------------------
+File Name: market_data.py
+Path: kobrasuitecore/finances/utils/market_data.py
+
+Description:
+Provides a pluggable market-data layer that sits in front of every external price lookup.
+Requests go through a two-tier cache (an in-process LRU backed by a Django cache alias) with
+per-field TTLs, so repeated quote, info and history lookups for the same ticker are served
+without another network round-trip. The provider behind the cache can be swapped for a local
+in-memory provider so the finance services can run offline.
+
+Input:
+Ticker symbols, history ranges, and the MARKET_DATA settings block.
+
+Output:
+Quotes, ticker info dictionaries and OHLCV pandas DataFrames.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import pandas as pd
+import yfinance as yf
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MARKET_DATA = {
+    'PROVIDER': 'finances.utils.market_data.YFinanceProvider',
+    'CACHE_ALIAS': 'default',
+    'LRU_SIZE': 1024,
+    'MAX_WORKERS': 8,
+    'TTL': {
+        'quote': 15,
+        'info': 6 * 60 * 60,
+        'history': 15 * 60,
+        'closed_history': 24 * 60 * 60,
+    },
+}
+
+_MISSING = object()
+
+
+class YFinanceProvider:
+    """
+    Fetches market data from Yahoo Finance through yfinance.
+    """
+    name = 'yfinance'
+
+    def history(self, ticker, period=None, start=None, end=None):
+        kwargs = {'period': period} if period else {'start': start, 'end': end}
+        return yf.Ticker(ticker).history(**kwargs)
+
+    def info(self, ticker):
+        return yf.Ticker(ticker).info
+
+    def quotes(self, tickers):
+        """
+        Fetches the latest close for many tickers with a single multi-ticker download.
+        """
+        data = yf.download(tickers, period='5d', group_by='column', progress=False, threads=True)
+        if data is None or data.empty:
+            return {}
+        close = data['Close']
+        if isinstance(close, pd.Series):
+            close = close.to_frame(name=tickers[0])
+        last = close.ffill().iloc[-1]
+        return {str(t).upper(): float(p) for t, p in last.items() if pd.notna(p)}
+
+
+class LocalMarketDataProvider:
+    """
+    Serves market data from preloaded DataFrames and info dictionaries.
+    Used for offline development and tests; records every call in `calls`.
+    """
+    name = 'local'
+    PERIOD_UNITS = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+
+    def __init__(self, histories=None, infos=None):
+        self.histories = {t.upper(): df for t, df in (histories or {}).items()}
+        self.infos = {t.upper(): info for t, info in (infos or {}).items()}
+        self.calls = []
+
+    def history(self, ticker, period=None, start=None, end=None):
+        self.calls.append(('history', ticker.upper()))
+        df = self.histories.get(ticker.upper())
+        if df is None or df.empty:
+            return pd.DataFrame()
+        if period:
+            if period == 'max':
+                return df.copy()
+            if period == '1d':
+                return df.tail(1).copy()
+            unit = next(u for u in self.PERIOD_UNITS if period.endswith(u))
+            amount = int(period[:-len(unit)])
+            cutoff = df.index[-1] - pd.DateOffset(**{self.PERIOD_UNITS[unit]: amount})
+            return df[df.index > cutoff].copy()
+        index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= index >= pd.Timestamp(start)
+        if end is not None:
+            mask &= index < pd.Timestamp(end)
+        return df[mask.values].copy()
+
+    def info(self, ticker):
+        self.calls.append(('info', ticker.upper()))
+        return dict(self.infos.get(ticker.upper(), {}))
+
+    def quotes(self, tickers):
+        self.calls.append(('quotes', tuple(tickers)))
+        out = {}
+        for t in tickers:
+            df = self.histories.get(t.upper())
+            if df is not None and not df.empty:
+                out[t.upper()] = float(df['Close'].iloc[-1])
+        return out
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU with per-entry expiry, used as the in-process cache tier.
+    """
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class MarketDataCache:
+    """
+    Two-tier cache (in-process LRU, then a Django cache alias) in front of a market-data provider.
+
+    TTLs are configured per field: quotes live for seconds, ticker info for hours, and daily
+    history that only covers closed sessions for a day (range keys are arbitrary, and a
+    provider may still adjust closed bars for splits and dividends).
+    """
+    def __init__(self, provider, cache_alias='default', lru_size=1024, ttls=None, max_workers=8):
+        self.provider = provider
+        self.cache_alias = cache_alias
+        self.max_workers = max_workers
+        self.ttls = {**DEFAULT_MARKET_DATA['TTL'], **(ttls or {})}
+        self.lru = LRUCache(lru_size)
+
+    def _key(self, field, *parts):
+        provider_name = getattr(self.provider, 'name', self.provider.__class__.__name__)
+        return ':'.join(['market', provider_name, field, *(str(p) for p in parts)])
+
+    def _shared_get(self, key):
+        try:
+            return caches[self.cache_alias].get(key, _MISSING)
+        except Exception as e:
+            logger.warning(f"Market data cache read failed for {key}: {e}")
+            return _MISSING
+
+    def _shared_get_many(self, keys):
+        try:
+            return caches[self.cache_alias].get_many(keys)
+        except Exception as e:
+            logger.warning(f"Market data cache read failed for {len(keys)} keys: {e}")
+            return {}
+
+    def _shared_set(self, key, value, ttl):
+        try:
+            caches[self.cache_alias].set(key, value, ttl)
+        except Exception as e:
+            logger.warning(f"Market data cache write failed for {key}: {e}")
+
+    def _cached(self, key, ttl, loader, refresh=False):
+        if not refresh:
+            value = self.lru.get(key)
+            if value is not _MISSING:
+                return value
+            value = self._shared_get(key)
+            if value is not _MISSING:
+                self.lru.set(key, value, ttl)
+                return value
+        value = loader()
+        if value is None or (isinstance(value, pd.DataFrame) and value.empty):
+            return value
+        self.lru.set(key, value, ttl)
+        self._shared_set(key, value, ttl)
+        return value
+
+    def quote(self, ticker):
+        """
+        Returns the latest closing price for a ticker, or None if unavailable.
+        """
+        ticker = ticker.upper()
+
+        def load():
+            df = self.provider.history(ticker, period='1d')
+            if df is None or df.empty:
+                return None
+            return float(df['Close'].iloc[-1])
+
+        return self._cached(self._key('quote', ticker), self.ttls['quote'], load)
+
+    def quotes(self, tickers):
+        """
+        Returns {TICKER: price or None} for many tickers. Tickers are deduplicated and
+        only the ones missing from both cache tiers are fetched, using the provider's
+        multi-ticker `quotes` call when it has one and a bounded thread pool otherwise.
+        """
+        symbols = list(dict.fromkeys(t.upper() for t in tickers if t))
+        ttl = self.ttls['quote']
+        prices, missing = {}, []
+        for t in symbols:
+            value = self.lru.get(self._key('quote', t))
+            if value is _MISSING:
+                missing.append(t)
+            else:
+                prices[t] = value
+        if missing:
+            shared = self._shared_get_many([self._key('quote', t) for t in missing])
+            still_missing = []
+            for t in missing:
+                value = shared.get(self._key('quote', t), _MISSING)
+                if value is _MISSING:
+                    still_missing.append(t)
+                else:
+                    prices[t] = value
+                    self.lru.set(self._key('quote', t), value, ttl)
+            missing = still_missing
+        if missing:
+            if hasattr(self.provider, 'quotes'):
+                try:
+                    fetched = self.provider.quotes(missing)
+                except Exception as e:
+                    logger.warning(f"Batch quote fetch failed for {missing}: {e}")
+                    fetched = {}
+            else:
+                workers = max(1, min(self.max_workers, len(missing)))
+                with ThreadPoolExecutor(max_workers=workers) as ex:
+                    fetched = dict(zip(missing, ex.map(self._safe_quote, missing)))
+            for t in missing:
+                price = fetched.get(t)
+                prices[t] = price
+                if price is not None:
+                    self.lru.set(self._key('quote', t), price, ttl)
+                    self._shared_set(self._key('quote', t), price, ttl)
+        return {t: prices.get(t) for t in symbols}
+
+    def _safe_quote(self, ticker):
+        try:
+            return self.quote(ticker)
+        except Exception as e:
+            logger.warning(f"Quote fetch failed for {ticker}: {e}")
+            return None
+
+    def info(self, ticker):
+        """
+        Returns the provider's info dictionary for a ticker.
+        """
+        ticker = ticker.upper()
+        info = self._cached(self._key('info', ticker), self.ttls['info'], lambda: self.provider.info(ticker) or None)
+        return dict(info) if info else {}
+
+    def history(self, ticker, period=None, start=None, end=None, refresh=False):
+        """
+        Returns daily OHLCV history for a ticker, either for a period string ('5y')
+        or for a [start, end) date range. Ranges that end before today are cached
+        with the longer 'closed_history' TTL. With `refresh`, the cached frame is
+        ignored and replaced by a fresh fetch.
+        """
+        ticker = ticker.upper()
+        start, end = _as_date(start), _as_date(end)
+        if period:
+            key = self._key('history', ticker, period)
+            ttl = self.ttls['history']
+        else:
+            key = self._key('history', ticker, start, end)
+            closed = end is not None and end <= date.today()
+            ttl = self.ttls['closed_history'] if closed else self.ttls['history']
+        df = self._cached(
+            key,
+            ttl,
+            lambda: self.provider.history(
+                ticker,
+                period=period,
+                start=start.isoformat() if start else None,
+                end=end.isoformat() if end else None,
+            ),
+            refresh=refresh,
+        )
+        return df.copy() if df is not None else pd.DataFrame()
+
+    def clear(self):
+        self.lru.clear()
+
+
+def _as_date(value):
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return pd.Timestamp(value).date()
+
+
+_market_data = None
+_market_data_lock = threading.Lock()
+
+
+def get_market_data():
+    """
+    Returns the process-wide MarketDataCache configured from settings.MARKET_DATA.
+    """
+    global _market_data
+    if _market_data is None:
+        with _market_data_lock:
+            if _market_data is None:
+                config = {**DEFAULT_MARKET_DATA, **getattr(settings, 'MARKET_DATA', {})}
+                provider = import_string(config['PROVIDER'])()
+                _market_data = MarketDataCache(
+                    provider,
+                    cache_alias=config['CACHE_ALIAS'],
+                    lru_size=config['LRU_SIZE'],
+                    ttls=config['TTL'],
+                    max_workers=config['MAX_WORKERS'],
+                )
+    return _market_data
+
+
+def set_market_data_provider(provider):
+    """
+    Swaps the provider behind the process-wide cache (e.g. for a LocalMarketDataProvider)
+    and drops everything held in the in-process tier. Returns the new cache.
+    """
+    global _market_data
+    config = {**DEFAULT_MARKET_DATA, **getattr(settings, 'MARKET_DATA', {})}
+    with _market_data_lock:
+        _market_data = MarketDataCache(
+            provider,
+            cache_alias=config['CACHE_ALIAS'],
+            lru_size=config['LRU_SIZE'],
+            ttls=config['TTL'],
+            max_workers=config['MAX_WORKERS'],
+        )
+    return _market_data
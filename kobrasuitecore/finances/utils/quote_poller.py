@@ -0,0 +1,201 @@
+"""
+------------------Prologue--------------------
+File Name: quote_poller.py
+Path: kobrasuitecore/finances/utils/quote_poller.py
+
+Description:
+Shared quote poller behind the portfolio quote stream. Sockets subscribe to tickers through a
+reference-counted registry; one background task per ASGI process fetches its subscribed tickers in
+a single batched call on each tick and fans changed prices out to per-ticker channel-layer groups.
+Each ticker is polled under a short lease in the shared cache, so when several ASGI processes have
+sockets watching the same ticker only the lease holder fetches it and sends its ticks; the lease
+lapses and moves to another process once the holder stops renewing it. The quote source is
+pluggable through the QUOTE_STREAM setting (the market data cache by default, or a local fake feed
+in tests).
+
+Input:
+Ticker subscriptions from consumers and the QUOTE_STREAM settings block.
+
+Output:
+'quote.tick' events sent to the quotes.<TICKER> groups of the channel layer.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import asyncio
+import logging
+import re
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUOTE_STREAM = {
+    'SOURCE': 'finances.utils.stock_utils.get_current_prices',
+    'INTERVAL': 5,
+}
+
+
+def quote_timestamp():
+    """
+    Current time as an aware UTC ISO-8601 string, shared by snapshots and ticks.
+    """
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _lease_key(ticker):
+    return f'quote_stream:lease:{ticker}'
+
+
+def quote_group(ticker):
+    """
+    Channel-layer group for a ticker; characters groups cannot contain become '_'.
+    """
+    return 'quotes.' + re.sub(r'[^A-Za-z0-9\-.]', '_', ticker.upper())
+
+
+class QuotePoller:
+    """
+    Polls the quote source for the subscribed tickers this process holds the lease
+    for and publishes price changes. The polling task runs only while something is
+    subscribed.
+    """
+    def __init__(self, source, interval):
+        self.source = source
+        self.interval = interval
+        self.lease = interval * 3
+        self.token = uuid.uuid4().hex
+        self.subscriptions = Counter()
+        self.last_prices = {}
+        self._task = None
+
+    async def subscribe(self, tickers):
+        for t in {t.upper() for t in tickers}:
+            self.subscriptions[t] += 1
+        if self.subscriptions and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def unsubscribe(self, tickers):
+        released = []
+        for t in {t.upper() for t in tickers}:
+            self.subscriptions[t] -= 1
+            if self.subscriptions[t] <= 0:
+                del self.subscriptions[t]
+                self.last_prices.pop(t, None)
+                released.append(t)
+        await self.release(released)
+        if not self.subscriptions and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def claim(self, tickers):
+        """
+        Renews the leases this poller holds among `tickers`, takes any free ones and
+        returns the tickers it now polls.
+        """
+        keys = {_lease_key(t): t for t in tickers}
+        holders = await cache.aget_many(list(keys))
+        held = {k: t for k, t in keys.items() if holders.get(k) == self.token}
+        if held:
+            await cache.aset_many(dict.fromkeys(held, self.token), self.lease)
+        for k, t in keys.items():
+            if k not in holders and await cache.aadd(k, self.token, self.lease):
+                held[k] = t
+        return sorted(held.values())
+
+    async def release(self, tickers):
+        """
+        Gives up the leases this poller holds among `tickers`.
+        """
+        keys = [_lease_key(t) for t in tickers]
+        if not keys:
+            return
+        holders = await cache.aget_many(keys)
+        mine = [k for k in keys if holders.get(k) == self.token]
+        if mine:
+            await cache.adelete_many(mine)
+
+    async def fetch(self, tickers):
+        """
+        Fetches current prices for `tickers` from the configured source.
+        """
+        return await sync_to_async(self.source, thread_sensitive=False)(list(tickers))
+
+    async def poll_once(self):
+        """
+        Fetches every subscribed ticker this poller holds the lease for and sends a tick
+        for each changed price. Returns the number of ticks sent.
+        """
+        tickers = await self.claim(sorted(self.subscriptions))
+        for t in set(self.last_prices) - set(tickers):
+            del self.last_prices[t]
+        if not tickers:
+            return 0
+        prices = await self.fetch(tickers)
+        layer = get_channel_layer()
+        timestamp = quote_timestamp()
+        sent = 0
+        for t in tickers:
+            price = prices.get(t)
+            if price is None or self.last_prices.get(t) == price:
+                continue
+            self.last_prices[t] = price
+            await layer.group_send(quote_group(t), {
+                'type': 'quote.tick',
+                'ticker': t,
+                'price': price,
+                'timestamp': timestamp,
+            })
+            sent += 1
+        return sent
+
+    async def _run(self):
+        try:
+            while self.subscriptions:
+                try:
+                    await self.poll_once()
+                except Exception as e:
+                    logger.warning(f"Quote poll failed for {len(self.subscriptions)} tickers: {e}")
+                await asyncio.sleep(self.interval)
+        except asyncio.CancelledError:
+            logger.debug("Quote poller stopped.")
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_quote_poller():
+    """
+    Returns the process-wide QuotePoller configured from settings.QUOTE_STREAM.
+    """
+    global _poller
+    if _poller is None:
+        with _poller_lock:
+            if _poller is None:
+                config = {**DEFAULT_QUOTE_STREAM, **getattr(settings, 'QUOTE_STREAM', {})}
+                source = config['SOURCE']
+                _poller = QuotePoller(
+                    import_string(source) if isinstance(source, str) else source,
+                    config['INTERVAL'],
+                )
+    return _poller
+
+
+def reset_quote_poller():
+    """
+    Drops the process-wide poller so the next call rebuilds it from settings.
+    """
+    global _poller
+    with _poller_lock:
+        if _poller is not None and _poller._task is not None:
+            _poller._task.cancel()
+        _poller = None
@@ -0,0 +1,117 @@
+"""
+------------------Prologue--------------------
+File Name: risk_engine.py
+Path: kobrasuitecore/finances/utils/risk_engine.py
+
+Description:
+Vectorized portfolio risk engine. Scores many portfolios at once from one shared, date-aligned
+matrix of daily asset returns and a matrix of portfolio weights, using batched NumPy linear
+algebra instead of one pandas pipeline per portfolio. Gaps (NaN returns, e.g. before a ticker
+was listed) are handled with a per-portfolio mask of the days on which every asset it holds has
+a return, so one call still covers portfolios whose histories differ in length.
+
+Input:
+A (T, N) array of daily asset returns (NaN where an asset has no return), a (P, N) array of
+portfolio weights, and an optional (T,) array of benchmark returns aligned to the same dates.
+
+Output:
+A dictionary of (P,) NumPy arrays, one per metric.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import numpy as np
+
+TRADING_DAYS = 252
+RISK_FREE_RATE = 0.02
+METRIC_NAMES = (
+    'expected_return',
+    'risk',
+    'sharpe_ratio',
+    'diversification_ratio',
+    'alpha',
+    'beta',
+    'sortino_ratio',
+    'max_drawdown',
+)
+
+
+def compute_risk_metrics(returns, weights, benchmark=None, risk_free=RISK_FREE_RATE, periods=TRADING_DAYS):
+    """
+    Computes annualized expected return, risk, Sharpe, Sortino, alpha/beta against the
+    benchmark, maximum drawdown and diversification ratio for every row of `weights`.
+    Each portfolio is scored over the days on which all of its holdings (and the
+    benchmark) have a return; portfolios with fewer than two such days get NaN.
+    Alpha and beta fall back to 0 and 1 when fewer than 11 aligned days are available.
+    """
+    R = np.atleast_2d(np.asarray(returns, dtype=float).T).T
+    W = np.atleast_2d(np.asarray(weights, dtype=float))
+    P = W.shape[0]
+    b = None if benchmark is None else np.asarray(benchmark, dtype=float)
+
+    valid = np.isfinite(R)
+    held = W != 0
+    # (T, P): the days each portfolio is scored on.
+    M = (valid[:, None, :] | ~held[None, :, :]).all(axis=2)
+    if b is not None:
+        M &= np.isfinite(b)[:, None]
+    R = np.where(valid, R, 0.0)
+    Mf = M.astype(float)
+    n = Mf.sum(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily = R @ W.T
+        mean = (daily * Mf).sum(axis=0) / n
+        centered = np.where(M, daily - mean, 0.0)
+        expected_return = mean * periods
+        variance = (centered ** 2).sum(axis=0) / (n - 1) * periods
+        risk = np.sqrt(np.clip(variance, 0, None))
+        sharpe = np.where(risk != 0, (expected_return - risk_free) / risk, 0.0)
+
+        s1, s2 = Mf.T @ R, Mf.T @ R ** 2
+        asset_var = (s2 - s1 ** 2 / n[:, None]) / (n[:, None] - 1) * periods
+        weighted_vol = (W * np.sqrt(np.clip(asset_var, 0, None))).sum(axis=1)
+        diversification = np.where(risk != 0, weighted_vol / risk, 1.0)
+
+        alpha, beta = np.zeros(P), np.ones(P)
+        if b is not None:
+            bf = np.where(np.isfinite(b), b, 0.0)
+            b_mean = (bf @ Mf) / n
+            b_centered = np.where(M, bf[:, None] - b_mean, 0.0)
+            b_var = (b_centered ** 2).sum(axis=0)
+            fit = (n > 10) & (b_var > 0)
+            beta = np.where(fit, (b_centered * centered).sum(axis=0) / b_var, 1.0)
+            alpha = np.where(fit, mean - beta * b_mean, 0.0)
+
+        excess = daily - risk_free / periods
+        downside = M & (excess < 0)
+        down_count = downside.sum(axis=0)
+        down_sq = np.where(downside, excess, 0.0) ** 2
+        down_dev = np.where(
+            down_count > 0,
+            np.sqrt(down_sq.sum(axis=0) / np.maximum(down_count, 1)) * np.sqrt(periods),
+            1e-6,
+        )
+        sortino = (expected_return - risk_free) / down_dev
+
+    if R.shape[0]:
+        cumulative = np.cumprod(1 + np.where(M, daily, 0.0), axis=0)
+        peak = np.maximum.accumulate(cumulative, axis=0)
+        max_drawdown = ((cumulative - peak) / peak).min(axis=0)
+    else:
+        max_drawdown = np.zeros(P)
+
+    metrics = {
+        'expected_return': expected_return,
+        'risk': risk,
+        'sharpe_ratio': sharpe,
+        'diversification_ratio': diversification,
+        'alpha': alpha,
+        'beta': beta,
+        'sortino_ratio': sortino,
+        'max_drawdown': max_drawdown,
+    }
+    unscored = n < 2
+    for values in metrics.values():
+        values[unscored] = np.nan
+    return metrics
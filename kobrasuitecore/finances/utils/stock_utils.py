@@ -16,22 +16,29 @@
 # ---------------------------------------------
 
 import requests
-import yfinance as yf
 import pandas as pd
+from finances.utils.market_data import get_market_data
 
 def get_current_stock_price(ticker):
     """
-    Retrieves the latest closing price for a given ticker using yfinance.
+    Retrieves the latest closing price for a given ticker through the market data cache.
     Returns None if the data is unavailable.
     """
     try:
-        df = yf.Ticker(ticker).history(period='1d')
-        if df.empty:
-            return None
-        return float(df['Close'].iloc[-1])
+        return get_market_data().quote(ticker)
     except:
         return None
 
+def get_current_prices(tickers):
+    """
+    Retrieves the latest closing prices for many tickers in one batched lookup.
+    Tickers are upper-cased and deduplicated; returns {TICKER: price or None}.
+    """
+    try:
+        return get_market_data().quotes(tickers)
+    except:
+        return {t.upper(): None for t in tickers if t}
+
 def get_stock_price_at_date(ticker, date):
     """
     Fetches the stock price for a given ticker at or near a specific date.
@@ -42,7 +49,7 @@ def get_stock_price_at_date(ticker, date):
     try:
         start = (date - pd.Timedelta(days=1)).strftime('%Y-%m-%d')
         end = (date + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
-        df = yf.Ticker(ticker).history(start=start, end=end)
+        df = get_market_data().history(ticker, start=start, end=end)
         if df.empty:
             return None
         df = df.reset_index()
@@ -54,22 +61,22 @@ def get_stock_price_at_date(ticker, date):
 
 def check_stock_validity(ticker):
     """
-    Checks whether the given ticker can be retrieved from yfinance.
+    Checks whether the given ticker can be retrieved from the market data provider.
     Returns True if valid, otherwise False.
     """
     try:
-        info = yf.Ticker(ticker).info
+        info = get_market_data().info(ticker)
         return info.get('regularMarketOpen') is not None
     except:
         return False
 
 def get_stock_results_data(ticker):
     """
-    Retrieves detailed market data for a given ticker from yfinance.
+    Retrieves detailed market data for a given ticker from the market data provider.
     Returns None if data is unavailable.
     """
     try:
-        info = yf.Ticker(ticker).info
+        info = get_market_data().info(ticker)
         if not info.get('regularMarketPrice'):
             return None
         return {
@@ -102,7 +109,7 @@ def get_stock_chart(ticker):
     and returns the last 60 records as a list of dictionaries.
     """
     try:
-        df = yf.Ticker(ticker).history(period='5y')
+        df = get_market_data().history(ticker, period='5y')
         if df.empty:
             return None
         df.reset_index(inplace=True)
@@ -113,7 +120,7 @@ def get_stock_chart(ticker):
 def get_hot_stocks(api_key, budget=None):
     """
     Uses a RapidAPI endpoint to retrieve 'Day Gainers' data, then
-    checks the current stock price. If budget is provided, filters
+    checks the current prices in one batched lookup. If budget is provided, filters
     out any stocks exceeding that budget. Returns up to 10 results.
     """
     url = 'https://apidojo-yahoo-finance-v1.p.rapidapi.com/market/v2/get-movers'
@@ -122,16 +129,17 @@ def get_hot_stocks(api_key, budget=None):
     try:
         r = requests.get(url, headers=headers, params=params)
         data = r.json()
-        hot = []
+        symbols = []
         for item in data.get('finance', {}).get('result', []):
             if item.get('title') == 'Day Gainers':
-                for quote in item.get('quotes', []):
-                    sym = quote.get('symbol')
-                    if sym:
-                        cp = get_current_stock_price(sym)
-                        if cp is not None:
-                            if budget is None or cp <= budget:
-                                hot.append({'ticker': sym, 'close_price': cp})
+                symbols.extend(q.get('symbol') for q in item.get('quotes', []) if q.get('symbol'))
+        prices = get_current_prices(symbols)
+        hot = []
+        for sym in symbols:
+            cp = prices.get(sym.upper())
+            if cp is not None:
+                if budget is None or cp <= budget:
+                    hot.append({'ticker': sym, 'close_price': cp})
         return hot[:10]
     except:
         return []
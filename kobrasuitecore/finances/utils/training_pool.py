@@ -0,0 +1,116 @@
+"""
+------------------Prologue--------------------
+File Name: training_pool.py
+Path: kobrasuitecore/finances/utils/training_pool.py
+
+Description:
+Process-pool plumbing for prediction training. A numeric feature frame is copied once into a
+multiprocessing shared-memory block and worker processes attach to it by name, instead of each
+task receiving its own pickled copy. Workers are started with the spawn method, so every one gets
+a clean TensorFlow runtime, and configure Django when they start.
+
+Input:
+Numeric pandas DataFrames and the PREDICTION_TRAINING settings block.
+
+Output:
+Shared-memory handles, DataFrames backed by shared memory, and process-wide worker pools.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import gc
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def worker_count(max_workers, tasks):
+    """
+    Number of workers for `tasks` jobs, bounded by `max_workers` or the host's cores.
+    """
+    limit = max_workers or os.cpu_count() or 1
+    return max(1, min(limit, tasks))
+
+
+def share_frame(df):
+    """
+    Copies a numeric DataFrame into a new shared-memory block. Returns (shm, spec); the
+    picklable spec is what workers receive. The caller owns the block and must close and
+    unlink it once the workers are done.
+    """
+    values = np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+    spec = {
+        'name': shm.name,
+        'shape': values.shape,
+        'dtype': values.dtype.str,
+        'columns': list(df.columns),
+        'index': df.index,
+    }
+    return shm, spec
+
+
+def attach_frame(spec):
+    """
+    Attaches to a block created by share_frame and returns (shm, df) where df is a
+    zero-copy view of the shared values. Call release_frame when finished.
+    """
+    shm = shared_memory.SharedMemory(name=spec['name'])
+    # The creating process owns the block; stop this process's tracker from unlinking it.
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    values = np.ndarray(spec['shape'], dtype=np.dtype(spec['dtype']), buffer=shm.buf)
+    return shm, pd.DataFrame(values, index=spec['index'], columns=spec['columns'], copy=False)
+
+
+def release_frame(shm):
+    """
+    Closes a worker's mapping once no views of it remain.
+    """
+    gc.collect()
+    try:
+        shm.close()
+    except BufferError:
+        pass
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def get_process_pool(max_workers):
+    """
+    Returns the process-wide spawn-based pool with `max_workers` workers, creating it on
+    first use. Pools are kept per worker count, so a call asking for a different size
+    gets its own pool instead of silently sharing one sized by an earlier call.
+    """
+    with _pool_lock:
+        pool = _pools.get(max_workers)
+        if pool is None:
+            pool = _pools[max_workers] = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return pool
+
+
+def shutdown_process_pool(max_workers=None):
+    """
+    Shuts down the pool with `max_workers` workers, or every pool when it is None.
+    """
+    with _pool_lock:
+        sizes = list(_pools) if max_workers is None else [max_workers]
+        for size in sizes:
+            pool = _pools.pop(size, None)
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,44 @@
+"""
+------------------Prologue--------------------
+File Name: windowing.py
+Path: kobrasuitecore/finances/utils/windowing.py
+
+Description:
+Builds the fixed-length input sequences used to train the LSTM regressors. Windows are strided
+views over the scaled feature matrix (numpy's sliding_window_view), so no window is copied until
+the model consumes the batch.
+
+Input:
+A (n, features) array of scaled features, a (n, 1) array of scaled targets and a sequence length.
+
+Output:
+A read-only (n - seq_len, seq_len, features) window view and the aligned (n - seq_len, 1) targets.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(values, seq_len):
+    """
+    Returns every run of `seq_len` consecutive rows of a 2-D array as a
+    (n - seq_len + 1, seq_len, features) view.
+    """
+    values = np.asarray(values)
+    if len(values) < seq_len:
+        return np.empty((0, seq_len, values.shape[1]), dtype=values.dtype)
+    return sliding_window_view(values, seq_len, axis=0).swapaxes(1, 2)
+
+
+def sequence_dataset(features, targets, seq_len):
+    """
+    Pairs each window of `seq_len` feature rows with the target of its last row, matching
+    the original loop: X[i] = features[i:i + seq_len], Y[i] = targets[i + seq_len - 1]
+    for i in range(len(targets) - seq_len).
+    """
+    count = max(len(targets) - seq_len, 0)
+    X = sliding_windows(features, seq_len)[:count]
+    Y = np.asarray(targets)[seq_len - 1:seq_len - 1 + count]
+    return X, Y
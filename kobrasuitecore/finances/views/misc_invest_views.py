@@ -28,7 +28,8 @@ from finances.utils.stock_utils import (
     get_hot_stocks,
     get_news_articles
 )
-from finances.services.stock_prediction_services import get_predictions
+from finances.services.price_history_services import get_indicator_chart
+from finances.services.prediction_registry_services import predict_from_registry, request_training
 
 
 class MiscInvestViewSet(viewsets.ViewSet):
@@ -53,10 +54,14 @@ class MiscInvestViewSet(viewsets.ViewSet):
         """
         Retrieves up to 5 years of historical data for a specified ticker
         from yfinance and returns the most recent 60 data points.
-        Default ticker is 'AAPL' if none is provided.
+        Default ticker is 'AAPL' if none is provided. With indicators=true the
+        points come from the local bar store with their technical indicators.
         """
         ticker = request.query_params.get('ticker', 'AAPL')
-        chart = get_stock_chart(ticker)
+        if request.query_params.get('indicators', 'false') == 'true':
+            chart = get_indicator_chart(ticker)
+        else:
+            chart = get_stock_chart(ticker)
         if not chart:
             return Response({'error': 'Could not generate chart.'}, status=status.HTTP_404_NOT_FOUND)
         return Response(chart, status=status.HTTP_200_OK)
@@ -66,19 +71,25 @@ class MiscInvestViewSet(viewsets.ViewSet):
         """
         Retrieves various technical indicator-based predictions (MACD, RSI, etc.)
         for a specified ticker. Defaults to 'AAPL' if none is provided.
+        Served from the model registry; when no model is registered for the
+        latest data yet, training is queued and 202 is returned so the client can poll.
         """
         ticker = request.query_params.get('ticker', 'AAPL')
-        MACD = request.query_params.get('MACD', 'false') == 'true'
-        RSI = request.query_params.get('RSI', 'false') == 'true'
-        SMA = request.query_params.get('SMA', 'false') == 'true'
-        EMA = request.query_params.get('EMA', 'false') == 'true'
-        ATR = request.query_params.get('ATR', 'false') == 'true'
-        BBands = request.query_params.get('BBands', 'false') == 'true'
-        VWAP = request.query_params.get('VWAP', 'false') == 'true'
-        res = get_predictions(ticker, MACD=MACD, RSI=RSI, SMA=SMA, EMA=EMA, ATR=ATR, BBands=BBands, VWAP=VWAP)
-        if not res:
-            return Response({'error': 'Could not generate predictions'}, status=status.HTTP_400_BAD_REQUEST)
-        return Response(res, status=status.HTTP_200_OK)
+        flags = {
+            name: request.query_params.get(name, 'false') == 'true'
+            for name in ('MACD', 'RSI', 'SMA', 'EMA', 'ATR', 'BBands', 'VWAP')
+        }
+        res = predict_from_registry(ticker, flags)
+        if res:
+            return Response(res, status=status.HTTP_200_OK)
+        state = request_training(ticker, flags)
+        if state == 'ready':
+            res = predict_from_registry(ticker, flags)
+            if res:
+                return Response(res, status=status.HTTP_200_OK)
+        elif state == 'pending':
+            return Response({'status': 'training'}, status=status.HTTP_202_ACCEPTED)
+        return Response({'error': 'Could not generate predictions'}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=False, methods=['get'])
     def hot_stocks(self, request):
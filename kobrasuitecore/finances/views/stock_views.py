@@ -35,9 +35,9 @@ from finances.services.stock_services import (
     get_or_create_stock_portfolio,
     add_stock_to_portfolio,
     remove_stock_from_portfolio,
-    get_portfolio_stocks,
-    portfolio_analysis
 )
+from finances.services.risk_services import get_portfolio_risk_metrics
+from finances.services.valuation_services import get_latest_valuation, get_valuation_history
 from finances.utils.stock_utils import check_stock_validity
 
 
@@ -83,7 +83,9 @@ class StockPortfolioViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def stocks(self, request, pk=None, user_pk=None, user_profile_pk=None, finance_profile_pk=None):
         """
-        Retrieves all stocks within the specified portfolio.
+        Retrieves all stocks within the specified portfolio, valued from the latest
+        valuation snapshot. When the snapshot was last confirmed and whether it is stale
+        are returned in the X-Valuation-As-Of and X-Valuation-Stale headers.
         """
         finance_profile = get_object_or_404(
             FinanceProfile,
@@ -91,8 +93,41 @@ class StockPortfolioViewSet(viewsets.ModelViewSet):
             profile_id=user_profile_pk,
             profile__user__id=user_pk
         )
-        data = get_portfolio_stocks(finance_profile, portfolio_id=pk)
-        return Response(data, status=status.HTTP_200_OK)
+        portfolio = StockPortfolio.objects.filter(finance_profile=finance_profile, pk=pk).first()
+        if not portfolio:
+            return Response([], status=status.HTTP_200_OK)
+        snapshot, stale = get_latest_valuation(portfolio)
+        if snapshot is None:
+            return Response([], status=status.HTTP_200_OK)
+        response = Response([p.as_dict() for p in snapshot.positions.all()], status=status.HTTP_200_OK)
+        response['X-Valuation-As-Of'] = snapshot.checked_at.isoformat()
+        response['X-Valuation-Stale'] = 'true' if stale else 'false'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def performance(self, request, pk=None, user_pk=None, user_profile_pk=None, finance_profile_pk=None):
+        """
+        Returns the portfolio's valuation history (value, invested, profit/loss) between
+        the optional ISO 'start' and 'end' query parameters, oldest first.
+        """
+        finance_profile = get_object_or_404(
+            FinanceProfile,
+            pk=finance_profile_pk,
+            profile_id=user_profile_pk,
+            profile__user__id=user_pk
+        )
+        portfolio = get_object_or_404(StockPortfolio, pk=pk, finance_profile=finance_profile)
+        bounds = {}
+        for name in ('start', 'end'):
+            value = request.query_params.get(name)
+            if value:
+                bounds[name] = parse_datetime(value) or parse_datetime(f'{value}T00:00:00Z')
+                if bounds[name] is None:
+                    return Response(
+                        {'error': f'Invalid {name} datetime'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+        return Response(get_valuation_history(portfolio, **bounds), status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'])
     def add_stock(self, request, pk=None, user_pk=None, user_profile_pk=None, finance_profile_pk=None):
@@ -153,8 +188,9 @@ class StockPortfolioViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def analysis(self, request, pk=None, user_pk=None, user_profile_pk=None, finance_profile_pk=None):
         """
-        Performs a portfolio analysis for the specified portfolio
-        (e.g., weighting, total value).
+        Returns the portfolio's precomputed risk metrics (expected return, risk,
+        Sharpe/Sortino, alpha/beta, drawdown, diversification), scoring it on
+        demand if the nightly job has not covered its current holdings yet.
         """
         finance_profile = get_object_or_404(
             FinanceProfile,
@@ -162,20 +198,19 @@ class StockPortfolioViewSet(viewsets.ModelViewSet):
             profile_id=user_profile_pk,
             profile__user__id=user_pk
         )
-        stocks_data = get_portfolio_stocks(finance_profile, pk)
-        if not stocks_data:
+        portfolio = get_object_or_404(StockPortfolio, pk=pk, finance_profile=finance_profile)
+        if not portfolio.stocks.exists():
             return Response(
                 {'error': 'No stocks in this portfolio.'},
                 status=status.HTTP_404_NOT_FOUND
             )
-        structure = {s['ticker']: s['number_of_shares'] for s in stocks_data}
-        result = portfolio_analysis(structure)
-        if not result:
+        metrics = get_portfolio_risk_metrics(portfolio)
+        if not metrics:
             return Response(
                 {'error': 'Error analyzing portfolio'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-        return Response(result, status=status.HTTP_200_OK)
+        return Response(metrics.as_dict(), status=status.HTTP_200_OK)
 
 
 class PortfolioStockViewSet(viewsets.ReadOnlyModelViewSet):
@@ -7,3 +7,4 @@ class HomelifeConfig(AppConfig):
 
     def ready(self):
         import homelife.signals.calendar_sync  # noqa: F401
+        import homelife.signals.chore_stats  # noqa: F401
@@ -0,0 +1,112 @@
+"""
+------------------Prologue--------------------
+File Name: benchmark_calendar_sync.py
+Path: kobrasuitecore/homelife/management/commands/benchmark_calendar_sync.py
+
+Description:
+Compares the query count and wall time of a calendar sync that deletes every event and writes one
+INSERT per occurrence (the original behaviour) with CalendarEventService.sync, which stores one
+series row per recurring schedule and, on resync, writes only the difference. Also times expanding
+the stored series into occurrences for the benchmark window, the work listing now does at query
+time. Runs inside a transaction that is rolled back, so no data is kept.
+
+Input:
+Optional --days argument for the length of the daily chore's schedule.
+
+Output:
+Query counts and timings per source, printed to stdout.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import time
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from homelife.models import Chore, Household, Pet, SharedCalendarEvent
+from homelife.services.calendar_event_service import CalendarEventService
+from homelife.types import ChoreFrequency
+from homelife.utils.recurrence import expand_events
+
+
+def per_row_sync(instance, window_start, window_end):
+    """
+    The original sync: delete, then one content-type lookup and INSERT per materialized
+    occurrence.
+    """
+    CalendarEventService.delete(instance)
+    for event in expand_events(CalendarEventService.build_events(instance), window_start, window_end):
+        event.source_content_type = ContentType.objects.get_for_model(instance.__class__)
+        event.pk = None
+        event.recurrence_frequency = ''
+        event.save()
+
+
+def events_for(instance):
+    return SharedCalendarEvent.objects.filter(
+        source_content_type=ContentType.objects.get_for_model(instance.__class__),
+        source_object_id=instance.pk,
+    )
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks per-occurrence rows against recurring series rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=365, help='Days covered by the daily chore.')
+
+    def measure(self, sync, *args):
+        ContentType.objects.clear_cache()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            sync(*args)
+            elapsed = (time.perf_counter() - started) * 1000
+        return len(ctx.captured_queries), elapsed
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        window_end = now + timedelta(days=options['days'])
+        with transaction.atomic():
+            household = Household.objects.create(name='Calendar benchmark')
+            sources = [
+                Chore.objects.create(
+                    household=household,
+                    title='Dishes',
+                    frequency=ChoreFrequency.DAILY,
+                    available_from=now,
+                    available_until=now + timedelta(days=options['days'] - 1, hours=1),
+                ),
+                Pet.objects.create(
+                    household=household,
+                    name='Rex',
+                    pet_type='Dog',
+                    food_frequency='DAILY',
+                    food_times=['07:00:00', '18:00:00'],
+                    water_frequency='DAILY',
+                    water_times=['08:00:00'],
+                ),
+            ]
+            for instance in sources:
+                label = f'{instance.__class__.__name__} #{instance.pk}'
+                before_queries, before_ms = self.measure(per_row_sync, instance, now, window_end)
+                materialized = events_for(instance).count()
+                CalendarEventService.delete(instance)
+                after_queries, after_ms = self.measure(CalendarEventService.sync, instance)
+                instance.description = instance.food_instructions = 'Edited'
+                edit_queries, edit_ms = self.measure(CalendarEventService.sync, instance)
+                series = list(events_for(instance))
+                started = time.perf_counter()
+                occurrences = len(expand_events(series, now, window_end))
+                expand_ms = (time.perf_counter() - started) * 1000
+                self.stdout.write(
+                    f'{label:<12} per-row {materialized:>4} rows {before_queries:>4} queries '
+                    f'{before_ms:8.1f} ms  |  series {len(series):>2} rows {after_queries:>2} queries '
+                    f'{after_ms:6.1f} ms  |  edit resync {edit_queries:>2} queries {edit_ms:6.1f} ms  |  '
+                    f'expand {occurrences:>4} occurrences {expand_ms:6.1f} ms'
+                )
+            transaction.set_rollback(True)
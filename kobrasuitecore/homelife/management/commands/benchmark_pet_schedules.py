@@ -0,0 +1,88 @@
+"""
+------------------Prologue--------------------
+File Name: benchmark_pet_schedules.py
+Path: kobrasuitecore/homelife/management/commands/benchmark_pet_schedules.py
+
+Description:
+Times building the calendar events of many pets from the stored minutes-since-midnight schedules
+against the previous approach of re-parsing the "HH:MM:SS" strings with strptime on every access.
+Pets are created inside a transaction that is rolled back, so no data is kept.
+
+Input:
+Optional --households, --pets (per household) and --rounds arguments.
+
+Output:
+Total and per-pet timings for both approaches, printed to stdout.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import time
+from datetime import datetime
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from homelife.models import Household, Pet
+from homelife.services.calendar_event_service import CalendarEventService
+
+
+def strptime_pet_events(pet, ct):
+    """
+    The previous path: parse each block's strings into time objects on every sync.
+    """
+    events = []
+    for label, block in (('Feed', 'food'), ('Water', 'water'), ('Medication', 'medication')):
+        times = [datetime.strptime(x, '%H:%M:%S').time() for x in getattr(pet, f'{block}_times')]
+        events.extend(CalendarEventService._sync_pet_care(
+            pet, label, getattr(pet, f'{block}_instructions'), getattr(pet, f'{block}_frequency'),
+            [t.hour * 60 + t.minute for t in times], ct,
+        ))
+    return events
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks building pet care events from parsed minutes against strptime parsing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--households', type=int, default=50)
+        parser.add_argument('--pets', type=int, default=20, help='Pets per household.')
+        parser.add_argument('--rounds', type=int, default=5)
+
+    def measure(self, build, pets, ct, rounds):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for pet in pets:
+                build(pet, ct)
+        return (time.perf_counter() - started) * 1000 / rounds
+
+    def handle(self, *args, **options):
+        ct = ContentType.objects.get_for_model(Pet)
+        with transaction.atomic(), CalendarEventService.signals_deferred():
+            households = Household.objects.bulk_create(
+                Household(name=f'Pet benchmark {n}') for n in range(options['households'])
+            )
+            pets = []
+            for household in households:
+                for n in range(options['pets']):
+                    pet = Pet(
+                        household=household, name=f'Pet {n}', pet_type='Dog',
+                        food_frequency='DAILY', food_times=['07:00:00', '12:30:00', '18:00:00'],
+                        water_frequency='DAILY', water_times=['08:00:00', '20:00:00'],
+                        medication_frequency='WEEKLY', medication_times=['09:15:00'],
+                    )
+                    pet.normalize_schedules()
+                    pets.append(pet)
+            pets = Pet.objects.bulk_create(pets)
+            pets = list(Pet.objects.filter(pk__in=[p.pk for p in pets]).select_related('household'))
+
+            before_ms = self.measure(strptime_pet_events, pets, ct, options['rounds'])
+            after_ms = self.measure(CalendarEventService.build_events, pets, ct, options['rounds'])
+            transaction.set_rollback(True)
+
+        count = len(pets)
+        self.stdout.write(
+            f'{count} pets  |  strptime {before_ms:8.1f} ms ({before_ms * 1000 / count:6.1f} us/pet)  |  '
+            f'minutes {after_ms:8.1f} ms ({after_ms * 1000 / count:6.1f} us/pet)'
+        )
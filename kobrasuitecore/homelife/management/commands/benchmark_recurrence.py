@@ -0,0 +1,80 @@
+"""
+------------------Prologue--------------------
+File Name: benchmark_recurrence.py
+Path: kobrasuitecore/homelife/management/commands/benchmark_recurrence.py
+
+Description:
+Times expanding a daily and a weekly series into a one-week window that lies --years after the
+series start, comparing the previous approach of stepping from the first occurrence with the
+closed-form occurrences() and the vectorized occurrence_array().
+
+Input:
+Optional --years and --rounds arguments.
+
+Output:
+Per-rule timings for each approach, printed to stdout.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import time
+from datetime import timedelta
+from itertools import count as counter
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from homelife.types import DaysOfTheWeek, RecurrenceFrequency
+from homelife.utils.recurrence import WEEKDAY_INDEX, occurrence_array, occurrences
+
+
+def stepped_occurrences(dtstart, duration, window_start, window_end, frequency, byweekday=None):
+    """
+    The previous expansion: walk every occurrence from dtstart up to the window end.
+    """
+    days = sorted(WEEKDAY_INDEX[d] for d in byweekday or [])
+    if frequency == RecurrenceFrequency.DAILY:
+        candidates = (dtstart + timedelta(days=k) for k in counter())
+    else:
+        week_start = dtstart - timedelta(days=dtstart.weekday())
+        candidates = (week_start + timedelta(weeks=k, days=d) for k in counter() for d in days)
+    starts = []
+    for current in candidates:
+        if current > window_end:
+            break
+        if current >= dtstart and current + duration >= window_start:
+            starts.append(current)
+    return starts
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks stepped recurrence expansion against the closed-form and NumPy versions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=10)
+        parser.add_argument('--rounds', type=int, default=200)
+
+    def measure(self, expand, rounds, *args, **kwargs):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            result = expand(*args, **kwargs)
+        return (time.perf_counter() - started) * 1000 / rounds, len(result)
+
+    def handle(self, *args, **options):
+        dtstart = timezone.now().replace(microsecond=0)
+        window_start = dtstart + timedelta(days=365 * options['years'])
+        window = (dtstart, timedelta(hours=1), window_start, window_start + timedelta(days=7))
+        rules = {
+            'daily': dict(frequency=RecurrenceFrequency.DAILY),
+            'weekly Mon/Wed/Fri': dict(frequency=RecurrenceFrequency.WEEKLY, byweekday=[
+                DaysOfTheWeek.MONDAY, DaysOfTheWeek.WEDNESDAY, DaysOfTheWeek.FRIDAY,
+            ]),
+        }
+        for label, rule in rules.items():
+            stepped_ms, found = self.measure(stepped_occurrences, options['rounds'], *window, **rule)
+            closed_ms, _ = self.measure(occurrences, options['rounds'], *window, **rule)
+            array_ms, _ = self.measure(occurrence_array, options['rounds'], *window, **rule)
+            self.stdout.write(
+                f'{label:<20} {found} occurrences  |  stepped {stepped_ms * 1000:9.1f} us  |  '
+                f'closed form {closed_ms * 1000:7.1f} us  |  numpy {array_ms * 1000:7.1f} us'
+            )
@@ -0,0 +1,32 @@
+"""
+------------------Prologue--------------------
+File Name: rebuild_chore_stats.py
+Path: kobrasuitecore/homelife/management/commands/rebuild_chore_stats.py
+
+Description:
+Rebuilds the per-member weekly chore statistics (ChoreWeeklyStats) from the full ChoreCompletion
+history. Used to backfill the table for completions recorded before it existed, or to repair it.
+
+Input:
+Optional --household argument to limit the rebuild to one household.
+
+Output:
+The number of weekly stats rows written, printed to stdout.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+from django.core.management.base import BaseCommand
+
+from homelife.services.chore_stats_service import ChoreStatsService
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds weekly chore statistics from completion history.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--household', type=int, help='Only rebuild this household.')
+
+    def handle(self, *args, **options):
+        count = ChoreStatsService.rebuild(options['household'])
+        self.stdout.write(f'Wrote {count} weekly chore stats rows.')
@@ -0,0 +1,45 @@
+"""
+------------------Prologue--------------------
+File Name: sync_calendar_events.py
+Path: kobrasuitecore/homelife/management/commands/sync_calendar_events.py
+
+Description:
+Re-syncs the shared calendar of every chore, workout routine, medication, appointment, grocery
+list, pet and meal plan. Run once after upgrading to recurrence rules: it collapses the
+per-occurrence rows written by earlier versions into one series row per schedule.
+
+Input:
+Optional --household argument to limit the sync to one household.
+
+Output:
+Created, updated and deleted event counts per model, printed to stdout.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+
+from homelife.services.calendar_event_service import SOURCE_MODELS, CalendarEventService
+
+
+class Command(BaseCommand):
+    help = 'Re-syncs calendar events for every calendar source.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--household', type=int, help='Only sync this household.')
+
+    def handle(self, *args, **options):
+        for model in SOURCE_MODELS:
+            ct = ContentType.objects.get_for_model(model)
+            queryset = model.objects.select_related('household')
+            if options['household']:
+                queryset = queryset.filter(household_id=options['household'])
+            totals = {'created': 0, 'updated': 0, 'deleted': 0}
+            for instance in queryset.iterator():
+                for key, value in CalendarEventService.sync(instance, ct).items():
+                    totals[key] += value
+            self.stdout.write(
+                f"{model.__name__:<20} created {totals['created']:>5}  "
+                f"updated {totals['updated']:>5}  deleted {totals['deleted']:>5}"
+            )
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homelife', '0008_remove_householdinvite_inviter_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sharedcalendarevent',
+            name='recurrence_byweekday',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='sharedcalendarevent',
+            name='recurrence_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sharedcalendarevent',
+            name='recurrence_frequency',
+            field=models.CharField(blank=True, choices=[('DAILY', 'Daily'), ('WEEKLY', 'Weekly'), ('MONTHLY', 'Monthly')], default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='sharedcalendarevent',
+            name='recurrence_interval',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='sharedcalendarevent',
+            name='recurrence_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
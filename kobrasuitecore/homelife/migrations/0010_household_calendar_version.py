@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homelife', '0009_recurrence_rules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='household',
+            name='calendar_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hq', '0013_upcoming_agenda'),
+        ('homelife', '0010_household_calendar_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChoreWeeklyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField()),
+                ('completions', models.PositiveIntegerField(default=0)),
+                ('on_time', models.PositiveIntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('streak', models.PositiveIntegerField(default=0)),
+                ('homelife_profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chore_weekly_stats', to='hq.homelifeprofile')),
+                ('household', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chore_weekly_stats', to='homelife.household')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['household', 'week_start'], name='homelife_ch_househo_45e292_idx')],
+                'unique_together': {('household', 'homelife_profile', 'week_start')},
+            },
+        ),
+    ]
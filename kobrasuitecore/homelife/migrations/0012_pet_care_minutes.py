@@ -0,0 +1,65 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+CARE_BLOCKS = ('food', 'water', 'medication')
+
+
+def _minutes(value):
+    """
+    Lenient copy of the care-time parser as of this migration: "HH:MM[:SS]" strings
+    (seconds truncated) or minute integers; None for anything else.
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if 0 <= value < 24 * 60 else None
+    if isinstance(value, str):
+        parts = value.strip().split(':')
+        if len(parts) in (2, 3) and all(p.isdigit() and len(p) <= 2 for p in parts):
+            hour, minute = int(parts[0]), int(parts[1])
+            second = int(parts[2]) if len(parts) == 3 else 0
+            if hour < 24 and minute < 60 and second < 60:
+                return hour * 60 + minute
+    return None
+
+
+def fill_care_minutes(apps, schema_editor):
+    """
+    Fills *_minutes from the stored *_times strings. The strings are left as they are,
+    and values that don't parse are skipped rather than clearing the schedule.
+    """
+    Pet = apps.get_model('homelife', 'Pet')
+    pets = list(Pet.objects.all())
+    for pet in pets:
+        for block in CARE_BLOCKS:
+            values = getattr(pet, f'{block}_times')
+            if not isinstance(values, (list, tuple)):
+                values = []
+            minutes = {_minutes(v) for v in values} - {None}
+            setattr(pet, f'{block}_minutes', sorted(minutes))
+    Pet.objects.bulk_update(pets, [f'{block}_minutes' for block in CARE_BLOCKS], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homelife', '0011_chore_weekly_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pet',
+            name='food_minutes',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='pet',
+            name='medication_minutes',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='pet',
+            name='water_minutes',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(fill_care_minutes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:02
+
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import Case, Count, IntegerField, Sum, When
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+
+def backfill_weekly_stats(apps, schema_editor):
+    """
+    Builds the weekly stats rows for completions recorded before the table existed, so
+    deleting one of them decrements a real row (mirrors ChoreStatsService.rebuild).
+    """
+    ChoreCompletion = apps.get_model('homelife', 'ChoreCompletion')
+    ChoreWeeklyStats = apps.get_model('homelife', 'ChoreWeeklyStats')
+    totals = (
+        ChoreCompletion.objects
+        .annotate(week=TruncWeek('completed_at'))
+        .values('chore__household_id', 'homelife_profile_id', 'week')
+        .annotate(
+            completions=Count('id'),
+            on_time=Sum(Case(When(is_on_time=True, then=1), default=0, output_field=IntegerField())),
+            points=Sum('points'),
+        )
+        .order_by('chore__household_id', 'homelife_profile_id', 'week')
+    )
+    rows, previous = [], None
+    for total in totals:
+        week = timezone.localdate(total['week'])
+        member = (total['chore__household_id'], total['homelife_profile_id'])
+        streak = 1
+        if previous and previous[0] == member and week - previous[1].week_start == timedelta(weeks=1):
+            streak = previous[1].streak + 1
+        row = ChoreWeeklyStats(
+            household_id=member[0],
+            homelife_profile_id=member[1],
+            week_start=week,
+            completions=total['completions'],
+            on_time=total['on_time'],
+            points=total['points'] or 0,
+            streak=streak,
+        )
+        rows.append(row)
+        previous = (member, row)
+    ChoreWeeklyStats.objects.all().delete()
+    ChoreWeeklyStats.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homelife', '0012_pet_care_minutes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_weekly_stats, migrations.RunPython.noop),
+    ]
@@ -23,13 +23,15 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import JSONField
 from django.utils import timezone
-from datetime import time, datetime
-from homelife.types import HouseholdType, ChoreFrequency, MealType, DaysOfTheWeek
+from homelife.types import HouseholdType, ChoreFrequency, MealType, DaysOfTheWeek, RecurrenceFrequency
+from homelife.utils.care_times import minutes_to_strings, minutes_to_time, parse_minutes
 
 
 class Household(models.Model): # Creates household model
     name = models.CharField(max_length=100)
     household_type = models.CharField(max_length=20, choices=HouseholdType.choices, default=HouseholdType.FAMILY)
+    # bumped on every calendar event write; backs the calendar window ETag
+    calendar_version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -58,42 +60,58 @@ class Pet(models.Model):
     medication_instructions  = models.TextField(blank=True)
 
     #  —— schedules ——
+    # *_times hold the client's "HH:MM:SS" strings; *_minutes the same schedule as sorted
+    # minutes since midnight, validated and filled in on save for the calendar sync.
     food_frequency = models.CharField(max_length=6, choices=CARE_FREQUENCY_CHOICES,
                                       default="", blank=True)
     food_times = models.JSONField(default=list, blank=True)  # unchanged
+    food_minutes = models.JSONField(default=list, blank=True, editable=False)
 
     water_frequency = models.CharField(max_length=6, choices=CARE_FREQUENCY_CHOICES,
                                        default="", blank=True)
     water_times = models.JSONField(default=list, blank=True)
+    water_minutes = models.JSONField(default=list, blank=True, editable=False)
 
     medication_frequency = models.CharField(max_length=6, choices=CARE_FREQUENCY_CHOICES,
                                             default="", blank=True)
     medication_times = models.JSONField(default=list, blank=True)
+    medication_minutes = models.JSONField(default=list, blank=True, editable=False)
 
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
-    # helper – always return `time` objects
-    def _as_times(self, lst):
-        out = []
-        for x in lst or []:
-            if isinstance(x, time):
-                out.append(x)
-            else:  # string "HH:MM[:SS]"
-                out.append(datetime.strptime(x, "%H:%M:%S").time())
-        return out
+    CARE_BLOCKS = ("food", "water", "medication")
+
+    def normalize_schedules(self):
+        """parse each *_times list once into *_minutes and canonical strings.
+        stored seconds are truncated here; the serializer rejects them from clients."""
+        for block in self.CARE_BLOCKS:
+            try:
+                minutes = parse_minutes(getattr(self, f"{block}_times"), strict=False)
+            except ValueError as exc:
+                raise ValidationError({f"{block}_times": str(exc)})
+            setattr(self, f"{block}_minutes", minutes)
+            setattr(self, f"{block}_times", minutes_to_strings(minutes))
+
+    def save(self, *args, **kwargs):
+        self.normalize_schedules()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            touched = {f"{b}_minutes" for b in self.CARE_BLOCKS if f"{b}_times" in update_fields}
+            kwargs["update_fields"] = {*update_fields, *touched}
+        super().save(*args, **kwargs)
 
     @property
-    def food_time_objs(self):  # used by the calendar service
-        return self._as_times(self.food_times)
+    def food_time_objs(self):
+        return [minutes_to_time(m) for m in self.food_minutes]
 
     @property
     def water_time_objs(self):
-        return self._as_times(self.water_times)
+        return [minutes_to_time(m) for m in self.water_minutes]
 
     @property
     def medication_time_objs(self):
-        return self._as_times(self.medication_times)
+        return [minutes_to_time(m) for m in self.medication_minutes]
 
     def clean(self):
         for freq, times, label in [
@@ -124,6 +142,13 @@ class SharedCalendarEvent(models.Model):
     source_content_type = models.ForeignKey(ContentType, null=True, blank=True, on_delete=models.SET_NULL)
     source_object_id = models.PositiveIntegerField(null=True, blank=True)
     source = GenericForeignKey("source_content_type", "source_object_id")
+    #  —— recurrence (RRULE-style); blank frequency = one-off event ——
+    recurrence_frequency = models.CharField(max_length=10, choices=RecurrenceFrequency.choices,
+                                            default="", blank=True)
+    recurrence_interval = models.PositiveIntegerField(default=1)
+    recurrence_byweekday = models.JSONField(default=list, blank=True)
+    recurrence_until = models.DateTimeField(null=True, blank=True)
+    recurrence_count = models.PositiveIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
@@ -132,6 +157,10 @@ class SharedCalendarEvent(models.Model):
             models.Index(fields=["household", "start_datetime"]),
         ]
 
+    @property
+    def is_recurring(self):
+        return bool(self.recurrence_frequency)
+
     def __str__(self):
         return f"{self.title} ({self.household.name})"
 
@@ -187,6 +216,25 @@ class ChoreCompletion(models.Model): # model for completed chores
         ordering = ['-completed_at']
 
 
+class ChoreWeeklyStats(models.Model): # per-member chore totals for one ISO week, kept current on each completion
+    household = models.ForeignKey(Household, on_delete=models.CASCADE, related_name='chore_weekly_stats')
+    homelife_profile = models.ForeignKey('hq.HomeLifeProfile', on_delete=models.CASCADE, related_name='chore_weekly_stats')
+    week_start = models.DateField()  # Monday of the ISO week, in local time
+    completions = models.PositiveIntegerField(default=0)
+    on_time = models.PositiveIntegerField(default=0)
+    points = models.IntegerField(default=0)
+    streak = models.PositiveIntegerField(default=0)  # consecutive weeks with a completion, ending this week
+
+    def __str__(self):
+        return f"{self.homelife_profile_id} week of {self.week_start} ({self.household.name})"
+
+    class Meta:
+        unique_together = ('household', 'homelife_profile', 'week_start')
+        indexes = [
+            models.Index(fields=['household', 'week_start']),
+        ]
+
+
 class MealPlan(models.Model): # creates meal plan Model
     household = models.ForeignKey(Household, on_delete=models.CASCADE, related_name='meal_plans')
     date = models.DateField()
@@ -1,8 +1,26 @@
 from rest_framework import serializers
 from homelife.models import Pet
+from homelife.utils.care_times import minutes_to_strings, parse_minutes
 
 
 class PetSerializer(serializers.ModelSerializer):
     class Meta:
         model = Pet
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+        read_only_fields = ['food_minutes', 'water_minutes', 'medication_minutes']
+
+    @staticmethod
+    def _validate_times(value):
+        try:
+            return minutes_to_strings(parse_minutes(value))
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+
+    def validate_food_times(self, value):
+        return self._validate_times(value)
+
+    def validate_water_times(self, value):
+        return self._validate_times(value)
+
+    def validate_medication_times(self, value):
+        return self._validate_times(value)
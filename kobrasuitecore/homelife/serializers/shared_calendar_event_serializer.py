@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from homelife.models import SharedCalendarEvent
+from homelife.types import DaysOfTheWeek
 
 
 class SharedCalendarEventSerializer(serializers.ModelSerializer):
@@ -15,6 +16,17 @@ class SharedCalendarEventSerializer(serializers.ModelSerializer):
             "location",
             "source_content_type",
             "source_object_id",
+            "recurrence_frequency",
+            "recurrence_interval",
+            "recurrence_byweekday",
+            "recurrence_until",
+            "recurrence_count",
         ]
 
         read_only_fields = ["source_content_type", "source_object_id"]
+
+    def validate_recurrence_byweekday(self, value):
+        invalid = [d for d in value or [] if d not in DaysOfTheWeek.values]
+        if invalid:
+            raise serializers.ValidationError(f"Invalid weekdays: {', '.join(map(str, invalid))}")
+        return value
@@ -1,11 +1,21 @@
+import threading
+import weakref
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta, time
 
-from dateutil.relativedelta import relativedelta
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.dispatch import Signal
 from django.utils import timezone
 
 from homelife.models import (
     Chore,
+    Household,
     GroceryList,
     MealPlan,
     MedicalAppointment,
@@ -14,7 +24,9 @@ from homelife.models import (
     SharedCalendarEvent,
     WorkoutRoutine,
 )
-from homelife.types import ChoreFrequency, DaysOfTheWeek, MealType
+from homelife.types import DaysOfTheWeek, MealType, RecurrenceFrequency
+from homelife.utils.care_times import minutes_to_time
+from homelife.utils.recurrence import expand_events, first_on_weekday
 
 
 MEAL_TIMES = {
@@ -24,39 +36,325 @@ MEAL_TIMES = {
     MealType.DINNER: time(18, 0),
 }
 
+BULK_BATCH_SIZE = 500
+SYNCED_FIELDS = (
+    'household_id',
+    'title',
+    'end_datetime',
+    'description',
+    'recurrence_frequency',
+    'recurrence_interval',
+    'recurrence_byweekday',
+    'recurrence_until',
+    'recurrence_count',
+)
+MAX_GROUPED_UPDATES = 10
+DEFAULT_CALENDAR_SYNC = {
+    'EAGER': False,
+    'DEBOUNCE': 2,
+}
+
+SOURCE_MODELS = (Chore, WorkoutRoutine, Medication, MedicalAppointment, GroceryList, Pet, MealPlan)
+
+# Sent with household_ids after events of those households change.
+calendar_changed = Signal()
+
+# Set while a bulk operation handles calendar syncs itself; the model signals skip it.
+_signals_deferred = ContextVar('homelife_calendar_signals_deferred', default=False)
+
+
+def _sync_cache_key(content_type_id, object_id):
+    return f'homelife:calendar-sync:{content_type_id}:{object_id}'
+
+
+class _PendingSyncs:
+    """
+    The sources saved in one transaction, queued together by a single on_commit callback.
+    The coalescing markers are only taken here, after the commit: a rolled back write never
+    leaves a marker behind, and a save that finds a marker has already committed, so the
+    queued sync (which clears its markers before reading) is guaranteed to see it.
+    """
+
+    def __init__(self, debounce):
+        self.debounce = debounce
+        self.ids = defaultdict(dict)
+        self.done = False
+
+    def add(self, content_type_id, object_ids):
+        self.ids[content_type_id].update(dict.fromkeys(object_ids))
+        return self
+
+    def __call__(self):
+        from homelife.tasks import sync_calendar_source, sync_calendar_sources
+
+        self.done = True
+        for ct_id, pks in self.ids.items():
+            ids = [pk for pk in pks if cache.add(_sync_cache_key(ct_id, pk), True, self.debounce + 60)]
+            if len(ids) == 1:
+                sync_calendar_source.apply_async((ct_id, ids[0]), countdown=self.debounce)
+            elif ids:
+                sync_calendar_sources.apply_async((ct_id, ids), countdown=self.debounce)
+
+
+# Per thread, the connection alias -> weak reference to the _PendingSyncs its open transaction
+# has registered with on_commit. Django drops the callbacks of a rolled back block, which frees
+# the object and clears the reference, so the next save registers a fresh one.
+_pending_syncs = threading.local()
+
+
+def _queue_after_commit(content_type_id, object_ids, debounce):
+    """
+    Adds sources to the current transaction's pending syncs, registering its on_commit
+    callback on first use (or again after a rollback discarded it).
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return _PendingSyncs(debounce).add(content_type_id, object_ids)()
+    registered = getattr(_pending_syncs, 'by_alias', None)
+    if registered is None:
+        registered = _pending_syncs.by_alias = {}
+    ref = registered.get(connection.alias)
+    pending = ref() if ref is not None else None
+    if pending is None or pending.done:
+        pending = _PendingSyncs(debounce)
+        registered[connection.alias] = weakref.ref(pending)
+        transaction.on_commit(pending)
+    pending.add(content_type_id, object_ids)
+    return None
+
 
 class CalendarEventService:
     @staticmethod
-    def sync(instance):
-        CalendarEventService.delete(instance)
+    def schedule_sync(instance):
+        """
+        Queues a sync of an instance's events. Saves of the same (model, pk) are coalesced:
+        within a transaction into one callback, and across transactions into a sync that
+        is already queued. The job runs DEBOUNCE seconds after the first save's transaction
+        commits and reads the instance's latest state. With EAGER set, syncs immediately.
+        """
+        config = {**DEFAULT_CALENDAR_SYNC, **getattr(settings, 'HOMELIFE_CALENDAR_SYNC', {})}
+        ct = ContentType.objects.get_for_model(instance.__class__)
+        if config['EAGER']:
+            return CalendarEventService.sync(instance, ct)
+        return _queue_after_commit(ct.pk, [instance.pk], config['DEBOUNCE'])
+
+    @staticmethod
+    def schedule_sync_many(instances):
+        """
+        Queues one sync covering several instances of the same model, e.g. after a bulk
+        write that bypassed the post_save signal. With EAGER set, syncs immediately.
+        """
+        instances = list(instances)
+        if not instances:
+            return None
+        config = {**DEFAULT_CALENDAR_SYNC, **getattr(settings, 'HOMELIFE_CALENDAR_SYNC', {})}
+        ct = ContentType.objects.get_for_model(instances[0].__class__)
+        if config['EAGER']:
+            return CalendarEventService.sync_many(instances, ct)
+        return _queue_after_commit(ct.pk, [i.pk for i in instances], config['DEBOUNCE'])
+
+    @staticmethod
+    @contextmanager
+    def signals_deferred():
+        """
+        Makes the post_save/post_delete calendar signals no-ops inside the block, for
+        bulk operations that sync (or delete) the affected events in one go afterwards.
+        """
+        token = _signals_deferred.set(True)
+        try:
+            yield
+        finally:
+            _signals_deferred.reset(token)
+
+    @staticmethod
+    def signals_are_deferred():
+        return _signals_deferred.get()
+
+    @staticmethod
+    def sync_source(content_type_id, object_id):
+        return CalendarEventService.sync_sources(content_type_id, [object_id])
+
+    @staticmethod
+    def sync_sources(content_type_id, object_ids):
+        """
+        Runs a queued sync for instances of one content type. Clears the coalescing
+        markers first so saves made during the sync queue another one, and removes the
+        events of instances deleted in the meantime.
+        """
+        cache.delete_many([_sync_cache_key(content_type_id, pk) for pk in object_ids])
+        ct = ContentType.objects.get_for_id(content_type_id)
+        instances = ct.model_class()._base_manager.in_bulk(object_ids)
+        missing = [pk for pk in object_ids if pk not in instances]
+        if missing:
+            CalendarEventService._delete_source(ct, missing)
+        if not instances:
+            return None
+        return CalendarEventService.sync_many(list(instances.values()), ct)
+
+    @staticmethod
+    def sync(instance, ct=None):
+        """
+        Reconciles the stored events of an instance with the ones it should have and
+        returns {'created': n, 'updated': n, 'deleted': n}. Rows are matched by start
+        time (and by title order where a source has several events at the same time),
+        so only the difference is written.
+        """
+        return CalendarEventService.sync_many([instance], ct)
+
+    @staticmethod
+    def sync_many(instances, ct=None):
+        """
+        Reconciles several instances of one model with a single read of their stored
+        events and one write transaction. Returns the combined counts.
+        """
+        ct = ct or ContentType.objects.get_for_model(instances[0].__class__)
+        desired = CalendarEventService._by_start(
+            event for instance in instances for event in CalendarEventService.build_events(instance, ct)
+        )
+        existing = CalendarEventService._by_start(
+            SharedCalendarEvent.objects.filter(
+                source_content_type=ct, source_object_id__in=[instance.id for instance in instances],
+            )
+        )
+
+        to_create, to_delete = [], []
+        changes = defaultdict(list)
+        for key in desired.keys() | existing.keys():
+            pairs, created, deleted = CalendarEventService._pair(desired.get(key, []), existing.get(key, []))
+            for want, have in pairs:
+                changed = tuple(
+                    (f, getattr(want, f)) for f in SYNCED_FIELDS if getattr(want, f) != getattr(have, f)
+                )
+                if changed:
+                    changes[changed].append(have)
+            to_create.extend(created)
+            to_delete.extend(e.pk for e in deleted)
+
+        if not (to_create or to_delete or changes):
+            return {'created': 0, 'updated': 0, 'deleted': 0}
+        households = {e.household_id for e in to_create}
+        households.update(e.household_id for rows in existing.values() for e in rows)
+        with transaction.atomic():
+            if to_delete:
+                SharedCalendarEvent.objects.filter(pk__in=to_delete).delete()
+            CalendarEventService._apply_changes(changes)
+            if to_create:
+                SharedCalendarEvent.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+            CalendarEventService.bump_version(*households)
+        updated = sum(len(rows) for rows in changes.values())
+        return {'created': len(to_create), 'updated': updated, 'deleted': len(to_delete)}
+
+    @staticmethod
+    def _apply_changes(changes):
+        """
+        Writes field changes to paired rows. Rows sharing the same changes (e.g. a new
+        description on every occurrence) get one UPDATE per change set; per-row values
+        such as shifted end times fall back to a bulk_update of the changed fields.
+        """
+        if not changes:
+            return
+        if len(changes) <= MAX_GROUPED_UPDATES:
+            for changed, rows in changes.items():
+                SharedCalendarEvent.objects.filter(pk__in=[e.pk for e in rows]).update(**dict(changed))
+            return
+        rows, fields = [], set()
+        for changed, group in changes.items():
+            for e in group:
+                for f, value in changed:
+                    setattr(e, f, value)
+            rows.extend(group)
+            fields.update(f.removesuffix('_id') for f, _ in changed)
+        SharedCalendarEvent.objects.bulk_update(rows, sorted(fields), batch_size=BULK_BATCH_SIZE)
+
+    @staticmethod
+    def _by_start(events):
+        grouped = defaultdict(list)
+        for event in events:
+            grouped[(event.source_object_id, event.start_datetime)].append(event)
+        return grouped
+
+    @staticmethod
+    def _pair(wanted, current):
+        """
+        Pairs desired and stored events that share a start time, preferring equal titles.
+        Returns (pairs, unmatched desired, unmatched stored).
+        """
+        current = list(current)
+        pairs, unmatched = [], []
+        for want in wanted:
+            match = next((have for have in current if have.title == want.title), None)
+            if match is None:
+                unmatched.append(want)
+            else:
+                current.remove(match)
+                pairs.append((want, match))
+        pairs.extend(zip(unmatched, current))
+        return pairs, unmatched[len(current):], current[len(unmatched):]
 
+    @staticmethod
+    def build_events(instance, ct=None):
+        """
+        Returns the unsaved SharedCalendarEvent rows an instance should have.
+        """
+        ct = ct or ContentType.objects.get_for_model(instance.__class__)
         if isinstance(instance, Chore):
-            CalendarEventService._sync_chore(instance)
+            return CalendarEventService._sync_chore(instance, ct)
         elif isinstance(instance, WorkoutRoutine):
-            CalendarEventService._sync_workout(instance)
+            return CalendarEventService._sync_workout(instance, ct)
         elif isinstance(instance, Medication):
-            CalendarEventService._sync_medication(instance)
+            return CalendarEventService._sync_medication(instance, ct)
         elif isinstance(instance, MedicalAppointment):
-            CalendarEventService._sync_medical(instance)
+            return CalendarEventService._sync_medical(instance, ct)
         elif isinstance(instance, GroceryList):
-            CalendarEventService._sync_grocery(instance)
+            return CalendarEventService._sync_grocery(instance, ct)
         elif isinstance(instance, Pet):
-            CalendarEventService._sync_pet(instance)
+            return CalendarEventService._sync_pet(instance, ct)
         elif isinstance(instance, MealPlan):
-            CalendarEventService._sync_meal_plan(instance)
+            return CalendarEventService._sync_meal_plan(instance, ct)
+        return []
 
     @staticmethod
-    def delete(instance):
-        ct = ContentType.objects.get_for_model(instance.__class__)
-        SharedCalendarEvent.objects.filter(
-            source_content_type=ct,
-            source_object_id=instance.id,
-        ).delete()
+    def delete(instance, ct=None):
+        ct = ct or ContentType.objects.get_for_model(instance.__class__)
+        CalendarEventService._delete_source(ct, [instance.id])
 
     @staticmethod
-    def _create_event(household, title, start, end, description, instance):
-        ct = ContentType.objects.get_for_model(instance.__class__)
-        SharedCalendarEvent.objects.create(
+    def delete_many(model, object_ids):
+        CalendarEventService._delete_source(ContentType.objects.get_for_model(model), object_ids)
+
+    @staticmethod
+    def _delete_source(ct, object_ids):
+        events = SharedCalendarEvent.objects.filter(source_content_type=ct, source_object_id__in=object_ids)
+        households = set(events.values_list('household_id', flat=True).distinct())
+        if households:
+            events.delete()
+            CalendarEventService.bump_version(*households)
+
+    @staticmethod
+    def bump_version(*household_ids):
+        """
+        Marks the calendars of the given households as changed, invalidating cached
+        calendar windows. Call after any SharedCalendarEvent write.
+        """
+        if household_ids:
+            Household.objects.filter(pk__in=household_ids).update(calendar_version=F('calendar_version') + 1)
+            calendar_changed.send(sender=SharedCalendarEvent, household_ids=set(household_ids))
+
+    @staticmethod
+    def window_events(queryset, start, end):
+        """
+        Returns the occurrences of the events in `queryset` overlapping [start, end],
+        with recurring series expanded, sorted by start time.
+        """
+        # Series are kept whole: an occurrence can outlast recurrence_until, so only
+        # the window end narrows them in SQL and expansion applies until/count.
+        one_off = Q(recurrence_frequency="", end_datetime__gte=start)
+        series = ~Q(recurrence_frequency="")
+        return expand_events(queryset.filter(one_off | series, start_datetime__lte=end), start, end)
+
+    @staticmethod
+    def _event(household, title, start, end, description, instance, ct, frequency='', until=None, byweekday=None):
+        return SharedCalendarEvent(
             household=household,
             title=title,
             start_datetime=start,
@@ -64,172 +362,170 @@ class CalendarEventService:
             description=description,
             source_content_type=ct,
             source_object_id=instance.id,
+            recurrence_frequency=frequency,
+            recurrence_until=until,
+            recurrence_byweekday=byweekday or [],
         )
 
     @staticmethod
-    def _generate_recurrences(start, frequency, until):
-        if str(frequency) in (ChoreFrequency.DAILY, 'DAILY'):
-            delta = timedelta(days=1)
-        elif str(frequency) in (ChoreFrequency.WEEKLY, 'WEEKLY'):
-            delta = timedelta(weeks=1)
-        elif str(frequency) in (ChoreFrequency.MONTHLY, 'MONTHLY'):
-            delta = relativedelta(months=1)
-        else:
-            return [start]
-
-        dates, current = [], start
-        while current <= until and len(dates) < 365:
-            dates.append(current)
-            current += delta
-        return dates
+    def _frequency(value):
+        """
+        Maps a source's frequency (chore choices or free text) to a recurrence frequency,
+        or '' for a one-off event.
+        """
+        value = str(value or '').upper()
+        return value if value in RecurrenceFrequency.values else ''
 
     @staticmethod
-    def _sync_chore(chore):
+    def _sync_chore(chore, ct):
         start = chore.available_from or chore.created_at
-        until = chore.available_until or start + timedelta(days=90)
         duration = (
             chore.available_until - chore.available_from
             if chore.available_from and chore.available_until
             else timedelta(hours=1)
         )
-
-        for dt in CalendarEventService._generate_recurrences(start, chore.frequency, until):
-            CalendarEventService._create_event(
-                chore.household,
-                f'Chore: {chore.title}',
-                dt,
-                dt + duration,
-                chore.description,
-                chore,
-            )
+        return [CalendarEventService._event(
+            chore.household,
+            f'Chore: {chore.title}',
+            start,
+            start + duration,
+            chore.description,
+            chore,
+            ct,
+            frequency=CalendarEventService._frequency(chore.frequency),
+            until=chore.available_until,
+        )]
 
     @staticmethod
-    def _sync_workout(routine):
-        today = timezone.localdate()
-        end_date = today + timedelta(days=90)
-        weekdays = {v: i for i, v in enumerate(DaysOfTheWeek.values)}
-        for day_code in routine.schedule or []:
-            first = timezone.make_aware(datetime.combine(today, time(6)))
-            while first.weekday() != weekdays[day_code]:
-                first += timedelta(days=1)
-            while first.date() <= end_date:
-                CalendarEventService._create_event(
-                    routine.household,
-                    f'Workout: {routine.title}',
-                    first,
-                    first + timedelta(hours=1),
-                    routine.description,
-                    routine,
-                )
-                first += timedelta(weeks=1)
+    def _sync_workout(routine, ct):
+        days = [d for d in routine.schedule or [] if d in DaysOfTheWeek.values]
+        if not days:
+            return []
+        start = first_on_weekday(
+            timezone.make_aware(datetime.combine(timezone.localdate(routine.created_at), time(6))), days,
+        )
+        return [CalendarEventService._event(
+            routine.household,
+            f'Workout: {routine.title}',
+            start,
+            start + timedelta(hours=1),
+            routine.description,
+            routine,
+            ct,
+            frequency=RecurrenceFrequency.WEEKLY,
+            byweekday=days,
+        )]
 
     @staticmethod
-    def _sync_medication(med):
+    def _sync_medication(med, ct):
         base = med.next_dose or med.created_at
-        until = base + timedelta(days=30)
-        for dt in CalendarEventService._generate_recurrences(base, med.frequency, until):
-            CalendarEventService._create_event(
-                med.household,
-                f'Medication: {med.name}',
-                dt,
-                dt + timedelta(minutes=30),
-                med.notes,
-                med,
-            )
+        return [CalendarEventService._event(
+            med.household,
+            f'Medication: {med.name}',
+            base,
+            base + timedelta(minutes=30),
+            med.notes,
+            med,
+            ct,
+            frequency=CalendarEventService._frequency(med.frequency),
+        )]
 
     @staticmethod
-    def _sync_medical(appointment):
-        CalendarEventService._create_event(
+    def _sync_medical(appointment, ct):
+        return [CalendarEventService._event(
             appointment.household,
             f'Appointment: {appointment.title}',
             appointment.appointment_datetime,
             appointment.appointment_datetime + timedelta(hours=1),
             appointment.description,
             appointment,
-        )
+            ct,
+        )]
 
     @staticmethod
-    def _sync_grocery(grocery_list):
+    def _sync_grocery(grocery_list, ct):
         start = grocery_list.run_datetime or grocery_list.created_at + timedelta(days=1)
-        CalendarEventService._create_event(
+        return [CalendarEventService._event(
             grocery_list.household,
             f'Grocery Run: {grocery_list.name}',
             start,
             start + timedelta(hours=2),
             '',
             grocery_list,
-        )
+            ct,
+        )]
 
     @staticmethod
-    def _sync_pet_care(pet, label_prefix, instructions, frequency, times):
+    def _sync_pet_care(pet, label_prefix, instructions, frequency, minutes, ct):
         # skip if block disabled
-        if not frequency or not times:
-            return
-
-        base_date = timezone.localdate()
-        until = base_date + timedelta(days=30)
+        if not frequency or not minutes:
+            return []
 
-        def _emit(dt):
-            CalendarEventService._create_event(
+        # ONCE  → one event on the day the schedule was saved;
+        # DAILY / WEEKLY → a series starting the day the pet was added
+        base_date = timezone.localdate(pet.updated_at if frequency == "ONCE" else pet.created_at)
+        recurrence = (
+            '' if frequency == "ONCE"
+            else RecurrenceFrequency.DAILY if frequency == "DAILY"
+            else RecurrenceFrequency.WEEKLY
+        )
+        events = []
+        for minute in minutes:
+            base = timezone.make_aware(datetime.combine(base_date, minutes_to_time(minute)))
+            events.append(CalendarEventService._event(
                 pet.household,
                 f"{label_prefix}: {pet.name}",
-                dt,
-                dt + timedelta(minutes=30),
+                base,
+                base + timedelta(minutes=30),
                 instructions,
                 pet,
-            )
-
-        for per_day_time in times:
-            base = timezone.make_aware(datetime.combine(base_date, per_day_time))
-
-            # ONCE  → one event right away
-            if frequency == "ONCE":
-                _emit(base)
-                continue
-
-            # DAILY / WEEKLY
-            rec_freq = "DAILY" if frequency == "DAILY" else "WEEKLY"
-            end = timezone.make_aware(datetime.combine(until, per_day_time))
-
-            for dt in CalendarEventService._generate_recurrences(base, rec_freq, end):
-                _emit(dt)
+                ct,
+                frequency=recurrence,
+            ))
+        return events
 
     # main entry for pets
     @staticmethod
-    def _sync_pet(pet: Pet):
-        CalendarEventService._sync_pet_care(
-            pet,
-            label_prefix="Feed",
-            instructions=pet.food_instructions,
-            frequency=pet.food_frequency,
-            times=pet.food_time_objs,  # ← changed
-        )
-        CalendarEventService._sync_pet_care(
-            pet,
-            label_prefix="Water",
-            instructions=pet.water_instructions,
-            frequency=pet.water_frequency,
-            times=pet.water_time_objs,  # ← changed
-        )
-        CalendarEventService._sync_pet_care(
-            pet,
-            label_prefix="Medication",
-            instructions=pet.medication_instructions,
-            frequency=pet.medication_frequency,
-            times=pet.medication_time_objs,  # ← changed
-        )
+    def _sync_pet(pet: Pet, ct):
+        return [
+            *CalendarEventService._sync_pet_care(
+                pet,
+                label_prefix="Feed",
+                instructions=pet.food_instructions,
+                frequency=pet.food_frequency,
+                minutes=pet.food_minutes,
+                ct=ct,
+            ),
+            *CalendarEventService._sync_pet_care(
+                pet,
+                label_prefix="Water",
+                instructions=pet.water_instructions,
+                frequency=pet.water_frequency,
+                minutes=pet.water_minutes,
+                ct=ct,
+            ),
+            *CalendarEventService._sync_pet_care(
+                pet,
+                label_prefix="Medication",
+                instructions=pet.medication_instructions,
+                frequency=pet.medication_frequency,
+                minutes=pet.medication_minutes,
+                ct=ct,
+            ),
+        ]
 
     @staticmethod
-    def _sync_meal_plan(meal_plan):
+    def _sync_meal_plan(meal_plan, ct):
         meal_time = MEAL_TIMES.get(meal_plan.meal_type)
         if not meal_time:
-            return
+            return []
         start = timezone.make_aware(datetime.combine(meal_plan.date, meal_time))
-        CalendarEventService._create_event(
+        return [CalendarEventService._event(
             meal_plan.household,
             f'{meal_plan.get_meal_type_display()}: {meal_plan.recipe_name}',
             start,
             start + timedelta(hours=1),
             meal_plan.notes,
             meal_plan,
-        )
\ No newline at end of file
+            ct,
+        )]
@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Sum, When
+from django.db.models.functions import Greatest, TruncWeek
+from django.utils import timezone
+
+from homelife.models import ChoreCompletion, ChoreWeeklyStats
+
+
+class ChoreStatsService:
+    @staticmethod
+    def week_start(moment):
+        """
+        Monday of the local ISO week containing a datetime or date.
+        """
+        day = timezone.localdate(moment) if isinstance(moment, datetime) else moment
+        return day - timedelta(days=day.weekday())
+
+    @staticmethod
+    def _bucket(completion):
+        return (
+            completion.chore.household_id,
+            completion.homelife_profile_id,
+            ChoreStatsService.week_start(completion.completed_at),
+        )
+
+    @staticmethod
+    def apply(completion, sign=1):
+        """
+        Adds (sign=1) or removes (sign=-1) one completion from its week's stats row and
+        repairs the member's streaks when the week gains its first or loses its last
+        completion. Removing a completion whose week has no row (or an empty one) is a
+        no-op, and the counters never drop below zero.
+        """
+        household_id, profile_id, week = ChoreStatsService._bucket(completion)
+        bucket = {'household_id': household_id, 'homelife_profile_id': profile_id, 'week_start': week}
+        with transaction.atomic():
+            if sign < 0:
+                stats = ChoreWeeklyStats.objects.select_for_update().filter(**bucket).first()
+                if stats is None or stats.completions <= 0:
+                    return
+            else:
+                stats, _ = ChoreWeeklyStats.objects.select_for_update().get_or_create(**bucket)
+            ChoreWeeklyStats.objects.filter(pk=stats.pk).update(
+                completions=Greatest(F('completions') + sign, 0),
+                on_time=Greatest(F('on_time') + (sign if completion.is_on_time else 0), 0),
+                points=F('points') + sign * completion.points,
+            )
+            if stats.completions == 0 or stats.completions + sign == 0:
+                ChoreStatsService.restreak(household_id, profile_id, week)
+
+    @staticmethod
+    def restreak(household_id, profile_id, since):
+        """
+        Recomputes the member's streaks from the week before `since` onwards. Empty weeks
+        are deleted so the table only holds weeks with completions.
+        """
+        rows = list(
+            ChoreWeeklyStats.objects
+            .filter(household_id=household_id, homelife_profile_id=profile_id,
+                    week_start__gte=since - timedelta(weeks=1))
+            .order_by('week_start')
+        )
+        empty = [row.pk for row in rows if row.completions <= 0]
+        if empty:
+            ChoreWeeklyStats.objects.filter(pk__in=empty).delete()
+        previous, changed = None, []
+        for row in rows:
+            if row.completions <= 0:
+                continue
+            if previous is not None and row.week_start - previous.week_start == timedelta(weeks=1):
+                streak = previous.streak + 1
+            elif previous is None and row.week_start < since:
+                streak = row.streak  # the anchor week before `since` keeps its streak
+            else:
+                streak = 1
+            if streak != row.streak:
+                row.streak = streak
+                changed.append(row)
+            previous = row
+        if changed:
+            ChoreWeeklyStats.objects.bulk_update(changed, ['streak'])
+
+    @staticmethod
+    def rebuild(household_id=None):
+        """
+        Recomputes every stats row from ChoreCompletion, e.g. to backfill history.
+        Returns the number of rows written.
+        """
+        completions = ChoreCompletion.objects.all()
+        stats = ChoreWeeklyStats.objects.all()
+        if household_id is not None:
+            completions = completions.filter(chore__household_id=household_id)
+            stats = stats.filter(household_id=household_id)
+        totals = (
+            completions
+            .annotate(week=TruncWeek('completed_at'))
+            .values('chore__household_id', 'homelife_profile_id', 'week')
+            .annotate(
+                completions=Count('id'),
+                on_time=Sum(Case(When(is_on_time=True, then=1), default=0, output_field=IntegerField())),
+                points=Sum('points'),
+            )
+            .order_by('chore__household_id', 'homelife_profile_id', 'week')
+        )
+        rows, previous = [], None
+        for total in totals:
+            week = timezone.localdate(total['week'])
+            member = (total['chore__household_id'], total['homelife_profile_id'])
+            streak = 1
+            if previous and previous[0] == member and week - previous[1].week_start == timedelta(weeks=1):
+                streak = previous[1].streak + 1
+            row = ChoreWeeklyStats(
+                household_id=member[0],
+                homelife_profile_id=member[1],
+                week_start=week,
+                completions=total['completions'],
+                on_time=total['on_time'],
+                points=total['points'] or 0,
+                streak=streak,
+            )
+            rows.append(row)
+            previous = (member, row)
+        with transaction.atomic():
+            stats.delete()
+            ChoreWeeklyStats.objects.bulk_create(rows, batch_size=500)
+        return len(rows)
+
+    @staticmethod
+    def household_stats(household_id, week=None):
+        """
+        Returns the per-member stats of one ISO week (the current one by default), read
+        from at most two rows per member. A member's streak is still alive this week if
+        last week had a completion.
+        """
+        week = week or ChoreStatsService.week_start(timezone.now())
+        rows = (
+            ChoreWeeklyStats.objects
+            .filter(household_id=household_id, week_start__in=[week, week - timedelta(weeks=1)])
+            .select_related('homelife_profile__profile__user')
+        )
+        members = {}
+        for row in sorted(rows, key=lambda r: r.week_start):
+            entry = members.setdefault(row.homelife_profile_id, {
+                'homelife_profile': row.homelife_profile_id,
+                'username': row.homelife_profile.profile.user.username,
+                'completions': 0,
+                'on_time': 0,
+                'points': 0,
+                'on_time_rate': None,
+                'streak': 0,
+            })
+            if row.week_start == week:
+                entry.update(
+                    completions=row.completions,
+                    on_time=row.on_time,
+                    points=row.points,
+                    on_time_rate=round(row.on_time / row.completions, 4) if row.completions else None,
+                )
+            entry['streak'] = row.streak
+        leaderboard = sorted(members.values(), key=lambda m: (-m['points'], -m['completions'], m['username']))
+        return {
+            'week_start': week,
+            'completions': sum(m['completions'] for m in leaderboard),
+            'points': sum(m['points'] for m in leaderboard),
+            'members': leaderboard,
+        }
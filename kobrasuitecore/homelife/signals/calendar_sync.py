@@ -20,7 +20,9 @@ from homelife.services.calendar_event_service import CalendarEventService
 @receiver(post_save, sender=Pet)
 @receiver(post_save, sender=MealPlan)
 def create_or_update_calendar_event(sender, instance, **kwargs):
-    CalendarEventService.sync(instance)
+    if CalendarEventService.signals_are_deferred():
+        return
+    CalendarEventService.schedule_sync(instance)
 
 
 @receiver(post_delete, sender=Chore)
@@ -31,4 +33,6 @@ def create_or_update_calendar_event(sender, instance, **kwargs):
 @receiver(post_delete, sender=Pet)
 @receiver(post_delete, sender=MealPlan)
 def remove_calendar_event(sender, instance, **kwargs):
+    if CalendarEventService.signals_are_deferred():
+        return
     CalendarEventService.delete(instance)
\ No newline at end of file
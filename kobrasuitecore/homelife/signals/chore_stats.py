@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from homelife.models import ChoreCompletion
+from homelife.services.chore_stats_service import ChoreStatsService
+
+TRACKED_FIELDS = ('chore_id', 'homelife_profile_id', 'completed_at', 'is_on_time', 'points')
+
+
+@receiver(pre_save, sender=ChoreCompletion)
+def remember_previous_completion(sender, instance, **kwargs):
+    instance._stats_previous = None
+    if instance.pk:
+        instance._stats_previous = (
+            ChoreCompletion.objects.select_related('chore').filter(pk=instance.pk).first()
+        )
+
+
+@receiver(post_save, sender=ChoreCompletion)
+def add_completion_to_stats(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_stats_previous', None)
+    if previous is not None:
+        if all(getattr(previous, f) == getattr(instance, f) for f in TRACKED_FIELDS):
+            return
+        ChoreStatsService.apply(previous, sign=-1)
+    ChoreStatsService.apply(instance)
+
+
+@receiver(post_delete, sender=ChoreCompletion)
+def remove_completion_from_stats(sender, instance, **kwargs):
+    ChoreStatsService.apply(instance, sign=-1)
@@ -0,0 +1,38 @@
+"""
+------------------Prologue--------------------
+File Name: tasks.py
+Path: kobrasuitecore/homelife/tasks.py
+
+Description:
+Defines asynchronous Celery tasks for the homelife module. Calendar syncs queued by the
+post_save signal run here, once per burst of saves to the same chore, pet or other source,
+as do the single syncs queued after bulk writes.
+
+Input:
+Content type and primary key(s) of calendar sources.
+
+Output:
+Reconciled SharedCalendarEvent rows and log entries with the changes made.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import logging
+from celery import shared_task
+from .services.calendar_event_service import CalendarEventService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def sync_calendar_source(content_type_id, object_id):
+    result = CalendarEventService.sync_source(content_type_id, object_id)
+    logger.info(f"Calendar sync for {content_type_id}:{object_id} finished. Changes: {result}")
+    return result
+
+
+@shared_task
+def sync_calendar_sources(content_type_id, object_ids):
+    result = CalendarEventService.sync_sources(content_type_id, object_ids)
+    logger.info(f"Calendar sync for {content_type_id}:{len(object_ids)} sources finished. Changes: {result}")
+    return result
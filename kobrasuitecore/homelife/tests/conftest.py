@@ -0,0 +1,8 @@
+import pytest
+
+from homelife.models import Household
+
+
+@pytest.fixture
+def household(db):
+    return Household.objects.create(name='Test household')
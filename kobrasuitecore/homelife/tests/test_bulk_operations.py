@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from homelife.models import Chore, GroceryItem, GroceryList, MealPlan, SharedCalendarEvent
+from homelife.types import MealType
+from homelife.views.chore_views import ChoreViewSet
+from homelife.views.grocery_item_views import GroceryItemViewSet
+from homelife.views.meal_plan_views import MealPlanViewSet
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(username='member', password='pass12345')
+
+
+def call(viewset, action, method, data, user, **kwargs):
+    request = getattr(APIRequestFactory(), method)('/', data, format='json')
+    force_authenticate(request, user=user)
+    return viewset.as_view({method: action})(request, **kwargs)
+
+
+def events_for(model, ids):
+    return SharedCalendarEvent.objects.filter(source_content_type=ContentType.objects.get_for_model(model),
+                                              source_object_id__in=ids)
+
+
+@pytest.mark.django_db
+class TestBulkOperations:
+    def test_week_of_meal_plans_is_one_insert_and_one_calendar_write(self, household, user):
+        today = timezone.localdate()
+        payload = [
+            {'household': household.pk, 'date': (today + timedelta(days=n)).isoformat(),
+             'meal_type': MealType.DINNER, 'recipe_name': f'Recipe {n}'}
+            for n in range(7)
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            response = call(MealPlanViewSet, 'bulk_create', 'post', payload, user, household_pk=household.pk)
+        assert response.status_code == 201 and len(response.data) == 7
+        inserts = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        assert len(inserts) == 2
+        assert inserts[0].startswith('INSERT INTO "homelife_mealplan"')
+        assert inserts[1].startswith('INSERT INTO "homelife_sharedcalendarevent"')
+        assert events_for(MealPlan, [m['id'] for m in response.data]).count() == 7
+
+    def test_invalid_item_rejects_the_whole_payload(self, household, user):
+        payload = [
+            {'household': household.pk, 'date': timezone.localdate().isoformat(),
+             'meal_type': MealType.DINNER, 'recipe_name': 'Tacos'},
+            {'household': household.pk, 'meal_type': 'BRUNCH', 'recipe_name': 'Eggs'},
+        ]
+        response = call(MealPlanViewSet, 'bulk_create', 'post', payload, user, household_pk=household.pk)
+        assert response.status_code == 400
+        assert set(response.data[1]) == {'date', 'meal_type'}
+        assert not MealPlan.objects.exists()
+
+    def test_bulk_update_writes_changed_fields_and_resyncs_once(self, household, user):
+        chores = [Chore.objects.create(household=household, title=f'Chore {n}') for n in range(5)]
+        payload = [{'id': c.pk, 'title': f'Renamed {n}'} for n, c in enumerate(chores)]
+        with CaptureQueriesContext(connection) as ctx:
+            response = call(ChoreViewSet, 'bulk_update', 'patch', payload, user, household_pk=household.pk)
+        assert response.status_code == 200
+        sql = [q['sql'] for q in ctx.captured_queries]
+        assert len([q for q in sql if q.startswith('UPDATE "homelife_chore"')]) == 1
+        assert len([q for q in sql if q.startswith('SELECT') and 'homelife_sharedcalendarevent' in q]) == 1
+        titles = set(events_for(Chore, [c.pk for c in chores]).values_list('title', flat=True))
+        assert titles == {f'Chore: Renamed {n}' for n in range(5)}
+
+    def test_bulk_update_rejects_rows_of_other_households(self, household, user):
+        other = Chore.objects.create(household=type(household).objects.create(name='Other'), title='Theirs')
+        response = call(ChoreViewSet, 'bulk_update', 'patch', [{'id': other.pk, 'title': 'Mine'}], user,
+                        household_pk=household.pk)
+        assert response.status_code == 400
+        other.refresh_from_db()
+        assert other.title == 'Theirs'
+
+    def test_bulk_delete_removes_rows_and_their_events(self, household, user):
+        chores = [Chore.objects.create(household=household, title=f'Chore {n}') for n in range(4)]
+        ids = [c.pk for c in chores[:3]]
+        with CaptureQueriesContext(connection) as ctx:
+            response = call(ChoreViewSet, 'bulk_delete', 'post', {'ids': ids}, user, household_pk=household.pk)
+        assert response.data == {'deleted': 3}
+        event_deletes = [q for q in ctx.captured_queries
+                         if q['sql'].startswith('DELETE FROM "homelife_sharedcalendarevent"')]
+        assert len(event_deletes) == 1
+        assert not events_for(Chore, ids).exists()
+        assert events_for(Chore, [chores[3].pk]).count() == 1
+
+    def test_grocery_items_attach_to_the_list(self, household, user):
+        grocery_list = GroceryList.objects.create(household=household, name='Weekly')
+        payload = [{'grocery_list': grocery_list.pk, 'name': f'Item {n}'} for n in range(40)]
+        response = call(GroceryItemViewSet, 'bulk_create', 'post', payload, user,
+                        household_pk=household.pk, grocery_list_pk=grocery_list.pk)
+        assert response.status_code == 201
+        assert GroceryItem.objects.filter(grocery_list=grocery_list).count() == 40
+        response = call(GroceryItemViewSet, 'bulk_update', 'patch',
+                        [{'id': i['id'], 'purchased': True} for i in response.data[:10]], user,
+                        household_pk=household.pk, grocery_list_pk=grocery_list.pk)
+        assert response.status_code == 200
+        assert GroceryItem.objects.filter(purchased=True).count() == 10
@@ -0,0 +1,216 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from homelife.models import Chore, MealPlan, Pet, SharedCalendarEvent, WorkoutRoutine
+from homelife.services.calendar_event_service import CalendarEventService, _sync_cache_key
+from homelife.tasks import sync_calendar_source
+from homelife.types import ChoreFrequency, DaysOfTheWeek, MealType, RecurrenceFrequency
+from homelife.utils.recurrence import expand_events
+
+
+def events_for(instance):
+    return SharedCalendarEvent.objects.filter(
+        source_content_type=ContentType.objects.get_for_model(instance.__class__),
+        source_object_id=instance.pk,
+    )
+
+
+@pytest.fixture
+def daily_chore(household):
+    start = timezone.now().replace(microsecond=0)
+    return Chore.objects.create(
+        household=household,
+        title='Dishes',
+        frequency=ChoreFrequency.DAILY,
+        available_from=start,
+        available_until=start + timedelta(days=199, hours=1),
+    )
+
+
+@pytest.mark.django_db
+class TestCalendarEventService:
+    def test_daily_chore_is_stored_as_one_series(self, daily_chore):
+        (event,) = events_for(daily_chore)
+        assert event.title == 'Chore: Dishes'
+        assert event.start_datetime == daily_chore.available_from
+        assert event.recurrence_frequency == RecurrenceFrequency.DAILY
+        assert event.recurrence_until == daily_chore.available_until
+        occurrences = expand_events([event], daily_chore.available_from, daily_chore.available_until)
+        assert len(occurrences) == 200
+        assert occurrences[-1].start_datetime == daily_chore.available_from + timedelta(days=199)
+
+    def test_sync_writes_in_bulk_and_resolves_content_type_once(self, household):
+        pet = Pet.objects.create(
+            household=household, name='Rex', pet_type='Dog',
+            food_frequency='DAILY', food_times=['07:00:00', '18:00:00'],
+            water_frequency='DAILY', water_times=['08:00:00'],
+        )
+        CalendarEventService.delete(pet)
+        ContentType.objects.clear_cache()
+        with CaptureQueriesContext(connection) as ctx:
+            assert CalendarEventService.sync(pet) == {'created': 3, 'updated': 0, 'deleted': 0}
+        sql = [q['sql'] for q in ctx.captured_queries]
+        assert len([q for q in sql if 'django_content_type' in q]) == 1
+        assert not [q for q in sql if q.startswith('DELETE')]
+        assert [q for q in sql if q.startswith('UPDATE')] == [
+            q for q in sql if q.startswith('UPDATE "homelife_household"')
+        ]
+        assert len([q for q in sql if q.startswith('INSERT')]) == 1
+
+    def test_pet_care_blocks_are_combined(self, household):
+        pet = Pet.objects.create(
+            household=household, name='Rex', pet_type='Dog',
+            food_frequency='DAILY', food_times=['07:00:00', '18:00:00'],
+            water_frequency='ONCE', water_times=['08:00:00'],
+        )
+        rows = list(events_for(pet).values_list('title', 'recurrence_frequency'))
+        assert rows.count(('Feed: Rex', RecurrenceFrequency.DAILY)) == 2
+        assert rows.count(('Water: Rex', '')) == 1
+
+    def test_workout_is_a_weekly_series_on_its_schedule(self, household):
+        routine = WorkoutRoutine.objects.create(
+            household=household, title='Run', schedule=[DaysOfTheWeek.MONDAY, DaysOfTheWeek.THURSDAY],
+        )
+        (event,) = events_for(routine)
+        assert event.recurrence_frequency == RecurrenceFrequency.WEEKLY
+        assert timezone.localtime(event.start_datetime).weekday() in (0, 3)
+        assert event.recurrence_byweekday == [DaysOfTheWeek.MONDAY, DaysOfTheWeek.THURSDAY]
+        start = timezone.now()
+        weekdays = {o.start_datetime.weekday() for o in expand_events([event], start, start + timedelta(days=28))}
+        assert weekdays == {0, 3}
+
+    def test_single_event_sources(self, household):
+        meal = MealPlan.objects.create(household=household, date=timezone.localdate(),
+                                       meal_type=MealType.DINNER, recipe_name='Tacos')
+        (event,) = events_for(meal)
+        assert event.title == 'Dinner: Tacos'
+        assert not event.is_recurring
+        assert timezone.localtime(event.start_datetime).hour == 18
+
+    def test_delete_removes_only_the_sources_events(self, daily_chore, household):
+        other = Chore.objects.create(household=household, title='Trash')
+        daily_chore.delete()
+        assert not events_for(daily_chore).exists()
+        assert events_for(other).count() == 1
+
+
+@pytest.mark.django_db
+class TestCalendarReconcile:
+    def test_unchanged_source_writes_nothing(self, daily_chore):
+        with CaptureQueriesContext(connection) as ctx:
+            assert CalendarEventService.sync(daily_chore) == {'created': 0, 'updated': 0, 'deleted': 0}
+        assert not [q for q in ctx.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+
+    def test_field_only_change_is_one_update(self, daily_chore):
+        (pk,) = events_for(daily_chore).values_list('pk', flat=True)
+        daily_chore.description = 'Use the good soap'
+        with CaptureQueriesContext(connection) as ctx:
+            result = CalendarEventService.sync(daily_chore)
+        writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))]
+        assert result == {'created': 0, 'updated': 1, 'deleted': 0}
+        assert len(writes) == 2
+        assert writes[0].startswith('UPDATE "homelife_sharedcalendarevent"')
+        assert writes[1].startswith('UPDATE "homelife_household"')
+        assert list(events_for(daily_chore).values_list('pk', 'description')) == [(pk, 'Use the good soap')]
+
+    def test_changed_schedule_updates_the_series_in_place(self, daily_chore):
+        (pk,) = events_for(daily_chore).values_list('pk', flat=True)
+        daily_chore.available_until = daily_chore.available_from + timedelta(days=49, hours=1)
+        assert CalendarEventService.sync(daily_chore) == {'created': 0, 'updated': 1, 'deleted': 0}
+        event = events_for(daily_chore).get()
+        assert event.pk == pk and event.recurrence_until == daily_chore.available_until
+
+    def test_materialized_occurrences_collapse_into_the_series(self, daily_chore):
+        ct = ContentType.objects.get_for_model(Chore)
+        (series,) = events_for(daily_chore)
+        SharedCalendarEvent.objects.bulk_create(
+            SharedCalendarEvent(
+                household=daily_chore.household, title=series.title, description=series.description,
+                start_datetime=o.start_datetime, end_datetime=o.end_datetime,
+                source_content_type=ct, source_object_id=daily_chore.pk,
+            )
+            for o in expand_events([series], daily_chore.available_from, daily_chore.available_until)[1:]
+        )
+        assert CalendarEventService.sync(daily_chore) == {'created': 0, 'updated': 0, 'deleted': 199}
+        assert list(events_for(daily_chore).values_list('pk', flat=True)) == [series.pk]
+
+    def test_same_time_events_are_matched_by_title(self, household):
+        pet = Pet.objects.create(
+            household=household, name='Rex', pet_type='Dog',
+            food_frequency='ONCE', food_times=['07:00:00'],
+            water_frequency='ONCE', water_times=['07:00:00'],
+        )
+        feed = events_for(pet).get(title='Feed: Rex')
+        pet.water_frequency = ''
+        assert CalendarEventService.sync(pet) == {'created': 0, 'updated': 0, 'deleted': 1}
+        assert list(events_for(pet).values_list('pk', flat=True)) == [feed.pk]
+
+
+@pytest.mark.django_db
+class TestQueuedCalendarSync:
+    @pytest.fixture(autouse=True)
+    def queued(self, settings):
+        settings.HOMELIFE_CALENDAR_SYNC = {'EAGER': False, 'DEBOUNCE': 2}
+        cache.clear()
+        yield
+        cache.clear()
+
+    def test_sync_waits_for_commit(self, household):
+        chore = Chore.objects.create(household=household, title='Trash')
+        assert not events_for(chore).exists()
+
+    def test_burst_of_saves_runs_one_sync_with_the_latest_state(self, household, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            chore = Chore.objects.create(household=household, title='Trash')
+            for n in range(10):
+                chore.description = f'Edit {n}'
+                chore.save()
+        assert len(callbacks) == 1
+        assert list(events_for(chore).values_list('description', flat=True)) == ['Edit 9']
+
+    def test_saves_after_the_sync_queue_again(self, household, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            chore = Chore.objects.create(household=household, title='Trash')
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            chore.title = 'Recycling'
+            chore.save()
+        assert len(callbacks) == 1
+        assert events_for(chore).get().title == 'Chore: Recycling'
+
+    def test_rolled_back_save_leaves_no_marker(self, household, django_capture_on_commit_callbacks):
+        chore = Chore.objects.bulk_create([Chore(household=household, title='Trash')])[0]
+        ct = ContentType.objects.get_for_model(Chore)
+        with pytest.raises(RuntimeError), transaction.atomic():
+            chore.title = 'Lost'
+            chore.save()
+            raise RuntimeError
+        assert cache.get(_sync_cache_key(ct.pk, chore.pk)) is None
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            chore.title = 'Kept'
+            chore.save()
+        assert len(callbacks) == 1
+        assert events_for(chore).get().title == 'Chore: Kept'
+
+    def test_queued_sync_of_a_deleted_source_clears_its_events(self, daily_chore):
+        ct = ContentType.objects.get_for_model(Chore)
+        pk = daily_chore.pk
+        Chore.objects.filter(pk=pk).delete()
+        SharedCalendarEvent.objects.create(household=daily_chore.household, title='Stale',
+                                           start_datetime=timezone.now(), end_datetime=timezone.now(),
+                                           source_content_type=ct, source_object_id=pk)
+        assert sync_calendar_source(ct.pk, pk) is None
+        assert not SharedCalendarEvent.objects.filter(source_content_type=ct, source_object_id=pk).exists()
+
+    def test_bulk_writes_queue_one_sync_for_all_rows(self, household, django_capture_on_commit_callbacks):
+        chores = Chore.objects.bulk_create(Chore(household=household, title=f'Chore {n}') for n in range(3))
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            CalendarEventService.schedule_sync_many(chores)
+            CalendarEventService.schedule_sync_many(chores)
+        assert len(callbacks) == 1
+        assert SharedCalendarEvent.objects.filter(source_object_id__in=[c.pk for c in chores]).count() == 3
@@ -0,0 +1,96 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from homelife.models import Chore, MealPlan, SharedCalendarEvent
+from homelife.types import ChoreFrequency, MealType
+from homelife.views.shared_calendar_event_views import SharedCalendarEventViewSet
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(username='member', password='pass12345')
+
+
+def call(household, user, method='get', action='window', data=None, pk=None, **headers):
+    factory = APIRequestFactory()
+    if method == 'get':
+        request = factory.get('/', data or {}, **headers)
+    else:
+        request = getattr(factory, method)('/', data or {}, format='json')
+    force_authenticate(request, user=user)
+    view = SharedCalendarEventViewSet.as_view({method: action})
+    kwargs = {'household_pk': household.pk}
+    if pk is not None:
+        kwargs['pk'] = pk
+    return view(request, **kwargs)
+
+
+@pytest.mark.django_db
+class TestCalendarWindow:
+    @pytest.fixture
+    def today(self, household):
+        today = timezone.localdate()
+        start = timezone.make_aware(datetime.combine(today, time(9)))
+        Chore.objects.create(household=household, title='Dishes', frequency=ChoreFrequency.DAILY,
+                             available_from=start)
+        MealPlan.objects.create(household=household, date=today + timedelta(days=1),
+                                meal_type=MealType.DINNER, recipe_name='Tacos')
+        return today
+
+    def test_events_are_grouped_per_day_with_source_counts(self, household, user, today):
+        response = call(household, user, data={'start': today.isoformat(),
+                                               'end': (today + timedelta(days=2)).isoformat()})
+        assert response.status_code == 200
+        data = response.data
+        assert [d['date'] for d in data['days']] == [today + timedelta(days=n) for n in range(3)]
+        assert [d['count'] for d in data['days']] == [1, 2, 1]
+        assert data['days'][1]['by_source'] == {'chore': 1, 'mealplan': 1}
+        assert data['by_source'] == {'chore': 3, 'mealplan': 1} and data['count'] == 4
+        assert response['ETag']
+
+    def test_unchanged_calendar_answers_304_without_reading_events(self, household, user, today):
+        etag = call(household, user)['ETag']
+        with CaptureQueriesContext(connection) as ctx:
+            response = call(household, user, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+        assert not [q for q in ctx.captured_queries if 'homelife_sharedcalendarevent' in q['sql']]
+
+    def test_event_writes_change_the_etag(self, household, user, today):
+        etag = call(household, user)['ETag']
+        now = timezone.now()
+        created = call(household, user, method='post', action='create', data={
+            'household': household.pk, 'title': 'Dentist',
+            'start_datetime': now.isoformat(), 'end_datetime': (now + timedelta(hours=1)).isoformat(),
+        })
+        assert created.status_code == 201
+        second = call(household, user, HTTP_IF_NONE_MATCH=etag)
+        assert second.status_code == 200 and second['ETag'] != etag
+
+        deleted = call(household, user, method='delete', action='destroy', pk=created.data['id'])
+        assert deleted.status_code == 204
+        assert call(household, user, HTTP_IF_NONE_MATCH=second['ETag']).status_code == 200
+
+    def test_source_syncs_change_the_etag(self, household, user, today):
+        etag = call(household, user)['ETag']
+        chore = Chore.objects.get(household=household)
+        chore.title = 'Laundry'
+        chore.save()
+        assert call(household, user, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        household.refresh_from_db()
+        unchanged = household.calendar_version
+        chore.save()
+        household.refresh_from_db()
+        assert household.calendar_version == unchanged
+        assert not SharedCalendarEvent.objects.filter(title='Chore: Dishes').exists()
+
+    def test_invalid_range_is_rejected(self, household, user):
+        today = timezone.localdate()
+        assert call(household, user, data={'start': 'soon'}).status_code == 400
+        assert call(household, user, data={'start': today.isoformat(),
+                                           'end': (today - timedelta(days=1)).isoformat()}).status_code == 400
@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from homelife.models import Chore, ChoreCompletion, ChoreWeeklyStats
+from homelife.services.chore_stats_service import ChoreStatsService
+from homelife.views.household_views import HouseholdViewSet
+
+
+@pytest.fixture
+def members(household, django_user_model):
+    profiles = []
+    for name in ('alex', 'sam'):
+        homelife_profile = django_user_model.objects.create_user(username=name, password='pass12345') \
+            .profile.homelife_profile
+        homelife_profile.household = household
+        homelife_profile.save()
+        profiles.append(homelife_profile)
+    return profiles
+
+
+@pytest.fixture
+def chore(household):
+    return Chore.objects.create(household=household, title='Dishes')
+
+
+def complete(chore, member, weeks_ago=0, points=10, on_time=True):
+    return ChoreCompletion.objects.create(
+        chore=chore, homelife_profile=member, points=points, is_on_time=on_time,
+        completed_at=timezone.now() - timedelta(weeks=weeks_ago),
+    )
+
+
+def snapshot():
+    return sorted(ChoreWeeklyStats.objects.values_list(
+        'homelife_profile_id', 'week_start', 'completions', 'on_time', 'points', 'streak'))
+
+
+@pytest.mark.django_db
+class TestChoreStats:
+    def test_completions_update_the_weekly_row(self, household, members, chore):
+        alex, sam = members
+        complete(chore, alex)
+        complete(chore, alex, on_time=False, points=5)
+        complete(chore, sam, points=20)
+        stats = ChoreStatsService.household_stats(household.pk)
+        assert [m['username'] for m in stats['members']] == ['sam', 'alex']
+        alex_stats = stats['members'][1]
+        assert (alex_stats['completions'], alex_stats['on_time'], alex_stats['points']) == (2, 1, 15)
+        assert alex_stats['on_time_rate'] == 0.5
+        assert stats['completions'] == 3 and stats['points'] == 35
+
+    def test_streaks_follow_consecutive_weeks(self, household, members, chore):
+        alex, _ = members
+        for weeks_ago in (4, 2, 1, 0):
+            complete(chore, alex, weeks_ago=weeks_ago)
+        (alex_stats,) = ChoreStatsService.household_stats(household.pk)['members']
+        assert alex_stats['streak'] == 3
+        complete(chore, alex, weeks_ago=3)
+        assert ChoreStatsService.household_stats(household.pk)['members'][0]['streak'] == 5
+
+    def test_deleting_a_weeks_only_completion_breaks_the_streak(self, household, members, chore):
+        alex, _ = members
+        middle = [complete(chore, alex, weeks_ago=w) for w in (2, 1, 0)][1]
+        middle.delete()
+        assert ChoreStatsService.household_stats(household.pk)['members'][0]['streak'] == 1
+        assert ChoreWeeklyStats.objects.count() == 2
+
+    def test_deleting_a_completion_without_a_stats_row_is_a_no_op(self, household, members, chore):
+        alex, _ = members
+        older = complete(chore, alex, weeks_ago=1)
+        complete(chore, alex)
+        ChoreWeeklyStats.objects.filter(week_start=ChoreStatsService.week_start(older.completed_at)).delete()
+        before = snapshot()
+        older.delete()
+        assert snapshot() == before
+
+    def test_edits_move_points_between_weeks(self, household, members, chore):
+        alex, _ = members
+        completion = complete(chore, alex, points=10)
+        completion.points = 30
+        completion.completed_at -= timedelta(weeks=1)
+        completion.save()
+        assert snapshot() == [
+            (alex.pk, ChoreStatsService.week_start(completion.completed_at), 1, 1, 30, 1),
+        ]
+
+    def test_rebuild_matches_incremental_maintenance(self, household, members, chore):
+        alex, sam = members
+        for weeks_ago, member, points in ((5, alex, 3), (4, alex, 4), (4, sam, 7), (1, sam, 2), (0, sam, 1)):
+            complete(chore, member, weeks_ago=weeks_ago, points=points, on_time=points % 2 == 0)
+        incremental = snapshot()
+        ChoreWeeklyStats.objects.all().delete()
+        call_command('rebuild_chore_stats')
+        assert snapshot() == incremental
+
+    def test_stats_endpoint_reads_only_the_aggregate(self, household, members, chore):
+        alex, _ = members
+        for _ in range(20):
+            complete(chore, alex)
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, user=alex.profile.user)
+        view = HouseholdViewSet.as_view({'get': 'chore_stats'})
+        with CaptureQueriesContext(connection) as ctx:
+            response = view(request, pk=household.pk, homelife_profile_pk=alex.pk)
+        assert response.status_code == 200
+        assert response.data['members'][0]['completions'] == 20
+        assert not [q for q in ctx.captured_queries if 'homelife_chorecompletion' in q['sql']]
@@ -0,0 +1,87 @@
+from datetime import time
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from homelife.models import Pet, SharedCalendarEvent
+from homelife.serializers.pet_serializer import PetSerializer
+from homelife.services.calendar_event_service import CalendarEventService
+from homelife.utils.care_times import minutes_to_strings, parse_minutes
+
+
+class TestParseMinutes:
+    def test_accepts_strings_times_and_minutes(self):
+        assert parse_minutes(['18:00:00', '07:30', time(12, 15), 60]) == [60, 450, 735, 1080]
+
+    def test_sorts_and_drops_duplicates(self):
+        assert parse_minutes(['08:00', '07:00:00', '08:00:00']) == [420, 480]
+
+    @pytest.mark.parametrize('value', [
+        ['25:00'], ['7pm'], ['07:60:00'], ['07:30:15'], [time(7, 30, 15)], [1440], [True], '07:00',
+    ])
+    def test_rejects_invalid_times(self, value):
+        with pytest.raises(ValueError):
+            parse_minutes(value)
+
+    def test_legacy_values_are_truncated_to_the_minute(self):
+        assert parse_minutes(['07:30:15', time(7, 31, 59)], strict=False) == [450, 451]
+
+    def test_canonical_strings(self):
+        assert minutes_to_strings([5, 1439]) == ['00:05:00', '23:59:00']
+
+
+@pytest.mark.django_db
+class TestPetCareTimes:
+    def test_save_stores_minutes_and_canonical_strings(self, household):
+        pet = Pet.objects.create(household=household, name='Rex', pet_type='Dog',
+                                 food_frequency='DAILY', food_times=['18:00', '07:00:00'])
+        pet.refresh_from_db()
+        assert pet.food_minutes == [420, 1080]
+        assert pet.food_times == ['07:00:00', '18:00:00']
+        assert pet.food_time_objs == [time(7), time(18)]
+
+    def test_update_fields_include_the_minutes(self, household):
+        pet = Pet.objects.create(household=household, name='Rex', pet_type='Dog')
+        pet.water_times = ['09:00']
+        pet.save(update_fields=['water_times'])
+        pet.refresh_from_db()
+        assert pet.water_minutes == [540]
+
+    def test_invalid_time_is_rejected_on_save(self, household):
+        with pytest.raises(ValidationError) as exc:
+            Pet.objects.create(household=household, name='Rex', pet_type='Dog', food_times=['7pm'])
+        assert 'food_times' in exc.value.message_dict
+
+    def test_serializer_reports_invalid_times(self, household):
+        serializer = PetSerializer(data={'household': household.pk, 'name': 'Rex', 'pet_type': 'Dog',
+                                         'medication_times': ['24:00']})
+        assert not serializer.is_valid()
+        assert 'medication_times' in serializer.errors
+
+    def test_serializer_rejects_seconds_but_stored_seconds_are_truncated(self, household):
+        serializer = PetSerializer(data={'household': household.pk, 'name': 'Rex', 'pet_type': 'Dog',
+                                         'food_times': ['07:30:15']})
+        assert not serializer.is_valid()
+        assert 'to the minute' in str(serializer.errors['food_times'][0])
+        pet = Pet.objects.create(household=household, name='Rex', pet_type='Dog', food_times=['07:30:15'])
+        assert (pet.food_minutes, pet.food_times) == ([450], ['07:30:00'])
+
+    def test_backfill_migration_keeps_the_stored_strings(self, household):
+        pet = Pet.objects.create(household=household, name='Rex', pet_type='Dog')
+        Pet.objects.filter(pk=pet.pk).update(food_times=['18:00', 'soon', '07:30:15'], food_minutes=[])
+        import_module('homelife.migrations.0012_pet_care_minutes').fill_care_minutes(apps, None)
+        pet.refresh_from_db()
+        assert pet.food_minutes == [450, 1080]
+        assert pet.food_times == ['18:00', 'soon', '07:30:15']
+
+    def test_calendar_events_use_the_stored_minutes(self, household):
+        pet = Pet.objects.create(household=household, name='Rex', pet_type='Dog',
+                                 food_frequency='DAILY', food_times=['07:30', '18:00'])
+        Pet.objects.filter(pk=pet.pk).update(food_times=['not a time'])  # strings are not re-parsed
+        pet.refresh_from_db()
+        CalendarEventService.sync(pet)
+        events = SharedCalendarEvent.objects.filter(source_object_id=pet.pk, title='Feed: Rex')
+        assert sorted(timezone.localtime(e.start_datetime).time() for e in events) == [time(7, 30), time(18)]
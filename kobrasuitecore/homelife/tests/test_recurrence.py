@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from homelife.models import Chore, SharedCalendarEvent
+from homelife.types import ChoreFrequency, DaysOfTheWeek, RecurrenceFrequency
+from homelife.utils.recurrence import first_on_weekday, occurrence_array, occurrences
+from homelife.views.shared_calendar_event_views import SharedCalendarEventViewSet
+
+START = datetime(2025, 1, 1, 9, tzinfo=dt_timezone.utc)  # a Wednesday
+HOUR = timedelta(hours=1)
+
+
+class TestOccurrences:
+    def test_one_off_only_yields_the_start_when_in_window(self):
+        assert occurrences(START, HOUR, START - HOUR, START + HOUR) == [START]
+        assert occurrences(START, HOUR, START + 2 * HOUR, START + 3 * HOUR) == []
+
+    def test_daily_with_interval_and_window(self):
+        starts = occurrences(START, HOUR, START + timedelta(days=3), START + timedelta(days=9),
+                             frequency=RecurrenceFrequency.DAILY, interval=2)
+        assert [s.day for s in starts] == [5, 7, 9]
+
+    def test_weekly_by_weekday_skips_days_before_the_start(self):
+        starts = occurrences(START, HOUR, START, START + timedelta(days=13),
+                             frequency=RecurrenceFrequency.WEEKLY,
+                             byweekday=[DaysOfTheWeek.MONDAY, DaysOfTheWeek.FRIDAY])
+        assert [s.day for s in starts] == [3, 6, 10, 13]
+
+    def test_monthly_keeps_the_day_of_month(self):
+        starts = occurrences(START, HOUR, START, START + timedelta(days=100),
+                             frequency=RecurrenceFrequency.MONTHLY)
+        assert [(s.month, s.day) for s in starts] == [(1, 1), (2, 1), (3, 1), (4, 1)]
+
+    def test_until_and_count_bound_the_series(self):
+        daily = dict(frequency=RecurrenceFrequency.DAILY)
+        window = (START, START + timedelta(days=30))
+        assert len(occurrences(START, HOUR, *window, until=START + timedelta(days=4), **daily)) == 5
+        assert len(occurrences(START, HOUR, *window, count=3, **daily)) == 3
+
+    def test_occurrence_overlapping_the_window_start_is_included(self):
+        starts = occurrences(START, 3 * HOUR, START + timedelta(days=1, hours=2), START + timedelta(days=1, hours=5),
+                             frequency=RecurrenceFrequency.DAILY)
+        assert starts == [START + timedelta(days=1)]
+
+
+    def test_window_far_from_the_start_is_computed_directly(self):
+        far = START + timedelta(weeks=520)
+        starts = occurrences(START, HOUR, far, far + timedelta(days=14),
+                             frequency=RecurrenceFrequency.WEEKLY, interval=2,
+                             byweekday=[DaysOfTheWeek.MONDAY, DaysOfTheWeek.WEDNESDAY])
+        assert starts == [far, far + timedelta(days=12), far + timedelta(days=14)]
+
+    def test_count_is_applied_to_a_window_past_the_prefix(self):
+        daily = dict(frequency=RecurrenceFrequency.DAILY, byweekday=[DaysOfTheWeek.MONDAY])
+        window = (START + timedelta(days=20), START + timedelta(days=60))
+        assert [s.day for s in occurrences(START, HOUR, *window, count=4, **daily)] == [27]
+        assert occurrences(START, HOUR, *window, count=3, **daily) == []
+
+    def test_weekday_filter_that_never_matches_yields_nothing(self):
+        assert occurrences(START, HOUR, START, START + timedelta(days=365),
+                           frequency=RecurrenceFrequency.DAILY, interval=7,
+                           byweekday=[DaysOfTheWeek.MONDAY]) == []
+
+    def test_first_on_weekday(self):
+        assert first_on_weekday(START, [DaysOfTheWeek.WEDNESDAY]) == START
+        assert first_on_weekday(START, [DaysOfTheWeek.TUESDAY, DaysOfTheWeek.FRIDAY]) == START + timedelta(days=2)
+        assert first_on_weekday(START, []) == START
+
+
+class TestOccurrenceArray:
+    @pytest.mark.parametrize('rule', [
+        dict(),
+        dict(frequency=RecurrenceFrequency.DAILY, interval=3),
+        dict(frequency=RecurrenceFrequency.DAILY, byweekday=[DaysOfTheWeek.SATURDAY, DaysOfTheWeek.SUNDAY]),
+        dict(frequency=RecurrenceFrequency.WEEKLY, byweekday=[DaysOfTheWeek.MONDAY, DaysOfTheWeek.FRIDAY],
+             count=9),
+        dict(frequency=RecurrenceFrequency.WEEKLY, interval=2, until=START + timedelta(days=200)),
+    ])
+    def test_matches_occurrences(self, rule):
+        window = (START + timedelta(days=10), START + timedelta(days=400))
+        expected = [np.datetime64(s.replace(tzinfo=None), 'us') for s in occurrences(START, HOUR, *window, **rule)]
+        assert occurrence_array(START, HOUR, *window, **rule).tolist() == [e.tolist() for e in expected]
+
+    def test_monthly_rules_are_not_vectorized(self):
+        with pytest.raises(ValueError):
+            occurrence_array(START, HOUR, START, START + timedelta(days=60), frequency=RecurrenceFrequency.MONTHLY)
+
+
+@pytest.mark.django_db
+class TestCalendarEventList:
+    def list_events(self, household, user, **params):
+        request = APIRequestFactory().get('/', params)
+        force_authenticate(request, user=user)
+        view = SharedCalendarEventViewSet.as_view({'get': 'list'})
+        return view(request, household_pk=household.pk)
+
+    @pytest.fixture
+    def user(self, django_user_model):
+        return django_user_model.objects.create_user(username='member', password='pass12345')
+
+    def test_series_are_expanded_for_the_requested_window(self, household, user):
+        start = timezone.now().replace(microsecond=0)
+        chore = Chore.objects.create(household=household, title='Dishes', frequency=ChoreFrequency.DAILY,
+                                     available_from=start)
+        SharedCalendarEvent.objects.create(household=household, title='Dentist',
+                                           start_datetime=start + timedelta(days=2, hours=1),
+                                           end_datetime=start + timedelta(days=2, hours=2))
+        response = self.list_events(household, user, start_datetime=start.isoformat(),
+                                    end_datetime=(start + timedelta(days=4, minutes=30)).isoformat())
+        assert response.status_code == 200
+        titles = [e['title'] for e in response.data['results']]
+        assert titles == ['Chore: Dishes'] * 3 + ['Dentist'] + ['Chore: Dishes'] * 2
+        assert {e['recurrence_frequency'] for e in response.data['results'][:3]} == {'DAILY'}
+        assert SharedCalendarEvent.objects.filter(source_object_id=chore.pk).count() == 1
+
+    def test_default_window_is_the_next_ninety_days(self, household, user):
+        Chore.objects.create(household=household, title='Dishes', frequency=ChoreFrequency.DAILY,
+                             available_from=timezone.now() - timedelta(days=10))
+        response = self.list_events(household, user)
+        assert response.data['count'] in (90, 91)
+
+    def test_invalid_window_is_rejected(self, household, user):
+        assert self.list_events(household, user, start='soon').status_code == 400
@@ -4,7 +4,8 @@ File Name: homelife_types.py
 Path: kobrasuitecore/homelife/types.py
 
 Description:
-Defines enumerated text choices for household types, chore frequencies, and meal types.
+Defines enumerated text choices for household types, chore frequencies, meal types, and
+calendar recurrence frequencies.
 These choices help maintain consistent references and validations across the homelife app.
 
 Input:
@@ -48,3 +49,9 @@ class DaysOfTheWeek(models.TextChoices):
     FRIDAY = 'FRIDAY', 'Friday'
     SATURDAY = 'SATURDAY', 'Saturday'
     SUNDAY = 'SUNDAY', 'Sunday'
+
+
+class RecurrenceFrequency(models.TextChoices):
+    DAILY = 'DAILY', 'Daily'
+    WEEKLY = 'WEEKLY', 'Weekly'
+    MONTHLY = 'MONTHLY', 'Monthly'
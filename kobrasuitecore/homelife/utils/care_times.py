@@ -0,0 +1,63 @@
+"""
+------------------Prologue--------------------
+File Name: care_times.py
+Path: kobrasuitecore/homelife/utils/care_times.py
+
+Description:
+Parses pet care times ("HH:MM" or "HH:MM:SS" strings, or time objects) into sorted, de-duplicated
+minutes-since-midnight integers, the form Pet stores alongside its JSON time lists so the calendar
+sync never re-parses strings. Times are kept to the minute: client input with non-zero seconds is
+rejected rather than silently dropped, while already stored values are parsed leniently.
+
+Input:
+Lists of care times as sent by clients.
+
+Output:
+Lists of minutes since midnight, canonical "HH:MM:SS" strings, and time objects.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+from datetime import time
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _minutes(value, strict=True):
+    if isinstance(value, time):
+        if strict and (value.second or value.microsecond):
+            raise ValueError(f'Care times are stored to the minute: {value.isoformat()!r} has seconds.')
+        return value.hour * 60 + value.minute
+    if isinstance(value, int) and not isinstance(value, bool) and 0 <= value < MINUTES_PER_DAY:
+        return value
+    if isinstance(value, str):
+        parts = value.strip().split(':')
+        if len(parts) in (2, 3) and all(p.isdigit() and len(p) <= 2 for p in parts):
+            hour, minute = int(parts[0]), int(parts[1])
+            second = int(parts[2]) if len(parts) == 3 else 0
+            if hour < 24 and minute < 60 and second < 60:
+                if strict and second:
+                    raise ValueError(f'Care times are stored to the minute: {value!r} has seconds.')
+                return hour * 60 + minute
+    raise ValueError(f'Invalid time: {value!r}')
+
+
+def parse_minutes(values, strict=True):
+    """
+    Returns the sorted, unique minutes-since-midnight of `values`. Raises ValueError
+    for anything that is not a valid time of day, or that has non-zero seconds unless
+    `strict` is off (for stored legacy values, which are truncated to the minute).
+    """
+    if values is None:
+        return []
+    if not isinstance(values, (list, tuple)):
+        raise ValueError('Times must be a list.')
+    return sorted({_minutes(v, strict) for v in values})
+
+
+def minutes_to_time(minutes):
+    return time(minutes // 60, minutes % 60)
+
+
+def minutes_to_strings(minutes):
+    return [f'{m // 60:02d}:{m % 60:02d}:00' for m in minutes]
@@ -0,0 +1,216 @@
+"""
+------------------Prologue--------------------
+File Name: recurrence.py
+Path: kobrasuitecore/homelife/utils/recurrence.py
+
+Description:
+Expands RRULE-style recurrence rules (frequency, interval, weekdays, until, count) stored on
+SharedCalendarEvent series rows into concrete occurrences for a requested time window, so
+recurring chores, workouts, medications and pet care are stored once per series and expanded
+at query time. Daily and weekly rules are treated as a fixed period with fixed offsets, so the
+occurrences inside a window are computed directly instead of stepping from the first one; the same
+arithmetic is available vectorized over NumPy datetime64 arrays.
+
+Input:
+A series' first start, duration and recurrence fields, plus a [start, end] window.
+
+Output:
+Occurrence start datetimes, or unsaved SharedCalendarEvent copies for each occurrence.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import copy
+from datetime import timedelta, timezone as dt_timezone
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from homelife.types import DaysOfTheWeek, RecurrenceFrequency
+
+WEEKDAY_INDEX = {v: i for i, v in enumerate(DaysOfTheWeek.values)}
+DAY = timedelta(days=1)
+
+
+def _weekdays(byweekday):
+    return sorted({WEEKDAY_INDEX[d] for d in byweekday or [] if d in WEEKDAY_INDEX})
+
+
+def first_on_weekday(moment, byweekday):
+    """
+    Returns the first datetime on or after `moment`, at the same time of day, that falls
+    on one of `byweekday`; `moment` itself when no weekdays are given.
+    """
+    days = _weekdays(byweekday)
+    if not days:
+        return moment
+    return moment + DAY * min((day - moment.weekday()) % 7 for day in days)
+
+
+def _period(dtstart, frequency, interval, byweekday):
+    """
+    Describes a daily or weekly rule as a period and the sorted offsets of its
+    occurrences within each period, so occurrence (k, i) starts at
+    dtstart + k * period + offsets[i]. Offsets may be negative in the first week of a
+    weekly rule; those occurrences fall before dtstart and are not part of the series.
+    Returns None for other frequencies.
+    """
+    interval = max(interval or 1, 1)
+    days = _weekdays(byweekday)
+    if frequency == RecurrenceFrequency.DAILY:
+        if not days:
+            return DAY * interval, [timedelta(0)]
+        return DAY * 7 * interval, [
+            DAY * interval * j for j in range(7) if (dtstart.weekday() + interval * j) % 7 in days
+        ]
+    if frequency == RecurrenceFrequency.WEEKLY:
+        if not days:
+            return DAY * 7 * interval, [timedelta(0)]
+        return DAY * 7 * interval, [DAY * (day - dtstart.weekday()) for day in days]
+    return None
+
+
+def _periods_in(dtstart, period, offsets, first, last):
+    """
+    The inclusive range of periods that can hold an occurrence starting in [first, last].
+    """
+    low = max(0, (first - dtstart - offsets[-1]) // period)
+    high = (last - dtstart - offsets[0]) // period
+    return low, high
+
+
+def _window_bounds(dtstart, duration, window_start, window_end, until):
+    # An occurrence overlaps the window when it starts in [window_start - duration, window_end].
+    last = window_end if until is None else min(window_end, until)
+    return max(window_start - duration, dtstart), last
+
+
+def occurrences(dtstart, duration, window_start, window_end, frequency='', interval=1,
+                byweekday=None, until=None, count=None):
+    """
+    Returns the starts of every occurrence overlapping [window_start, window_end],
+    i.e. starting no later than window_end and ending no earlier than window_start.
+    The first occurrence in the window is computed directly, so the cost depends on the
+    window and not on how far it lies from dtstart.
+    """
+    if count is not None and count <= 0:
+        return []
+    first, last = _window_bounds(dtstart, duration, window_start, window_end, until)
+    if first > last:
+        return []
+    if not frequency:
+        return [dtstart] if dtstart >= first else []
+    if frequency == RecurrenceFrequency.MONTHLY:
+        return _monthly(dtstart, max(interval or 1, 1), first, last, count)
+    plan = _period(dtstart, frequency, interval, byweekday)
+    if plan is None or not plan[1]:
+        return []
+    period, offsets = plan
+    skipped = sum(1 for offset in offsets if offset < timedelta(0))
+    low, high = _periods_in(dtstart, period, offsets, first, last)
+    starts = []
+    for k in range(low, high + 1):
+        for i, offset in enumerate(offsets):
+            if k == 0 and i < skipped:
+                continue
+            if count is not None and k * len(offsets) + i - skipped >= count:
+                return starts
+            current = dtstart + period * k + offset
+            if current > last:
+                return starts
+            if current >= first:
+                starts.append(current)
+    return starts
+
+
+def _monthly(dtstart, interval, first, last, count):
+    months = (first.year - dtstart.year) * 12 + first.month - dtstart.month
+    k = max(0, months // interval - 1)
+    starts = []
+    while count is None or k < count:
+        current = dtstart + relativedelta(months=k * interval)
+        if current > last:
+            break
+        if current >= first:
+            starts.append(current)
+        k += 1
+    return starts
+
+
+def _as_utc64(moment):
+    return np.datetime64(moment.astimezone(dt_timezone.utc).replace(tzinfo=None), 'us')
+
+
+def occurrence_array(dtstart, duration, window_start, window_end, frequency='', interval=1,
+                     byweekday=None, until=None, count=None):
+    """
+    Same as occurrences() for one-off, daily and weekly rules, but computed with NumPy
+    and returned as a sorted datetime64[us] array of UTC starts, for callers that
+    aggregate many occurrences without needing datetime objects.
+    """
+    if frequency and frequency not in (RecurrenceFrequency.DAILY, RecurrenceFrequency.WEEKLY):
+        raise ValueError(f'occurrence_array does not support {frequency!r} rules.')
+    empty = np.array([], dtype='datetime64[us]')
+    if count is not None and count <= 0:
+        return empty
+    first, last = _window_bounds(dtstart, duration, window_start, window_end, until)
+    if first > last:
+        return empty
+    origin = _as_utc64(dtstart)
+    if not frequency:
+        return np.array([origin]) if dtstart >= first else empty
+    period, offsets = _period(dtstart, frequency, interval, byweekday)
+    if not offsets:
+        return empty
+    skipped = sum(1 for offset in offsets if offset < timedelta(0))
+    low, high = _periods_in(dtstart, period, offsets, first, last)
+    if high < low:
+        return empty
+    ks = np.arange(low, high + 1, dtype=np.int64)[:, None]
+    index = np.arange(len(offsets), dtype=np.int64)[None, :]
+    step = np.timedelta64(period, 'us')
+    shift = np.array(offsets, dtype='timedelta64[us]')[None, :]
+    grid = origin + ks * step + shift
+    ordinal = ks * len(offsets) + index - skipped
+    mask = (ordinal >= 0) & (grid >= _as_utc64(first)) & (grid <= _as_utc64(last))
+    if count is not None:
+        mask &= ordinal < count
+    return grid[mask]
+
+
+def expand_event(event, window_start, window_end):
+    """
+    Returns unsaved copies of a SharedCalendarEvent, one per occurrence in the window.
+    One-off events come back as themselves when they overlap the window.
+    """
+    duration = event.end_datetime - event.start_datetime
+    starts = occurrences(
+        event.start_datetime,
+        duration,
+        window_start,
+        window_end,
+        frequency=event.recurrence_frequency,
+        interval=event.recurrence_interval,
+        byweekday=event.recurrence_byweekday,
+        until=event.recurrence_until,
+        count=event.recurrence_count,
+    )
+    if not event.recurrence_frequency:
+        return [event] if starts else []
+    expanded = []
+    for start in starts:
+        occurrence = copy.copy(event)
+        occurrence.start_datetime = start
+        occurrence.end_datetime = start + duration
+        expanded.append(occurrence)
+    return expanded
+
+
+def expand_events(events, window_start, window_end):
+    """
+    Expands series and passes one-off events through, returning every occurrence in
+    the window sorted by start time.
+    """
+    expanded = [o for e in events for o in expand_event(e, window_start, window_end)]
+    expanded.sort(key=lambda e: (e.start_datetime, e.pk or 0))
+    return expanded
@@ -0,0 +1,109 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from homelife.services.calendar_event_service import SOURCE_MODELS, CalendarEventService
+
+MAX_BULK_ITEMS = 500
+
+
+class BulkOperationsMixin:
+    """
+    Adds list endpoints to a nested ModelViewSet:
+      POST  .../bulk_create/   [{...}, ...]
+      PATCH .../bulk_update/   [{"id": 1, ...}, ...]
+      POST  .../bulk_delete/   {"ids": [1, 2, ...]}
+    Each request validates the whole payload, writes it with bulk_create / bulk_update /
+    one delete in a single transaction and, for calendar sources, triggers one calendar
+    sync for all affected rows instead of one per row.
+
+    Viewsets provide get_bulk_save_kwargs() (the fields perform_create would pass to
+    save) and may override validate_bulk_item(attrs) for per-item checks.
+    """
+
+    def get_bulk_save_kwargs(self):
+        return {}
+
+    def validate_bulk_item(self, attrs):
+        pass
+
+    def _bulk_payload(self, data):
+        if not isinstance(data, list) or not data:
+            raise ValidationError({'detail': 'Expected a non-empty list.'})
+        if len(data) > MAX_BULK_ITEMS:
+            raise ValidationError({'detail': f'At most {MAX_BULK_ITEMS} items per request.'})
+        return data
+
+    def _bulk_model(self):
+        return self.get_serializer_class().Meta.model
+
+    def _sync_calendar(self, instances):
+        if issubclass(self._bulk_model(), SOURCE_MODELS):
+            CalendarEventService.schedule_sync_many(instances)
+
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=self._bulk_payload(request.data), many=True)
+        serializer.is_valid(raise_exception=True)
+        save_kwargs = self.get_bulk_save_kwargs()
+        model = self._bulk_model()
+        for attrs in serializer.validated_data:
+            self.validate_bulk_item(attrs)
+        instances = [model(**{**attrs, **save_kwargs}) for attrs in serializer.validated_data]
+        with transaction.atomic():
+            model.objects.bulk_create(instances)
+            self._sync_calendar(instances)
+        return Response(self.get_serializer(instances, many=True).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['patch'])
+    def bulk_update(self, request, *args, **kwargs):
+        payload = self._bulk_payload(request.data)
+        ids = [item.get('id') if isinstance(item, dict) else None for item in payload]
+        if None in ids or len(set(ids)) != len(ids):
+            raise ValidationError({'detail': 'Every item needs a unique "id".'})
+        instances = self.get_queryset().in_bulk(ids)
+        missing = [pk for pk in ids if pk not in instances]
+        if missing:
+            raise ValidationError({'detail': f'Not found: {missing}'})
+
+        serializers = [self.get_serializer(instances[pk], data=item, partial=True) for pk, item in zip(ids, payload)]
+        errors = [{} if serializer.is_valid() else serializer.errors for serializer in serializers]
+        if any(errors):
+            raise ValidationError(errors)
+
+        fields, changed = set(), []
+        for serializer in serializers:
+            self.validate_bulk_item(serializer.validated_data)
+            for field, value in serializer.validated_data.items():
+                setattr(serializer.instance, field, value)
+            fields.update(serializer.validated_data)
+            changed.append(serializer.instance)
+
+        model = self._bulk_model()
+        now = timezone.now()
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                fields.add(field.name)
+                for instance in changed:
+                    setattr(instance, field.attname, now)
+        with transaction.atomic():
+            if fields:
+                model.objects.bulk_update(changed, sorted(fields))
+            self._sync_calendar(changed)
+        return Response(self.get_serializer(changed, many=True).data)
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request, *args, **kwargs):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        self._bulk_payload(ids)
+        queryset = self.get_queryset().filter(pk__in=ids)
+        model = self._bulk_model()
+        with transaction.atomic(), CalendarEventService.signals_deferred():
+            found = list(queryset.values_list('pk', flat=True))
+            queryset.delete()
+            if issubclass(model, SOURCE_MODELS):
+                CalendarEventService.delete_many(model, found)
+        return Response({'deleted': len(found)})
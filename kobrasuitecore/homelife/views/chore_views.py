@@ -1,14 +1,17 @@
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets
 from rest_framework.exceptions import ValidationError
 
 from homelife.models import Chore, Household
 from homelife.serializers.chore_serializer import ChoreSerializer
+from homelife.views.bulk_operations import BulkOperationsMixin
 
 
-class ChoreViewSet(viewsets.ModelViewSet):
+class ChoreViewSet(BulkOperationsMixin, viewsets.ModelViewSet):
     """
     Nested under household_router:
     e.g. /.../households/<household_pk>/chores/
+    Also /chores/bulk_create/, /chores/bulk_update/ and /chores/bulk_delete/.
     """
     serializer_class = ChoreSerializer
 
@@ -16,14 +19,19 @@ class ChoreViewSet(viewsets.ModelViewSet):
         household_id = self.kwargs.get('household_pk')
         return Chore.objects.filter(household_id=household_id)
 
-    def perform_create(self, serializer):
+    def validate_bulk_item(self, attrs):
         hh_pk = self.kwargs['household_pk']
-        child = serializer.validated_data.get('child_assigned_to')
-        adult = serializer.validated_data.get('assigned_to')
+        child = attrs.get('child_assigned_to')
+        adult = attrs.get('assigned_to')
 
         if adult and adult.household_id != int(hh_pk):
             raise ValidationError("Adult assignee not in this household.")
         if child and child.parent_profile.household_id != int(hh_pk):
             raise ValidationError("Child assignee not in this household.")
 
-        serializer.save(household_id=hh_pk)
\ No newline at end of file
+    def get_bulk_save_kwargs(self):
+        return {'household': get_object_or_404(Household, pk=self.kwargs['household_pk'])}
+
+    def perform_create(self, serializer):
+        self.validate_bulk_item(serializer.validated_data)
+        serializer.save(household_id=self.kwargs['household_pk'])
\ No newline at end of file
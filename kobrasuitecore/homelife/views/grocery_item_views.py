@@ -2,12 +2,14 @@ from rest_framework import viewsets
 from django.shortcuts import get_object_or_404
 from homelife.models import GroceryItem, GroceryList
 from homelife.serializers.grocery_item_serializer import GroceryItemSerializer
+from homelife.views.bulk_operations import BulkOperationsMixin
 
 
-class GroceryItemViewSet(viewsets.ModelViewSet):
+class GroceryItemViewSet(BulkOperationsMixin, viewsets.ModelViewSet):
     """
     Nested under household_router → grocery_router:
     /.../households/<household_pk>/grocery_lists/<grocery_list_pk>/grocery_items/<grocery_item_pk>/
+    Also /grocery_items/bulk_create/, /grocery_items/bulk_update/ and /grocery_items/bulk_delete/.
     """
     serializer_class = GroceryItemSerializer
 
@@ -20,12 +22,15 @@ class GroceryItemViewSet(viewsets.ModelViewSet):
         return GroceryItem.objects.filter(grocery_list_id=grocery_list_id)
 
     # --- CREATE -------------------------------------------------------------
-    def perform_create(self, serializer):
+    def get_bulk_save_kwargs(self):
         """
-        Attach the item to the correct GroceryList (and by extension its household).
+        Attach items to the correct GroceryList (and by extension its household).
         """
         grocery_list = get_object_or_404(
             GroceryList,
             pk=self.kwargs.get('grocery_list_pk')
         )
-        serializer.save(grocery_list=grocery_list)
\ No newline at end of file
+        return {'grocery_list': grocery_list}
+
+    def perform_create(self, serializer):
+        serializer.save(**self.get_bulk_save_kwargs())
\ No newline at end of file
@@ -2,10 +2,15 @@
 
 from rest_framework import viewsets, mixins
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListAPIView
+from rest_framework.response import Response
 
 from homelife.models import Household
 from homelife.serializers.household_serializer import HouseholdSerializer
+from homelife.services.chore_stats_service import ChoreStatsService
 from hq.models import HomeLifeProfile
 from hq.serializers.homelife_profile_serializers import HomeLifeProfileSerializer
 
@@ -25,6 +30,21 @@ class HouseholdViewSet(viewsets.ModelViewSet):
         homelife_profile.household = household
         homelife_profile.save()
 
+    @action(detail=True, methods=['get'])
+    def chore_stats(self, request, *args, **kwargs):
+        """
+        Chore leaderboard for the ISO week containing ?week=<date> (default: this week):
+        completions, on-time rate, points and streak per member.
+        """
+        household = self.get_object()
+        raw = request.query_params.get('week')
+        week = parse_date(raw) if raw else None
+        if raw and week is None:
+            raise ValidationError({'week': 'Invalid date.'})
+        if week is not None:
+            week = ChoreStatsService.week_start(week)
+        return Response(ChoreStatsService.household_stats(household.pk, week))
+
 
 class HouseholdMemberViewSet(mixins.ListModelMixin,
                              viewsets.GenericViewSet):
@@ -2,12 +2,14 @@ from rest_framework import viewsets
 from django.shortcuts import get_object_or_404
 from homelife.models import MealPlan, Household
 from homelife.serializers.meal_plan_serializer import MealPlanSerializer
+from homelife.views.bulk_operations import BulkOperationsMixin
 
 
-class MealPlanViewSet(viewsets.ModelViewSet):
+class MealPlanViewSet(BulkOperationsMixin, viewsets.ModelViewSet):
     """
     Nested under household_router:
     e.g. /.../households/<household_pk>/meal_plans/
+    Also /meal_plans/bulk_create/, /meal_plans/bulk_update/ and /meal_plans/bulk_delete/.
     """
     serializer_class = MealPlanSerializer
 
@@ -15,7 +17,8 @@ class MealPlanViewSet(viewsets.ModelViewSet):
         household_id = self.kwargs.get('household_pk')
         return MealPlan.objects.filter(household_id=household_id)
 
+    def get_bulk_save_kwargs(self):
+        return {'household': get_object_or_404(Household, pk=self.kwargs.get('household_pk'))}
+
     def perform_create(self, serializer):
-        household_id = self.kwargs.get('household_pk')
-        household = get_object_or_404(Household, pk=household_id)
-        serializer.save(household=household)
\ No newline at end of file
+        serializer.save(**self.get_bulk_save_kwargs())
\ No newline at end of file
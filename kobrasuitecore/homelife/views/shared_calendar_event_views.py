@@ -1,31 +1,146 @@
-from rest_framework import viewsets, permissions
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from homelife.models import SharedCalendarEvent, Household
 from homelife.serializers.shared_calendar_event_serializer import (
     SharedCalendarEventSerializer,
 )
+from homelife.services.calendar_event_service import CalendarEventService
+
+DEFAULT_WINDOW = timedelta(days=90)
+DEFAULT_WINDOW_DAYS = 42
+MAX_WINDOW_DAYS = 366
 
 
 class SharedCalendarEventViewSet(viewsets.ModelViewSet):
     """
     /…/households/<household_pk>/calendar_events/
     List, create, update or delete events.
-    Supports ?start=<iso>&end=<iso> filtering.
+    Listing expands recurring series into occurrences for the window given by
+    ?start=<iso>&end=<iso> (or start_datetime / end_datetime), defaulting to the
+    next 90 days.
+
+    /…/calendar_events/window/?start=<date>&end=<date>
+    Events in a day range grouped per day with counts by source type. Responses
+    carry an ETag built from the household's calendar_version, so an unchanged
+    calendar answers If-None-Match with 304 without reading any events.
     """
     serializer_class = SharedCalendarEventSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         hh = self.kwargs["household_pk"]
-        qs = SharedCalendarEvent.objects.filter(household_id=hh)
-        start = self.request.query_params.get("start")
-        end = self.request.query_params.get("end")
-        if start:
-            qs = qs.filter(end_datetime__gte=start)
-        if end:
-            qs = qs.filter(start_datetime__lte=end)
-        return qs.order_by("start_datetime")
+        return SharedCalendarEvent.objects.filter(household_id=hh).order_by("start_datetime")
+
+    def _window(self):
+        params = self.request.query_params
+        bounds = []
+        for names in (("start", "start_datetime"), ("end", "end_datetime")):
+            raw = next((params[n] for n in names if params.get(n)), None)
+            value = parse_datetime(raw) if raw else None
+            if raw and value is None:
+                raise ValidationError({names[0]: "Invalid datetime."})
+            if value is not None and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            bounds.append(value)
+        start, end = bounds
+        if start is None:
+            start = timezone.now() if end is None else end - DEFAULT_WINDOW
+        if end is None:
+            end = start + DEFAULT_WINDOW
+        return start, end
+
+    def _events_in(self, start, end):
+        return CalendarEventService.window_events(self.get_queryset(), start, end)
+
+    def list(self, request, *args, **kwargs):
+        events = self._events_in(*self._window())
+        page = self.paginate_queryset(events)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(events, many=True).data)
+
+    def _day_range(self):
+        params = self.request.query_params
+        days = []
+        for name in ("start", "end"):
+            raw = params.get(name)
+            value = parse_date(raw) if raw else None
+            if raw and value is None:
+                raise ValidationError({name: "Invalid date."})
+            days.append(value)
+        first, last = days
+        if first is None:
+            first = timezone.localdate() if last is None else last - timedelta(days=DEFAULT_WINDOW_DAYS - 1)
+        if last is None:
+            last = first + timedelta(days=DEFAULT_WINDOW_DAYS - 1)
+        if last < first or (last - first).days >= MAX_WINDOW_DAYS:
+            raise ValidationError({"end": f"Must be within {MAX_WINDOW_DAYS} days on or after start."})
+        return first, last
+
+    @staticmethod
+    def _source_type(event):
+        if event.source_content_type_id is None:
+            return "manual"
+        return ContentType.objects.get_for_id(event.source_content_type_id).model
+
+    @action(detail=False, methods=["get"])
+    def window(self, request, *args, **kwargs):
+        first, last = self._day_range()
+        version = get_object_or_404(
+            Household.objects.values_list("calendar_version", flat=True), pk=self.kwargs["household_pk"],
+        )
+        etag = quote_etag(f"{self.kwargs['household_pk']}-{version}-{first}-{last}")
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == "*"):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        start = timezone.make_aware(datetime.combine(first, time.min))
+        end = timezone.make_aware(datetime.combine(last, time.max))
+        grouped = defaultdict(list)
+        for event in self._events_in(start, end):
+            grouped[timezone.localdate(max(event.start_datetime, start))].append(event)
+
+        days, totals = [], Counter()
+        for day in sorted(grouped):
+            by_source = Counter(self._source_type(e) for e in grouped[day])
+            totals.update(by_source)
+            days.append({
+                "date": day,
+                "count": len(grouped[day]),
+                "by_source": dict(by_source),
+                "events": self.get_serializer(grouped[day], many=True).data,
+            })
+        return Response({
+            "start": first,
+            "end": last,
+            "version": version,
+            "count": sum(totals.values()),
+            "by_source": dict(totals),
+            "days": days,
+        }, headers=headers)
 
     def perform_create(self, serializer):
         hh = Household.objects.get(pk=self.kwargs["household_pk"])
-        serializer.save(household=hh)
\ No newline at end of file
+        serializer.save(household=hh)
+        CalendarEventService.bump_version(hh.pk)
+
+    def perform_update(self, serializer):
+        previous = serializer.instance.household_id
+        event = serializer.save()
+        CalendarEventService.bump_version(previous, event.household_id)
+
+    def perform_destroy(self, instance):
+        household_id = instance.household_id
+        instance.delete()
+        CalendarEventService.bump_version(household_id)
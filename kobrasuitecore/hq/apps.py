@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HqConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hq'
+
+    def ready(self):
+        import hq.signals  # noqa: F401
@@ -0,0 +1,60 @@
+"""
+------------------Prologue--------------------
+File Name: recompute_gamification_summaries.py
+Path: kobrasuitecore/hq/management/commands/recompute_gamification_summaries.py
+
+Description:
+Recomputes every profile's ProfileGamificationSummary from its module experience, population and
+status rows. Used to backfill summaries and to check the incrementally maintained totals for drift.
+
+Input:
+Optional --profile argument to limit the run to one profile, and --check to only report drift.
+
+Output:
+The profiles whose stored summary differed from the recomputed one, and a count, printed to stdout.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import math
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from hq.models import ProfileGamificationSummary, UserProfile
+from hq.services.gamification_services import SUMMARY_FIELDS, computed_summary, recompute_summary
+
+
+def drifted_fields(stored, expected):
+    if stored is None:
+        return list(SUMMARY_FIELDS)
+    return [
+        field for field in SUMMARY_FIELDS
+        if not math.isclose(getattr(stored, field), getattr(expected, field), rel_tol=1e-9, abs_tol=1e-9)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Recomputes gamification summaries and reports drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', type=int, help='Only recompute this profile.')
+        parser.add_argument('--check', action='store_true', help='Report drift without writing.')
+
+    def handle(self, *args, **options):
+        profile_ids = UserProfile.objects.order_by('pk').values_list('pk', flat=True)
+        if options['profile'] is not None:
+            profile_ids = profile_ids.filter(pk=options['profile'])
+        stored = ProfileGamificationSummary.objects.in_bulk(list(profile_ids), field_name='profile_id')
+        drifted = 0
+        for profile_id in profile_ids.iterator():
+            with transaction.atomic():
+                fields = drifted_fields(stored.get(profile_id), computed_summary(profile_id))
+                if not fields:
+                    continue
+                drifted += 1
+                self.stdout.write(f'Profile {profile_id}: {", ".join(fields)}')
+                if not options['check']:
+                    recompute_summary(profile_id)
+        verb = 'differ' if options['check'] else 'recomputed'
+        self.stdout.write(f'{drifted} summaries {verb}.')
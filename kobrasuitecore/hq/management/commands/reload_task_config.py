@@ -0,0 +1,44 @@
+"""
+------------------Prologue--------------------
+File Name: reload_task_config.py
+Path: kobrasuitecore/hq/management/commands/reload_task_config.py
+
+Description:
+Validates the task configuration file and tells every running process to swap in the new
+compiled task map on its next lookup, so config changes apply without restarting workers.
+
+Input:
+Optional --path to a config file other than settings.HQ_TASK_CONFIG['PATH'], and --check to only
+validate it.
+
+Output:
+The number of task categories per module, printed to stdout.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from hq.task_config.task_map import load_task_map, request_reload
+
+
+class Command(BaseCommand):
+    help = 'Validates the task config and hot-reloads it in every process.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help='Config file to validate instead of the configured one.')
+        parser.add_argument('--check', action='store_true', help='Only validate the file.')
+
+    def handle(self, *args, **options):
+        if options['path'] and not options['check']:
+            raise CommandError('--path can only be used with --check; processes reload the configured file.')
+        try:
+            task_map = load_task_map(options['path'])
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Invalid task config: {exc}')
+        for module, configs in task_map.items():
+            self.stdout.write(f'{module}: {len(configs)} task categories')
+        if options['check']:
+            return
+        request_reload()
+        self.stdout.write('Reload requested.')
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hq', '0012_alter_financeprofile_profile_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UpcomingAgendaEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('calendar', 'Calendar Event'), ('household', 'Household Event'), ('assignment', 'Assignment')], max_length=20)),
+                ('source_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('start_datetime', models.DateTimeField()),
+                ('end_datetime', models.DateTimeField()),
+                ('is_all_day', models.BooleanField(default=False)),
+            ],
+            options={
+                'ordering': ['start_datetime', 'source', 'source_id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent',
+            index=models.Index(fields=['profile', 'start_datetime'], name='hq_calendar_profile_ea20d9_idx'),
+        ),
+        migrations.AddField(
+            model_name='upcomingagendaentry',
+            name='profile',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upcoming_agenda', to='hq.userprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='upcomingagendaentry',
+            index=models.Index(fields=['profile', 'start_datetime'], name='hq_upcoming_profile_acd9bd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='upcomingagendaentry',
+            index=models.Index(fields=['profile', 'source', 'source_id'], name='hq_upcoming_profile_328c17_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hq', '0013_upcoming_agenda'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileGamificationSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_experience', models.FloatField(default=0.0)),
+                ('total_population', models.IntegerField(default=0)),
+                ('top_streak', models.IntegerField(default=0)),
+                ('rank_sum', models.IntegerField(default=0)),
+                ('multiplier', models.FloatField(default=1.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='gamification_summary', to='hq.userprofile')),
+            ],
+        ),
+    ]
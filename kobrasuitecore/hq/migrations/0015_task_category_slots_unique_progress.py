@@ -0,0 +1,38 @@
+# Generated by Django 4.2.20 on 2026-10-18 10:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def merge_duplicate_slots(apps, schema_editor):
+    """
+    Folds any extra TaskCategorySlots rows of a progress into its oldest row, keeping
+    every allocated and completed bit, before the one-to-one constraint is added.
+    """
+    TaskCategorySlots = apps.get_model('hq', 'TaskCategorySlots')
+    keep = {}
+    for row in TaskCategorySlots.objects.order_by('progress_id', 'pk'):
+        first = keep.get(row.progress_id)
+        if first is None:
+            keep[row.progress_id] = row
+            continue
+        first.slots |= row.slots
+        first.completed |= row.completed
+        first.save(update_fields=['slots', 'completed'])
+        row.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hq', '0014_gamification_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_slots, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='taskcategoryslots',
+            name='progress',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='hq.taskcategoryprogress'),
+        ),
+    ]
@@ -7,7 +7,7 @@ from customer.models import User
 from homelife.models import Household
 from school.models import Course, University
 from work.models import WorkPlace
-from .types import ModuleType
+from .types import AgendaSource, ModuleType
 
 
 class UserProfile(models.Model):
@@ -17,17 +17,17 @@ class UserProfile(models.Model):
     profile_picture = models.ImageField(upload_to='profile_pics/', null=True, blank=True)
     preferences = models.JSONField(null=True, blank=True)
 
-    # TODO: (JAKE, USER PROFILE MODEL) Fix these broken garbage functions
+    # experience() and multiplier() read the denormalized ProfileGamificationSummary row
     def experience(self):
-        return sum(e.experience_amount for e in self.module_experiences.all())
+        from hq.services.gamification_services import get_summary
+        return get_summary(self).total_experience
 
     def multiplier(self):
-        total_population = sum(p.population for p in self.module_populations.all())
-        streaks = self.module_statuses.values_list('current_streak', flat=True)
-        top_streak = max(streaks) if streaks else 0
-        rank_sum = 0
-        for e in self.module_experiences.all():
-            rank_sum += math.floor(math.log2(e.experience_amount + 1))
+        from hq.services.gamification_services import get_summary
+        return get_summary(self).multiplier
+
+    @staticmethod
+    def compute_multiplier(total_population, top_streak, rank_sum):
         v1 = max(1, math.log(total_population, 10)) if total_population > 0 else 1
         v2 = max(1, math.log2(top_streak)) if top_streak > 0 else 1
         return (v1 + v2) / 2 + rank_sum
@@ -141,6 +141,24 @@ class ModulePopulation(models.Model):
         return f"{self.profile.user.username} - {self.module_type} Population"
 
 
+class ProfileGamificationSummary(models.Model):
+    """
+    Per-profile totals over ModuleExperience, ModulePopulation and ModuleStatus, kept in
+    step by hq.services.gamification_services so experience() and multiplier() are one
+    row read.
+    """
+    profile = models.OneToOneField(UserProfile, on_delete=models.CASCADE, related_name='gamification_summary')
+    total_experience = models.FloatField(default=0.0)
+    total_population = models.IntegerField(default=0)
+    top_streak = models.IntegerField(default=0)
+    rank_sum = models.IntegerField(default=0)
+    multiplier = models.FloatField(default=1.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Gamification summary of {self.profile.user.username}"
+
+
 class CalendarEvent(models.Model):
     profile = models.ForeignKey(
         'hq.UserProfile',
@@ -161,9 +179,40 @@ class CalendarEvent(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['profile', 'start_datetime']),
+        ]
+
     def __str__(self):
         return f"CalendarEvent {self.title} for {self.profile.user.username}"
 
+
+class UpcomingAgendaEntry(models.Model):
+    """
+    Materialized agenda row for a profile's next few days, refreshed per source
+    by hq.services.agenda_services when a calendar event, household event or
+    assignment changes.
+    """
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='upcoming_agenda')
+    source = models.CharField(max_length=20, choices=AgendaSource.choices)
+    source_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    start_datetime = models.DateTimeField()
+    end_datetime = models.DateTimeField()
+    is_all_day = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['start_datetime', 'source', 'source_id']
+        indexes = [
+            models.Index(fields=['profile', 'start_datetime']),
+            models.Index(fields=['profile', 'source', 'source_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.source}) for {self.profile.user.username}"
+
 # TODO: (JAKE) Update the name of this in the docs or here
 #   and also update name of completion count/category id if those are inconsistent
 class TaskCategoryProgress(models.Model):
@@ -182,7 +231,7 @@ class TaskCategoryProgress(models.Model):
 
 # TODO: (JAKE) Update name of this and its fields in docs
 class TaskCategorySlots(models.Model):
-    progress = models.ForeignKey(TaskCategoryProgress, on_delete=models.CASCADE, related_name='slots')
+    progress = models.OneToOneField(TaskCategoryProgress, on_delete=models.CASCADE, related_name='slots')
     slots = models.BigIntegerField(default=0)
     completed = models.BigIntegerField(default=0)
 
@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from hq.types import AgendaSource
+
+
+class AgendaEntrySerializer(serializers.Serializer):
+    source = serializers.ChoiceField(choices=AgendaSource.choices)
+    source_id = serializers.IntegerField()
+    title = serializers.CharField()
+    description = serializers.CharField(allow_blank=True)
+    start_datetime = serializers.DateTimeField()
+    end_datetime = serializers.DateTimeField()
+    is_all_day = serializers.BooleanField()
@@ -23,6 +23,10 @@ Collaborators: JAKE BERNARD, QWQ 32B
 """
 from rest_framework import serializers
 from hq.models import TaskCategoryProgress
+from hq.types import ModuleType
+
+# most completions accepted by one batch request
+MAX_BATCH_COMPLETIONS = 200
 
 # (TEMP) Main serializer class for TaskCategoryProgress model instances
 class TaskCategoryProgressSerializer(serializers.ModelSerializer):
@@ -44,3 +48,16 @@ class TaskCategoryProgressSerializer(serializers.ModelSerializer):
             # (TEMP) Timestamp of the last progress renewal
             'last_renewed_at'
         ]
+
+
+# One task completion sent by the client
+class TaskCompletionSerializer(serializers.Serializer):
+    module = serializers.ChoiceField(choices=ModuleType.choices)
+    category_id = serializers.IntegerField(min_value=0)
+    task_slot_id = serializers.IntegerField(default=-1)
+    data = serializers.JSONField(required=False, allow_null=True, default=None)
+
+
+# A list of completions applied in order, e.g. replayed after the client was offline
+class TaskCompletionBatchSerializer(serializers.Serializer):
+    completions = TaskCompletionSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_COMPLETIONS)
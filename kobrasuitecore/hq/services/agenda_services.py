@@ -0,0 +1,169 @@
+"""
+------------------Prologue--------------------
+File Name: agenda_services.py
+Path: kobrasuitecore/hq/services/agenda_services.py
+
+Description:
+Builds a user's agenda from their own calendar events, their household's shared calendar and the
+due dates of assignments in their enrolled courses. Each source is read with a range scan ordered
+by start time and the sources are merged lazily with a k-way merge, so entries stream out in time
+order. The next UPCOMING_DAYS days are also materialized per profile in UpcomingAgendaEntry and
+refreshed per source (or per changed row) when a source changes.
+
+Input:
+A profile id and a time window; change notifications from hq.signals.
+
+Output:
+AgendaEntry tuples in start order, or UpcomingAgendaEntry rows for the next few days.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import heapq
+from datetime import datetime, time, timedelta
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from homelife.models import SharedCalendarEvent
+from homelife.services.calendar_event_service import CalendarEventService
+from hq.models import CalendarEvent, HomeLifeProfile, SchoolProfile, UpcomingAgendaEntry
+from hq.types import AgendaSource
+from school.models import Assignment
+
+UPCOMING_DAYS = 7
+WINDOW_CACHE_TIMEOUT = 2 * 24 * 60 * 60
+
+
+class AgendaEntry(NamedTuple):
+    start_datetime: datetime
+    end_datetime: datetime
+    source: str
+    source_id: int
+    title: str
+    description: str = ''
+    is_all_day: bool = False
+
+
+def _sort_key(entry):
+    return entry.start_datetime, entry.source, entry.source_id
+
+
+def _calendar_entries(profile_id, start, end, ids=None):
+    events = CalendarEvent.objects.filter(profile_id=profile_id, start_datetime__lte=end, end_datetime__gte=start)
+    if ids is not None:
+        events = events.filter(pk__in=ids)
+    for event in events.order_by('start_datetime', 'pk').iterator():
+        yield AgendaEntry(event.start_datetime, event.end_datetime, AgendaSource.CALENDAR, event.pk,
+                          event.title, event.description, event.is_all_day)
+
+
+def _household_entries(profile_id, start, end, ids=None):
+    household_id = (HomeLifeProfile.objects
+                    .filter(profile_id=profile_id)
+                    .values_list('household_id', flat=True)
+                    .first())
+    if household_id is None:
+        return
+    events = SharedCalendarEvent.objects.filter(household_id=household_id)
+    if ids is not None:
+        events = events.filter(pk__in=ids)
+    for event in CalendarEventService.window_events(events, start, end):
+        yield AgendaEntry(event.start_datetime, event.end_datetime, AgendaSource.HOUSEHOLD, event.pk,
+                          event.title, event.description)
+
+
+def _assignment_entries(profile_id, start, end, ids=None):
+    courses = SchoolProfile.courses.through.objects.filter(schoolprofile__profile_id=profile_id)
+    assignments = (Assignment.objects
+                   .filter(course_id__in=courses.values('course_id'), due_date__range=(start, end))
+                   .select_related('course'))
+    if ids is not None:
+        assignments = assignments.filter(pk__in=ids)
+    for assignment in assignments.order_by('due_date', 'pk').iterator():
+        yield AgendaEntry(assignment.due_date, assignment.due_date, AgendaSource.ASSIGNMENT, assignment.pk,
+                          f'Due: {assignment.title}', assignment.course.title)
+
+
+SOURCES = {
+    AgendaSource.CALENDAR: _calendar_entries,
+    AgendaSource.HOUSEHOLD: _household_entries,
+    AgendaSource.ASSIGNMENT: _assignment_entries,
+}
+
+
+def iter_agenda(profile_id, start, end):
+    """
+    Yields every agenda entry overlapping [start, end] in start order. Sources are
+    queried lazily and merged as they are consumed.
+    """
+    return heapq.merge(*(entries(profile_id, start, end) for entries in SOURCES.values()), key=_sort_key)
+
+
+def _window_cache_key(profile_id):
+    return f'hq:agenda-window:{profile_id}'
+
+
+def _upcoming_window():
+    # Materialize whole local days, one extra so "now + UPCOMING_DAYS" stays covered all day.
+    today = timezone.localdate()
+    start = timezone.make_aware(datetime.combine(today, time.min))
+    end = timezone.make_aware(datetime.combine(today + timedelta(days=UPCOMING_DAYS + 1), time.min))
+    return today, start, end
+
+
+def is_materialized(profile_id):
+    return cache.get(_window_cache_key(profile_id)) == timezone.localdate()
+
+
+def refresh_upcoming_agenda(profile_id, sources=None, source_ids=None):
+    """
+    Rewrites a profile's materialized agenda rows for `sources` (all by default),
+    limited to `source_ids` when given. A materialization from an earlier day is
+    always rebuilt in full. Returns the number of rows written.
+    """
+    today, start, end = _upcoming_window()
+    if not is_materialized(profile_id):
+        sources, source_ids = None, None
+    written = 0
+    with transaction.atomic():
+        for source in sources or SOURCES:
+            stale = UpcomingAgendaEntry.objects.filter(profile_id=profile_id, source=source)
+            if source_ids is not None:
+                stale = stale.filter(source_id__in=source_ids)
+            stale.delete()
+            rows = [
+                UpcomingAgendaEntry(profile_id=profile_id, **entry._asdict())
+                for entry in SOURCES[source](profile_id, start, end, ids=source_ids)
+            ]
+            UpcomingAgendaEntry.objects.bulk_create(rows)
+            written += len(rows)
+    cache.set(_window_cache_key(profile_id), today, WINDOW_CACHE_TIMEOUT)
+    return written
+
+
+def refresh_materialized(profile_ids, source, source_ids=None):
+    """
+    Incrementally refreshes one source for the profiles whose agenda is materialized
+    for today; the others are rebuilt in full when next read.
+    """
+    for profile_id in set(profile_ids):
+        if is_materialized(profile_id):
+            refresh_upcoming_agenda(profile_id, [source], source_ids)
+
+
+def get_upcoming_agenda(profile_id):
+    """
+    Returns the profile's materialized entries overlapping the next UPCOMING_DAYS days,
+    building the materialization first if it is missing or from an earlier day.
+    """
+    if not is_materialized(profile_id):
+        refresh_upcoming_agenda(profile_id)
+    now = timezone.now()
+    return UpcomingAgendaEntry.objects.filter(
+        profile_id=profile_id,
+        end_datetime__gte=now,
+        start_datetime__lte=now + timedelta(days=UPCOMING_DAYS),
+    )
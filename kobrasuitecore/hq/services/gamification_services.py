@@ -0,0 +1,99 @@
+"""
+------------------Prologue--------------------
+File Name: gamification_services.py
+Path: kobrasuitecore/hq/services/gamification_services.py
+
+Description:
+Maintains ProfileGamificationSummary, the per-profile totals behind UserProfile.experience() and
+UserProfile.multiplier(). The reward pipeline updates the summary incrementally in its own
+transaction; any other write to a profile's experience, population or status rows recomputes the
+summary from those rows through hq.signals, inside the same transaction.
+
+Input:
+A profile (or profile id) and its module experience, population and status rows.
+
+Output:
+Up-to-date ProfileGamificationSummary rows.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import Max, Sum
+
+from hq.models import ModuleExperience, ModulePopulation, ModuleStatus, ProfileGamificationSummary, UserProfile
+
+SUMMARY_FIELDS = ['total_experience', 'total_population', 'top_streak', 'rank_sum', 'multiplier']
+
+_deferred = ContextVar('hq_summary_deferred', default=False)
+
+
+def rank_of(experience):
+    # rank grows with log2 of experience
+    return math.floor(math.log2(experience + 1)) if experience > 0 else 0
+
+
+def refresh_multiplier(summary):
+    summary.multiplier = UserProfile.compute_multiplier(summary.total_population, summary.top_streak,
+                                                        summary.rank_sum)
+    return summary
+
+
+def computed_summary(profile_id):
+    """
+    Builds an unsaved summary for a profile from its experience, population and status rows.
+    """
+    amounts = list(ModuleExperience.objects.filter(profile_id=profile_id).values_list('experience_amount', flat=True))
+    summary = ProfileGamificationSummary(
+        profile_id=profile_id,
+        total_experience=sum(amounts),
+        total_population=ModulePopulation.objects.filter(profile_id=profile_id)
+        .aggregate(total=Sum('population'))['total'] or 0,
+        top_streak=ModuleStatus.objects.filter(profile_id=profile_id)
+        .aggregate(top=Max('current_streak'))['top'] or 0,
+        rank_sum=sum(rank_of(amount) for amount in amounts),
+    )
+    return refresh_multiplier(summary)
+
+
+def recompute_summary(profile_id, create=True):
+    """
+    Rewrites a profile's summary from its rows and returns it. With create=False a
+    missing summary stays missing (e.g. while the profile itself is being deleted).
+    """
+    values = {field: getattr(computed_summary(profile_id), field) for field in SUMMARY_FIELDS}
+    if not create:
+        ProfileGamificationSummary.objects.filter(profile_id=profile_id).update(**values)
+        return None
+    summary, _ = ProfileGamificationSummary.objects.update_or_create(profile_id=profile_id, defaults=values)
+    return summary
+
+
+def get_summary(profile):
+    """
+    Returns the profile's summary, computing it on first use.
+    """
+    try:
+        return profile.gamification_summary
+    except ProfileGamificationSummary.DoesNotExist:
+        profile.gamification_summary = recompute_summary(profile.pk)
+        return profile.gamification_summary
+
+
+@contextmanager
+def summary_deferred():
+    """
+    Suppresses the signal-driven recompute while a caller maintains the summary itself.
+    """
+    token = _deferred.set(True)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+
+
+def summary_is_deferred():
+    return _deferred.get()
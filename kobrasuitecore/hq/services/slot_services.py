@@ -0,0 +1,128 @@
+"""
+------------------Prologue--------------------
+File Name: slot_services.py
+Path: kobrasuitecore/hq/services/slot_services.py
+
+Description:
+Allocates and releases the slots of unique task categories, stored as bitsets in
+TaskCategorySlots.slots. Free slots are found with bit arithmetic (~slots & (slots + 1) isolates
+the lowest clear bit) and claimed with a conditional UPDATE that only succeeds if the bitset is
+unchanged since it was read, retrying on conflict (or a lock error outside a transaction), so concurrent allocations never hand out the
+same slot. Releases clear the bits in a single UPDATE with bitwise F() expressions.
+
+Input:
+A profile, module and task category id, plus the number of slots or the slot ids to release.
+
+Output:
+Allocated slot indices, or whether the release succeeded.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+import random
+import time
+
+from django.db import OperationalError, connection
+from django.db.models import F
+
+from hq.models import TaskCategoryProgress, TaskCategorySlots
+from hq.task_config.task_map import get_task_config
+
+# slots live in a signed 64-bit column
+MAX_SLOTS = 63
+MAX_ATTEMPTS = 20
+
+
+class SlotAllocationError(Exception):
+    """
+    Raised when the slots could not be claimed within MAX_ATTEMPTS because other
+    allocations kept changing the bitset.
+    """
+
+
+def first_free_slot(mask):
+    """
+    Index of the lowest clear bit of `mask`.
+    """
+    return (~mask & (mask + 1)).bit_length() - 1
+
+
+def pick_free_slots(mask, slot_limit, count):
+    """
+    Returns the `count` lowest free slot indices below `slot_limit`, or None if there
+    are not enough.
+    """
+    picked = []
+    for _ in range(count):
+        index = first_free_slot(mask)
+        if index >= slot_limit:
+            return None
+        picked.append(index)
+        mask |= 1 << index
+    return picked
+
+
+def slot_limit_of(module, category_id):
+    config = get_task_config(module, category_id)
+    return min(config.slot_limit, MAX_SLOTS) if config else 0
+
+
+def get_slots_row(profile, module, category_id):
+    """
+    The category's TaskCategorySlots row, created with its progress if needed. Both
+    are unique per category, so concurrent first allocations end up on the same row.
+    """
+    progress, _ = TaskCategoryProgress.objects.get_or_create(profile=profile, module=module, category_id=category_id)
+    row, _ = TaskCategorySlots.objects.get_or_create(progress=progress)
+    return row
+
+
+def allocate_slots(profile, module, category_id, count=1):
+    """
+    Claims the `count` lowest free slots of a unique task category and returns their
+    indices; an empty list if the category has no slots or too few are free.
+    """
+    slot_limit = slot_limit_of(module, category_id)
+    if slot_limit == 0 or count < 1 or count > slot_limit:
+        return []
+    row = current = None
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            if row is None:
+                row = get_slots_row(profile, module, category_id)
+                current = row.slots
+            if current is None:
+                current = TaskCategorySlots.objects.filter(pk=row.pk).values_list('slots', flat=True).get()
+            picked = pick_free_slots(current, slot_limit, count)
+            if picked is None:
+                return []
+            claimed = current
+            for index in picked:
+                claimed |= 1 << index
+            if TaskCategorySlots.objects.filter(pk=row.pk, slots=current).update(slots=claimed):
+                return picked
+        except OperationalError:
+            # a lock conflict outside a transaction left nothing to roll back; retry it too
+            if connection.in_atomic_block:
+                raise
+        # another allocation changed the bitset since it was read; back off and retry
+        time.sleep(random.uniform(0, 0.002 * (attempt + 1)))
+        current = None
+    raise SlotAllocationError(f"Could not allocate {count} slot(s) for {module} task {category_id}")
+
+
+def release_slots(profile, module, category_id, slot_ids):
+    """
+    Frees the given slots (and their completed flags) so they can be allocated again.
+    Returns False if any slot id is out of range.
+    """
+    slot_limit = slot_limit_of(module, category_id)
+    if not slot_ids or any(slot_id < 0 or slot_id >= slot_limit for slot_id in slot_ids):
+        return False
+    mask = 0
+    for slot_id in slot_ids:
+        mask |= 1 << slot_id
+    TaskCategorySlots.objects.filter(
+        progress__profile=profile, progress__module=module, progress__category_id=category_id,
+    ).update(slots=F('slots').bitand(~mask), completed=F('completed').bitand(~mask))
+    return True
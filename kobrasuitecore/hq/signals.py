@@ -1,9 +1,87 @@
-from django.db.models.signals import post_save
+"""
+------------------Prologue--------------------
+File Name: signals.py
+Path: kobrasuitecore/hq/signals.py
+
+Description:
+Keeps the materialized upcoming agenda current. Changes to a profile's calendar events, its
+household's shared calendar, assignments in its courses, its enrolled courses or its household
+refresh only the affected source of the affected profiles. Writes to module experience, population
+or status rows outside the reward pipeline recompute the profile's gamification summary.
+
+Input:
+Model save/delete events, course enrollment changes and homelife calendar_changed signals.
+
+Output:
+Refreshed UpcomingAgendaEntry and ProfileGamificationSummary rows.
+
+Collaborators: SPENCER SLIFFE
+---------------------------------------------
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
-from .models import ModuleTask
-from .tasks import apply_task_rewards
 
-@receiver(post_save, sender=ModuleTask)
-def handle_module_task_creation(sender, instance, created, **kwargs):
-    if created:
-        apply_task_rewards(instance)
\ No newline at end of file
+from homelife.services.calendar_event_service import calendar_changed
+from hq.models import CalendarEvent, HomeLifeProfile, ModuleExperience, ModulePopulation, ModuleStatus, SchoolProfile
+from hq.services.agenda_services import refresh_materialized
+from hq.services.gamification_services import recompute_summary, summary_is_deferred
+from hq.types import AgendaSource
+from school.models import Assignment
+
+
+@receiver(post_save, sender=CalendarEvent)
+@receiver(post_delete, sender=CalendarEvent)
+def refresh_agenda_calendar_event(sender, instance, **kwargs):
+    refresh_materialized([instance.profile_id], AgendaSource.CALENDAR, [instance.pk])
+
+
+@receiver(calendar_changed)
+def refresh_agenda_household_events(sender, household_ids, **kwargs):
+    profile_ids = HomeLifeProfile.objects.filter(household_id__in=household_ids).values_list('profile_id', flat=True)
+    refresh_materialized(profile_ids, AgendaSource.HOUSEHOLD)
+
+
+@receiver(post_save, sender=HomeLifeProfile)
+def refresh_agenda_household(sender, instance, **kwargs):
+    refresh_materialized([instance.profile_id], AgendaSource.HOUSEHOLD)
+
+
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+def refresh_agenda_assignment(sender, instance, **kwargs):
+    profile_ids = SchoolProfile.objects.filter(courses=instance.course_id).values_list('profile_id', flat=True)
+    refresh_materialized(profile_ids, AgendaSource.ASSIGNMENT, [instance.pk])
+
+
+@receiver(m2m_changed, sender=SchoolProfile.courses.through)
+def refresh_agenda_courses(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        profile_ids = [instance.profile_id]
+    elif action == 'pre_clear':
+        # The reverse clear does not report which profiles it removes, so look before it runs.
+        profile_ids = list(instance.school_profiles.values_list('profile_id', flat=True))
+        instance._agenda_profile_ids = profile_ids
+        return
+    elif action == 'post_clear':
+        profile_ids = getattr(instance, '_agenda_profile_ids', [])
+    else:
+        profile_ids = SchoolProfile.objects.filter(pk__in=pk_set).values_list('profile_id', flat=True)
+    refresh_materialized(profile_ids, AgendaSource.ASSIGNMENT)
+
+
+@receiver(post_save, sender=ModuleExperience)
+@receiver(post_save, sender=ModulePopulation)
+@receiver(post_save, sender=ModuleStatus)
+def recompute_gamification_summary(sender, instance, **kwargs):
+    if not summary_is_deferred():
+        recompute_summary(instance.profile_id)
+
+
+@receiver(post_delete, sender=ModuleExperience)
+@receiver(post_delete, sender=ModulePopulation)
+@receiver(post_delete, sender=ModuleStatus)
+def recompute_gamification_summary_on_delete(sender, instance, **kwargs):
+    if not summary_is_deferred():
+        recompute_summary(instance.profile_id, create=False)
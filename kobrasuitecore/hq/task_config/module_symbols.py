@@ -26,8 +26,11 @@ import json
 import sys
 from types import ModuleType
 
-# (TEMP) path to the JSON configuration file containing module symbols
-path_to_file = "../config/module_symbols.json"
+from django.conf import settings
+
+# (TEMP) path to the JSON configuration file containing module symbols, next to the task config
+path_to_file = getattr(settings, 'HQ_TASK_CONFIG', {}).get(
+    'MODULE_SYMBOLS_PATH', settings.BASE_DIR.parent.parent / 'config' / 'module_symbols.json')
 
 # (TEMP) open the JSON configuration file in read mode
 with open(path_to_file, "r") as file:
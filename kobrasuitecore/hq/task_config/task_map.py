@@ -1,7 +1,7 @@
 """
 ------------------Prologue--------------------
 File Name: task_map.py
-Path: kobrasuitecore/kobrasuitecore/task_config/task_map.py
+Path: kobrasuitecore/hq/task_config/task_map.py
 
 Date Created:
 2025-03-16
@@ -10,21 +10,33 @@ Date Updated:
 2025-03-16
 
 Description:
-(TEMP) This file maps task configurations to their respective evaluation functions based on module categories. It reads task configurations from a JSON file and initializes TaskCategoryConfig objects with appropriate evaluation functions.
+Compiles the task configuration JSON (settings.HQ_TASK_CONFIG['PATH']) into an immutable registry:
+per module, a tuple of frozen TaskCategoryConfig records indexed by category id (0 is the built-in
+login task), with evaluation functions resolved once. Lookups are a dict access and a tuple index.
+The registry is replaced atomically by reload_task_map(); the reload_task_config management command
+validates the file and bumps a cache version so every process reloads on its next lookup.
 
 Input:
-(TEMP) Input is the task_config.json file containing task configurations for different modules.
+The task_config.json file containing task configurations for different modules.
 
 Output:
-(TEMP) Output is a dynamically created module containing the TaskMap dictionary with processed task configurations.
+TaskCategoryConfig records via get_task_config(), and the TaskMap mapping of module symbol to configs.
 
-Collaborators: JAKE BERNARD, QWQ 32B
+Collaborators: JAKE BERNARD, SPENCER SLIFFE, QWQ 32B
 ---------------------------------------------
 """
-
 import json
-import sys
-from types import ModuleType
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.dispatch import Signal
+
 from hq.task_config.module_symbols import ModuleSymbols as ms
 
 from hq.task_config.finance_task_eval_functions import FinanceTaskEvalFunctions
@@ -32,6 +44,14 @@ from hq.task_config.homelife_task_eval_functions import HomelifeTaskEvalFunction
 from hq.task_config.school_task_eval_functions import SchoolTaskEvalFunctions
 from hq.task_config.work_task_eval_functions import WorkTaskEvalFunctions
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK_CONFIG = {
+    'PATH': str(settings.BASE_DIR.parent.parent / 'config' / 'task_config.json'),
+    'RELOAD_CHECK_SECONDS': 5,
+}
+VERSION_CACHE_KEY = 'hq:task-config-version'
+
 # (TEMP) map module symbols to classes containing the evaluation functions for each module
 module_function_map = {
     ms.finance: FinanceTaskEvalFunctions,
@@ -40,67 +60,137 @@ module_function_map = {
     ms.work: WorkTaskEvalFunctions
 }
 
-# Class to allow for a strong(er) typed representation of task config
+# sent with the new registry after every reload
+task_map_reloaded = Signal()
+
+
+# Immutable, strongly typed representation of one task category's config
+@dataclass(frozen=True, slots=True)
 class TaskCategoryConfig:
-    def __init__(self, category_id, task_config):
-        # (TEMP) set category ID from input parameter
-        self.category_id = category_id
-        # (TEMP) extract task name from configuration
-        self.name = task_config['name']
-        # (TEMP) extract slot limit value from configuration
-        self.slot_limit = task_config['slot_limit']
-        # (TEMP) extract completion limit value from configuration
-        self.completion_limit = task_config['completion_limit']
-        # (TEMP) extract renewal period value from configuration
-        self.renewal_period = task_config['renewal_period']
-        # (TEMP) extract evaluation function reference from configuration
-        self.eval_func = task_config['eval_func']
-
-path_to_file = "../config/task_config.json"  # (TEMP) path to the task configuration JSON file
-
-with open(path_to_file, "r") as file:
-  try:
-    # (TEMP) load JSON data from file into task_dict
-    task_dict = json.loads(file.read())
-  except:
-    # (TEMP) default empty dictionary if parsing fails
-    task_dict = {}
-
-modified_task_dict = {}  # (TEMP) initialize container for processed task configurations
-for module in task_dict.keys():
-    module_task_arr = []  # (TEMP) initialize list to hold module-specific task configs
-    # (TEMP) create default configuration for login task
-    login_task_config = {
-        "name"            : "login",
-        "slot_limit"      : 0,
-        "completion_limit": 1,
-        "renewal_period"  : 1,
-        "eval_func"       : None
-    }
-    # (TEMP) instantiate login task configuration object
-    login_task = TaskCategoryConfig(0, login_task_config)
-    # (TEMP) add login task to module's task list
-    module_task_arr.append(login_task)
-    task_num = 0  # (TEMP) initialize task counter
-    module_symbol = ms.__dict__[module]
-    for task in task_dict[module]:
-        # (TEMP) increment task number counter
-        task_num = task_num + 1
-        # (TEMP) create new task configuration object
-        task_cfg = TaskCategoryConfig(task_num, task)
-        if task_cfg.eval_func:
-            # (TEMP) resolve evaluation function reference to actual function
-            task_cfg.eval_func = (
-                module_function_map[module_symbol].__dict__
-            )[task_cfg.eval_func]
-        # (TEMP) add configured task to module's list
-        module_task_arr.append(task_cfg)
-    # (TEMP) map module name to its processed task configurations
-    modified_task_dict[module_symbol] = module_task_arr
-
-# (TEMP) dynamically create new module object
-module = ModuleType(__name__)
-# (TEMP) attach TaskMap attribute to new module
-module.TaskMap = modified_task_dict
-# (TEMP) replace current module with dynamically created one
-sys.modules[__name__] = module
+    category_id: int
+    name: str
+    slot_limit: int
+    completion_limit: int
+    renewal_period: int
+    eval_func: Optional[Callable] = None
+
+
+# (TEMP) default configuration for the login task every module has at category 0
+LOGIN_TASK = {
+    "name"            : "login",
+    "slot_limit"      : 0,
+    "completion_limit": 1,
+    "renewal_period"  : 1,
+    "eval_func"       : None
+}
+
+
+def task_config_settings():
+    return {**DEFAULT_TASK_CONFIG, **getattr(settings, 'HQ_TASK_CONFIG', {})}
+
+
+def compile_task_map(task_dict):
+    """
+    Builds the read-only registry {module symbol: (TaskCategoryConfig, ...)} from the
+    parsed JSON. Raises ValueError for unknown modules, missing fields or eval functions.
+    """
+    compiled = {}
+    for module, tasks in task_dict.items():
+        symbol = getattr(ms, module, None)
+        if symbol is None:
+            raise ValueError(f"Unknown module {module!r} in task config")
+        configs = []
+        for category_id, task in enumerate([LOGIN_TASK, *tasks]):
+            try:
+                eval_name = task.get('eval_func')
+                eval_func = getattr(module_function_map[symbol], eval_name) if eval_name else None
+                configs.append(TaskCategoryConfig(
+                    category_id=category_id,
+                    name=task['name'],
+                    slot_limit=int(task['slot_limit']),
+                    completion_limit=int(task['completion_limit']),
+                    renewal_period=int(task['renewal_period']),
+                    eval_func=eval_func,
+                ))
+            except (AttributeError, KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f"Invalid task {category_id} of module {module!r}: {exc!r}") from exc
+        compiled[symbol] = tuple(configs)
+    return MappingProxyType(compiled)
+
+
+def load_task_map(path=None):
+    with open(path or task_config_settings()['PATH'], "r") as file:
+        return compile_task_map(json.load(file))
+
+
+class _State:
+    task_map = MappingProxyType({})
+    version = None
+    next_check = 0.0
+    lock = threading.Lock()
+
+
+def reload_task_map(path=None, version=None):
+    """
+    Compiles the config file and swaps it in as the current registry in one assignment,
+    so concurrent lookups see either the old or the new registry. On error the current
+    registry stays in place and the error is raised.
+    """
+    task_map = load_task_map(path)
+    with _State.lock:
+        _State.task_map = task_map
+        if version is not None:
+            _State.version = version
+    task_map_reloaded.send(sender=None, task_map=task_map)
+    return task_map
+
+
+def request_reload():
+    """
+    Asks every process to reload on its next lookup (after at most RELOAD_CHECK_SECONDS).
+    """
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, None)
+
+
+def _maybe_reload():
+    now = time.monotonic()
+    if now < _State.next_check:
+        return
+    _State.next_check = now + task_config_settings()['RELOAD_CHECK_SECONDS']
+    version = cache.get(VERSION_CACHE_KEY)
+    if version != _State.version:
+        try:
+            reload_task_map(version=version)
+        except (OSError, ValueError):
+            _State.version = version
+            logger.exception("Failed to reload the task config; keeping the current one.")
+
+
+def get_task_map():
+    _maybe_reload()
+    return _State.task_map
+
+
+def get_task_config(module, category_id):
+    """
+    Returns the TaskCategoryConfig of a module's category, or None if there is none.
+    """
+    configs = get_task_map().get(module, ())
+    return configs[category_id] if 0 <= category_id < len(configs) else None
+
+
+def __getattr__(name):
+    # TaskMap stays importable for older callers; it is the registry current at access time
+    if name == 'TaskMap':
+        return get_task_map()
+    raise AttributeError(name)
+
+
+try:
+    _State.task_map = load_task_map()
+except (OSError, ValueError):
+    # (TEMP) default to an empty registry if the file is missing or invalid
+    logger.exception("Failed to load the task config.")
@@ -0,0 +1,13 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture
+def profile(django_user_model):
+    """
+    A user's UserProfile; the customer signals also create its module profiles.
+    """
+    cache.clear()
+    user = django_user_model.objects.create_user(username='planner', password='pass12345')
+    yield user.profile
+    cache.clear()
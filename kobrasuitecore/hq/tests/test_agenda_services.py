@@ -0,0 +1,137 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from homelife.models import Chore, Household, SharedCalendarEvent
+from homelife.types import ChoreFrequency
+from hq.models import CalendarEvent, UpcomingAgendaEntry
+from hq.services.agenda_services import get_upcoming_agenda, is_materialized, iter_agenda
+from hq.types import AgendaSource
+from hq.views.agenda_views import AgendaViewSet
+from school.models import Assignment, Course
+
+
+@pytest.fixture
+def now():
+    return timezone.now().replace(microsecond=0)
+
+
+@pytest.fixture
+def household(profile):
+    household = Household.objects.create(name='Home')
+    homelife_profile = profile.homelife_profile
+    homelife_profile.household = household
+    homelife_profile.save()
+    return household
+
+
+@pytest.fixture
+def course(profile):
+    course = Course.objects.create(title='Algorithms')
+    profile.school_profile.courses.add(course)
+    return course
+
+
+@pytest.fixture
+def sources(profile, household, course, now):
+    CalendarEvent.objects.create(profile=profile, title='Standup', start_datetime=now + timedelta(hours=3),
+                                 end_datetime=now + timedelta(hours=4))
+    SharedCalendarEvent.objects.create(household=household, title='Dinner party',
+                                       start_datetime=now + timedelta(hours=1),
+                                       end_datetime=now + timedelta(hours=2))
+    Chore.objects.create(household=household, title='Dishes', frequency=ChoreFrequency.DAILY,
+                         available_from=now + timedelta(hours=2))
+    Assignment.objects.create(course=course, title='Heaps', due_date=now + timedelta(days=1, hours=5))
+
+
+@pytest.mark.django_db
+class TestIterAgenda:
+    def test_sources_are_merged_in_time_order(self, profile, sources, now):
+        entries = list(iter_agenda(profile.pk, now, now + timedelta(days=2)))
+        assert [e.title for e in entries] == [
+            'Dinner party', 'Chore: Dishes', 'Standup', 'Chore: Dishes', 'Due: Heaps',
+        ]
+        assert [e.source for e in entries] == [
+            AgendaSource.HOUSEHOLD, AgendaSource.HOUSEHOLD, AgendaSource.CALENDAR,
+            AgendaSource.HOUSEHOLD, AgendaSource.ASSIGNMENT,
+        ]
+        starts = [e.start_datetime for e in entries]
+        assert starts == sorted(starts)
+
+    def test_other_users_and_courses_are_excluded(self, profile, sources, now, django_user_model):
+        other = django_user_model.objects.create_user(username='other', password='pass12345').profile
+        CalendarEvent.objects.create(profile=other, title='Theirs', start_datetime=now, end_datetime=now)
+        Assignment.objects.create(course=Course.objects.create(title='Art'), title='Sketch', due_date=now)
+        titles = {e.title for e in iter_agenda(profile.pk, now - timedelta(hours=1), now + timedelta(days=2))}
+        assert not titles & {'Theirs', 'Due: Sketch'}
+
+    def test_streaming_endpoint(self, profile, sources, now):
+        request = APIRequestFactory().get('/', {'start': now.isoformat(),
+                                                'end': (now + timedelta(days=2)).isoformat()})
+        force_authenticate(request, user=profile.user)
+        response = AgendaViewSet.as_view({'get': 'list'})(request, user_pk=profile.user_id, profile_pk=profile.pk)
+        assert response.status_code == 200 and response.streaming
+        data = json.loads(b''.join(response.streaming_content))
+        assert [e['title'] for e in data][:3] == ['Dinner party', 'Chore: Dishes', 'Standup']
+
+    def test_other_users_cannot_read_the_agenda(self, profile, sources, django_user_model):
+        intruder = django_user_model.objects.create_user(username='intruder', password='pass12345')
+        for action in ('list', 'upcoming'):
+            request = APIRequestFactory().get('/')
+            force_authenticate(request, user=intruder)
+            response = AgendaViewSet.as_view({'get': action})(request, user_pk=profile.user_id, profile_pk=profile.pk)
+            assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestUpcomingAgenda:
+    def test_first_read_materializes_the_next_week(self, profile, sources):
+        entries = list(get_upcoming_agenda(profile.pk))
+        assert is_materialized(profile.pk)
+        assert len([e for e in entries if e.title == 'Chore: Dishes']) in (7, 8)
+        assert {'Dinner party', 'Standup', 'Due: Heaps'} <= {e.title for e in entries}
+
+    def test_second_read_does_not_touch_the_sources(self, profile, sources):
+        list(get_upcoming_agenda(profile.pk))
+        with CaptureQueriesContext(connection) as ctx:
+            list(get_upcoming_agenda(profile.pk))
+        assert len(ctx.captured_queries) == 1
+        assert 'hq_upcomingagendaentry' in ctx.captured_queries[0]['sql']
+
+    def test_calendar_event_change_only_rewrites_that_event(self, profile, sources, now):
+        list(get_upcoming_agenda(profile.pk))
+        untouched = set(UpcomingAgendaEntry.objects.exclude(source=AgendaSource.CALENDAR).values_list('pk', flat=True))
+        event = CalendarEvent.objects.get(profile=profile)
+        event.title = 'Retro'
+        event.save()
+        assert set(UpcomingAgendaEntry.objects.exclude(source=AgendaSource.CALENDAR)
+                   .values_list('pk', flat=True)) == untouched
+        assert UpcomingAgendaEntry.objects.get(source=AgendaSource.CALENDAR).title == 'Retro'
+        event.delete()
+        assert not UpcomingAgendaEntry.objects.filter(source=AgendaSource.CALENDAR).exists()
+
+    def test_household_and_assignment_changes_refresh(self, profile, sources, course, now):
+        list(get_upcoming_agenda(profile.pk))
+        SharedCalendarEvent.objects.filter(title='Dinner party').delete()
+        Chore.objects.get(title='Dishes').delete()
+        assert not UpcomingAgendaEntry.objects.filter(source=AgendaSource.HOUSEHOLD).exists()
+
+        Assignment.objects.create(course=course, title='Graphs', due_date=now + timedelta(days=3))
+        titles = set(UpcomingAgendaEntry.objects.filter(source=AgendaSource.ASSIGNMENT).values_list('title', flat=True))
+        assert titles == {'Due: Heaps', 'Due: Graphs'}
+
+        profile.school_profile.courses.remove(course)
+        assert not UpcomingAgendaEntry.objects.filter(source=AgendaSource.ASSIGNMENT).exists()
+
+    def test_upcoming_endpoint(self, profile, sources):
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, user=profile.user)
+        view = AgendaViewSet.as_view({'get': 'upcoming'})
+        response = view(request, user_pk=profile.user_id, profile_pk=profile.pk)
+        assert response.status_code == 200
+        assert response.data[0]['title'] == 'Dinner party'
@@ -0,0 +1,79 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from hq.models import (ModuleExperience, ModulePopulation, ModuleStatus, ProfileGamificationSummary,
+                       TaskCategoryProgress, TaskCategorySlots, TaskPerformanceBounds, UserProfile)
+from hq.services.gamification_services import SUMMARY_FIELDS, computed_summary, get_summary
+from hq.types import ModuleType
+from hq.utils.task_utils import apply_task_rewards
+
+FINANCE = ModuleType.FINANCE
+
+
+def summary_values(profile_id):
+    summary = ProfileGamificationSummary.objects.get(profile_id=profile_id)
+    return [getattr(summary, field) for field in SUMMARY_FIELDS]
+
+
+def expected_values(profile_id):
+    return [pytest.approx(getattr(computed_summary(profile_id), field)) for field in SUMMARY_FIELDS]
+
+
+@pytest.mark.django_db
+class TestProfileGamificationSummary:
+    def test_rewards_keep_the_summary_in_step(self, profile):
+        ModuleExperience.objects.create(profile=profile, module_type=ModuleType.SCHOOL, experience_amount=40)
+        progress = TaskCategoryProgress.objects.create(profile=profile, module=FINANCE, category_id=1)
+        TaskCategorySlots.objects.create(progress=progress, slots=(1 << 12) - 1)
+        TaskPerformanceBounds.objects.bulk_create(
+            TaskPerformanceBounds(progress=progress, slot_index=i, data={'test_data': 1}) for i in range(12)
+        )
+        for slot in range(12):
+            assert apply_task_rewards(profile, FINANCE, 1, slot, json.dumps({'test_data': 1}))['has_reward']
+        assert summary_values(profile.pk) == expected_values(profile.pk)
+
+    def test_direct_writes_recompute_the_summary(self, profile):
+        experience = ModuleExperience.objects.create(profile=profile, module_type=FINANCE, experience_amount=7)
+        ModulePopulation.objects.create(profile=profile, module_type=FINANCE, population=150)
+        ModuleStatus.objects.create(profile=profile, module_type=ModuleType.WORK, current_streak=4)
+        assert summary_values(profile.pk) == expected_values(profile.pk)
+        experience.delete()
+        assert ProfileGamificationSummary.objects.get(profile=profile).total_experience == 0
+
+    def test_reads_are_one_row(self, profile, django_assert_num_queries):
+        ModuleExperience.objects.create(profile=profile, module_type=FINANCE, experience_amount=15)
+        profile = UserProfile.objects.get(pk=profile.pk)
+        with django_assert_num_queries(1):
+            assert profile.experience() == 15
+            assert profile.multiplier() == 1 + 4
+
+    def test_summary_is_created_on_first_read(self, profile):
+        ProfileGamificationSummary.objects.all().delete()
+        assert get_summary(UserProfile.objects.get(pk=profile.pk)).multiplier == 1
+
+    def test_reset_top_streak_falls_back_to_the_next_module(self, profile):
+        yesterday = timezone.now().date() - timedelta(days=5)
+        ModuleStatus.objects.create(profile=profile, module_type=FINANCE, current_streak=9, streak_start=yesterday)
+        ModuleStatus.objects.create(profile=profile, module_type=ModuleType.WORK, current_streak=3)
+        apply_task_rewards(profile, FINANCE, 0, -1, None)
+        assert ProfileGamificationSummary.objects.get(profile=profile).top_streak == 3
+
+    def test_deleting_a_profile_removes_its_summary(self, profile):
+        ModuleExperience.objects.create(profile=profile, module_type=FINANCE, experience_amount=3)
+        profile.user.delete()
+        assert not ProfileGamificationSummary.objects.exists()
+
+    def test_recompute_command_reports_and_repairs_drift(self, profile):
+        ModuleExperience.objects.create(profile=profile, module_type=FINANCE, experience_amount=3)
+        ProfileGamificationSummary.objects.filter(profile=profile).update(total_experience=99)
+        out = StringIO()
+        call_command('recompute_gamification_summaries', '--check', stdout=out)
+        assert f'Profile {profile.pk}: total_experience' in out.getvalue()
+        assert ProfileGamificationSummary.objects.get(profile=profile).total_experience == 99
+        call_command('recompute_gamification_summaries', stdout=StringIO())
+        assert summary_values(profile.pk) == expected_values(profile.pk)
@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+from django.db import connection
+
+from hq.models import TaskCategoryProgress, TaskCategorySlots
+from hq.services.slot_services import allocate_slots, first_free_slot, pick_free_slots, release_slots
+from hq.types import ModuleType
+from hq.utils.task_utils import alloc_task_slot, dealloc_task_slot
+
+FINANCE = ModuleType.FINANCE
+UNIQUE_TASK = 1  # finance "exampleTask" has 20 slots
+
+
+def slots_of(profile):
+    return TaskCategorySlots.objects.get(progress__profile=profile, progress__category_id=UNIQUE_TASK)
+
+
+class TestBitArithmetic:
+    @pytest.mark.parametrize('mask, expected', [(0, 0), (0b1, 1), (0b1011, 2), (0b0110, 0), ((1 << 40) - 1, 40)])
+    def test_first_free_slot(self, mask, expected):
+        assert first_free_slot(mask) == expected
+
+    def test_pick_free_slots(self):
+        assert pick_free_slots(0b10110, 8, 3) == [0, 3, 5]
+        assert pick_free_slots(0b10110, 5, 3) is None
+
+
+@pytest.mark.django_db
+class TestSlotAllocation:
+    def test_slots_are_handed_out_lowest_first(self, profile):
+        assert [alloc_task_slot(profile, FINANCE, UNIQUE_TASK) for _ in range(3)] == [(True, 0), (True, 1), (True, 2)]
+        assert slots_of(profile).slots == 0b111
+
+    def test_allocates_k_slots_in_one_call(self, profile):
+        assert allocate_slots(profile, FINANCE, UNIQUE_TASK, 5) == [0, 1, 2, 3, 4]
+        assert allocate_slots(profile, FINANCE, UNIQUE_TASK, 16) == []
+        assert allocate_slots(profile, FINANCE, UNIQUE_TASK, 15) == list(range(5, 20))
+        assert alloc_task_slot(profile, FINANCE, UNIQUE_TASK) == (False, 21)
+
+    def test_categories_without_slots(self, profile):
+        assert alloc_task_slot(profile, FINANCE, 0) == (False, 0)
+        assert allocate_slots(profile, FINANCE, 99) == []
+
+    def test_dealloc_clears_the_slot_bit(self, profile):
+        allocate_slots(profile, FINANCE, UNIQUE_TASK, 4)
+        TaskCategorySlots.objects.update(completed=0b0100)
+        assert dealloc_task_slot(profile, FINANCE, UNIQUE_TASK, 2)
+        row = slots_of(profile)
+        assert (row.slots, row.completed) == (0b1011, 0)
+        assert alloc_task_slot(profile, FINANCE, UNIQUE_TASK) == (True, 2)
+
+    @pytest.mark.parametrize('slot_id', [-1, 20])
+    def test_dealloc_rejects_out_of_range_slots(self, profile, slot_id):
+        allocate_slots(profile, FINANCE, UNIQUE_TASK, 1)
+        assert not dealloc_task_slot(profile, FINANCE, UNIQUE_TASK, slot_id)
+        assert release_slots(profile, FINANCE, UNIQUE_TASK, [0])
+        assert slots_of(profile).slots == 0
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('existing_row', [True, False])
+def test_concurrent_allocations_never_share_a_slot(django_user_model, existing_row):
+    profile = django_user_model.objects.create_user(username='racer', password='pass12345').profile
+    if existing_row:
+        TaskCategorySlots.objects.create(
+            progress=TaskCategoryProgress.objects.create(profile=profile, module=FINANCE, category_id=UNIQUE_TASK))
+    barrier = threading.Barrier(10)
+    results, errors = [], []
+
+    def worker():
+        try:
+            barrier.wait()
+            for _ in range(3):
+                results.extend(allocate_slots(profile, FINANCE, UNIQUE_TASK, 1))
+        except Exception as exc:  # surfaced by the assertions below
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert sorted(results) == list(range(20))
+    assert TaskCategorySlots.objects.filter(progress__profile=profile).count() == 1
+    assert slots_of(profile).slots == (1 << 20) - 1
@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from hq.models import ModuleStatus, TaskCategoryProgress, TaskCategorySlots, TaskPerformanceBounds, Wallet
+from hq.types import ModuleType
+from hq.views.task_category_progress_views import TaskCategoryProgressViewSet
+
+FINANCE = ModuleType.FINANCE
+
+
+def completion(slot, module=FINANCE, category_id=1):
+    return {'module': module, 'category_id': category_id, 'task_slot_id': slot, 'data': {'test_data': 0.5}}
+
+
+@pytest.fixture
+def unique_task(profile):
+    progress = TaskCategoryProgress.objects.create(profile=profile, module=FINANCE, category_id=1)
+    TaskCategorySlots.objects.create(progress=progress, slots=(1 << 10) - 1)
+    TaskPerformanceBounds.objects.bulk_create(
+        TaskPerformanceBounds(progress=progress, slot_index=i, data={'test_data': 0.5}) for i in range(10)
+    )
+    return progress
+
+
+@pytest.mark.django_db
+class TestTaskCompletionViews:
+    def post(self, profile, action, payload, user=None):
+        request = APIRequestFactory().post('/', payload, format='json')
+        force_authenticate(request, user=user or profile.user)
+        view = TaskCategoryProgressViewSet.as_view({'post': action})
+        return view(request, user_pk=profile.user_id, profile_pk=profile.pk)
+
+    def test_complete_applies_one_completion(self, profile, unique_task):
+        response = self.post(profile, 'complete', completion(4))
+        assert response.status_code == 200
+        assert response.data['has_reward']
+        assert Wallet.objects.get(profile=profile).balance == response.data['currency']
+
+    def test_batch_applies_completions_in_order(self, profile, unique_task):
+        items = [completion(1), completion(2), completion(1), completion(0, ModuleType.HOMELIFE, 0)]
+        response = self.post(profile, 'complete_batch', {'completions': items})
+        assert response.status_code == 200
+        results, totals = response.data['results'], response.data['totals']
+        assert [r['task_completed'] for r in results] == [True, True, False, True]
+        assert [r['has_reward'] for r in results] == [True, True, False, False]
+        assert totals['completed'] == 3 and totals['rewarded'] == 2
+        assert totals['currency'] == results[0]['currency'] + results[1]['currency']
+        assert Wallet.objects.get(profile=profile).balance == totals['currency']
+        assert ModuleStatus.objects.get(profile=profile, module_type=ModuleType.HOMELIFE).current_streak == 1
+        unique_task.refresh_from_db()
+        assert unique_task.completion_count == 2
+
+    def test_batch_cost_does_not_grow_with_its_size(self, profile, unique_task):
+        self.post(profile, 'complete_batch', {'completions': [completion(0)]})  # creates the reward rows
+        counts = []
+        for slots in ([1, 2], [3, 4, 5, 6, 7, 8]):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.post(profile, 'complete_batch', {'completions': [completion(s) for s in slots]})
+            assert response.data['totals']['rewarded'] == len(slots)
+            counts.append(len(ctx.captured_queries))
+        assert counts[0] == counts[1]
+
+    def test_batch_is_validated_before_anything_is_applied(self, profile, unique_task):
+        response = self.post(profile, 'complete_batch', {'completions': [completion(1), {'module': 'X'}]})
+        assert response.status_code == 400
+        assert not Wallet.objects.filter(profile=profile).exists()
+        assert self.post(profile, 'complete_batch', {'completions': []}).status_code == 400
+
+    def test_completions_only_apply_to_the_users_own_profile(self, profile, unique_task, django_user_model):
+        other = django_user_model.objects.create_user(username='other', password='pass12345')
+        response = self.post(profile, 'complete_batch', {'completions': [completion(1)]}, user=other)
+        assert response.status_code == 404
@@ -0,0 +1,100 @@
+import dataclasses
+import json
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+
+from hq.task_config import task_map
+from hq.task_config.task_map import (TaskCategoryConfig, compile_task_map, get_task_config, reload_task_map,
+                                     task_map_reloaded)
+from hq.types import ModuleType
+
+CONFIG = {
+    'finance': [
+        {'name': 'budget', 'slot_limit': 4, 'completion_limit': 2, 'renewal_period': 7, 'eval_func': None},
+        {'name': 'example', 'slot_limit': 0, 'completion_limit': 1, 'renewal_period': 1,
+         'eval_func': 'example_task_eval'},
+    ],
+    'school': [],
+}
+
+
+@pytest.fixture
+def config_file(tmp_path, settings):
+    path = tmp_path / 'task_config.json'
+    path.write_text(json.dumps(CONFIG))
+    settings.HQ_TASK_CONFIG = {'PATH': str(path), 'RELOAD_CHECK_SECONDS': 0}
+    cache.clear()
+    task_map._State.next_check = 0
+    yield path
+    cache.clear()
+    task_map._State.version, task_map._State.next_check = None, 0
+    settings.HQ_TASK_CONFIG = {}
+    reload_task_map()
+
+
+class TestCompileTaskMap:
+    def test_configs_are_indexed_by_category_id_after_login(self):
+        compiled = compile_task_map(CONFIG)
+        login, budget, example = compiled[ModuleType.FINANCE]
+        assert (login.category_id, login.name, login.slot_limit) == (0, 'login', 0)
+        assert (budget.category_id, budget.slot_limit, budget.renewal_period) == (1, 4, 7)
+        assert example.eval_func({'test_data': 1}, {'test_data': 2}) == 3
+        assert [c.name for c in compiled[ModuleType.SCHOOL]] == ['login']
+
+    def test_records_are_immutable(self):
+        compiled = compile_task_map(CONFIG)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            compiled[ModuleType.FINANCE][1].slot_limit = 99
+        with pytest.raises(TypeError):
+            compiled[ModuleType.SCHOOL] = ()
+        assert not hasattr(compiled[ModuleType.FINANCE][1], '__dict__')
+
+    @pytest.mark.parametrize('config', [
+        {'nowhere': []},
+        {'finance': [{'name': 'x', 'slot_limit': 0, 'completion_limit': 1}]},
+        {'finance': [{'name': 'x', 'slot_limit': 0, 'completion_limit': 1, 'renewal_period': 1,
+                      'eval_func': 'missing'}]},
+    ])
+    def test_invalid_configs_are_rejected(self, config):
+        with pytest.raises(ValueError):
+            compile_task_map(config)
+
+
+class TestTaskMapReload:
+    def test_lookup(self, config_file):
+        reload_task_map()
+        assert get_task_config(ModuleType.FINANCE, 1) == TaskCategoryConfig(1, 'budget', 4, 2, 7)
+        assert get_task_config(ModuleType.FINANCE, 3) is None
+        assert get_task_config(ModuleType.FINANCE, -1) is None
+        assert get_task_config(ModuleType.WORK, 0) is None
+
+    def test_reload_command_swaps_the_map_in_on_the_next_lookup(self, config_file):
+        reload_task_map()
+        received = []
+        task_map_reloaded.connect(lambda sender, task_map, **kw: received.append(task_map), weak=False,
+                                  dispatch_uid='test-task-map')
+        try:
+            config_file.write_text(json.dumps({'finance': CONFIG['finance'][:1] * 3}))
+            assert get_task_config(ModuleType.FINANCE, 3) is None
+            call_command('reload_task_config', stdout=StringIO())
+            assert get_task_config(ModuleType.FINANCE, 3).name == 'budget'
+            assert len(received) == 1
+        finally:
+            task_map_reloaded.disconnect(dispatch_uid='test-task-map')
+
+    def test_invalid_file_keeps_the_current_map(self, config_file):
+        reload_task_map()
+        config_file.write_text('{"finance": [')
+        with pytest.raises(CommandError):
+            call_command('reload_task_config', stdout=StringIO())
+        cache.set(task_map.VERSION_CACHE_KEY, 99)
+        assert get_task_config(ModuleType.FINANCE, 1).name == 'budget'
+
+    def test_check_only_validates(self, config_file):
+        out = StringIO()
+        call_command('reload_task_config', '--check', '--path', str(config_file), stdout=out)
+        assert 'F: 3 task categories' in out.getvalue()
+        assert cache.get(task_map.VERSION_CACHE_KEY) is None
@@ -0,0 +1,90 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from hq.models import (ModuleExperience, ModulePopulation, ModuleStatus, TaskCategoryProgress, TaskCategorySlots,
+                       TaskPerformanceBounds, Wallet)
+from hq.types import ModuleType
+from hq.utils.task_utils import apply_task_rewards
+
+FINANCE = ModuleType.FINANCE
+UNIQUE_TASK = 1  # finance "exampleTask": 20 slots, 12 completions per day, example_task_eval
+DATA = json.dumps({'test_data': 0.5})
+
+
+@pytest.fixture
+def unique_task(profile):
+    progress = TaskCategoryProgress.objects.create(profile=profile, module=FINANCE, category_id=UNIQUE_TASK)
+    slots = TaskCategorySlots.objects.create(progress=progress, slots=0b1110)
+    TaskPerformanceBounds.objects.bulk_create(
+        TaskPerformanceBounds(progress=progress, slot_index=i, data={'test_data': 0.5}) for i in (1, 2, 3)
+    )
+    return progress, slots
+
+
+@pytest.mark.django_db
+class TestApplyTaskRewards:
+    def test_unique_task_rewards_the_profile(self, profile, unique_task):
+        progress, slots = unique_task
+        result = apply_task_rewards(profile, FINANCE, UNIQUE_TASK, 2, DATA)
+        assert result['task_completed'] and result['has_reward']
+        assert result['performance'] == 1.0
+        assert Wallet.objects.get(profile=profile).balance == result['currency'] > 0
+        assert ModuleExperience.objects.get(profile=profile, module_type=FINANCE).experience_amount == \
+            result['experience']
+        slots.refresh_from_db()
+        progress.refresh_from_db()
+        assert slots.completed == 0b100
+        assert progress.completion_count == 1
+
+    def test_rewards_accumulate_on_existing_rows(self, profile, unique_task):
+        first = apply_task_rewards(profile, FINANCE, UNIQUE_TASK, 1, DATA)
+        second = apply_task_rewards(profile, FINANCE, UNIQUE_TASK, 3, DATA)
+        assert Wallet.objects.get(profile=profile).balance == first['currency'] + second['currency']
+        assert ModulePopulation.objects.get(profile=profile, module_type=FINANCE).population == \
+            first['population'] + second['population']
+
+    @pytest.mark.parametrize('slot', [0, 2, 25, -1])
+    def test_unallocated_completed_or_invalid_slots_are_rejected(self, profile, unique_task, slot):
+        apply_task_rewards(profile, FINANCE, UNIQUE_TASK, 2, DATA)
+        assert apply_task_rewards(profile, FINANCE, UNIQUE_TASK, slot, DATA)['task_completed'] is False
+
+    def test_unknown_category_is_rejected(self, profile):
+        assert apply_task_rewards(profile, FINANCE, 99, -1, None)['task_completed'] is False
+        assert not TaskCategoryProgress.objects.exists()
+
+    def test_expired_period_resets_the_limit_and_slots(self, profile, unique_task):
+        progress, slots = unique_task
+        TaskCategoryProgress.objects.filter(pk=progress.pk).update(
+            completion_count=12, last_renewed_at=timezone.now() - timedelta(days=2))
+        TaskCategorySlots.objects.filter(pk=slots.pk).update(completed=0b10)
+        result = apply_task_rewards(profile, FINANCE, UNIQUE_TASK, 1, DATA)
+        assert result['has_reward']
+        slots.refresh_from_db()
+        progress.refresh_from_db()
+        assert (slots.completed, progress.completion_count) == (0b10, 1)
+
+    def test_first_login_of_the_day_extends_the_streak(self, profile):
+        ModuleStatus.objects.create(profile=profile, module_type=FINANCE, current_streak=2,
+                                    streak_start=timezone.now().date() - timedelta(days=2))
+        result = apply_task_rewards(profile, FINANCE, 0, -1, None)
+        assert result['task_completed'] and not result['has_reward']
+        assert apply_task_rewards(profile, FINANCE, 0, -1, None)['task_completed']
+        status = ModuleStatus.objects.get(profile=profile, module_type=FINANCE)
+        assert (status.current_streak, status.max_streak, status.building_level) == (3, 3, 3)
+
+    def test_completion_runs_a_fixed_number_of_queries(self, profile, unique_task):
+        apply_task_rewards(profile, FINANCE, UNIQUE_TASK, 1, DATA)
+        for slot in (2, 3):
+            with CaptureQueriesContext(connection) as ctx:
+                assert apply_task_rewards(profile, FINANCE, UNIQUE_TASK, slot, DATA)['has_reward']
+            sql = [q['sql'] for q in ctx.captured_queries if not q['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+            # lock + summary, wallet, experience, population, status, progress, slots, bounds
+            assert len([q for q in sql if q.startswith('SELECT')]) == 8
+            # progress, slots, wallet, experience, population, summary
+            assert len([q for q in sql if q.startswith('UPDATE')]) == 6
+            assert len(sql) == 14
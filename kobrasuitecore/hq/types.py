@@ -5,4 +5,9 @@ class ModuleType(models.TextChoices):
     SCHOOL = ModuleSymbols.school, 'School'
     WORK = ModuleSymbols.work, 'Work'
     HOMELIFE = ModuleSymbols.homelife, 'HomeLife'
-    FINANCE = ModuleSymbols.finance, 'Finance'
\ No newline at end of file
+    FINANCE = ModuleSymbols.finance, 'Finance'
+
+class AgendaSource(models.TextChoices):
+    CALENDAR = 'calendar', 'Calendar Event'
+    HOUSEHOLD = 'household', 'Household Event'
+    ASSIGNMENT = 'assignment', 'Assignment'
@@ -15,6 +15,12 @@ Defines utility functions for dealing with the backend task handling system, inc
 - calculating task performance
 - allocating and deallocating task slots
 
+Rewards are applied through RewardState, which locks the profile and loads its gamification
+state (summary, wallet, module experience/population/status rows, category progress and slots) once,
+computes every reward in memory and writes the result back in one transaction, so concurrent
+completions cannot lose updates and a completion costs a fixed number of queries. A batch of
+completions (e.g. replayed by a client coming back online) shares one RewardState.
+
 Input:
 Varies by utility function
 
@@ -28,134 +34,305 @@ Collaborators: JAKE BERNARD, SPENCER SLIFFE, CHATGPT from "OPEN"AI
 import datetime
 import json
 import logging
-import math
 import random
 
 # importing django stuff
+from django.db import transaction
+from django.db.models import F, Max
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 # importing our stuff
 from hq.models import TaskCategoryProgress, TaskCategorySlots, TaskPerformanceBounds, ModuleExperience, ModuleStatus, \
-    ModulePopulation, Wallet, UserProfile
-from hq.task_config.task_map import TaskMap
+    ModulePopulation, Wallet, UserProfile, ProfileGamificationSummary
+from hq.services.gamification_services import SUMMARY_FIELDS, rank_of, recompute_summary, refresh_multiplier, \
+    summary_deferred
+from hq.services.slot_services import allocate_slots, release_slots, slot_limit_of
+from hq.task_config.task_map import get_task_config
 
 # setting up logger
 logger = logging.getLogger(__name__)
 
-# TODO: (JAKE, TASK UTILS) Have this return BadRequest in certain scenarios
-def apply_task_rewards(profile, module, category_id, task_slot_id, data):
-    # (TEMP) Get or create progress record for user's task category
-    progress, created = TaskCategoryProgress.objects.get_or_create(
-        profile=profile,
-        module=module,
-        category_id=category_id
-    )
-
-    # (TEMP) Get current time
-    now = timezone.now()
-    # (TEMP) Retrieve category configuration parameters
-    cat_config = get_category_config(module, category_id)
-    # (TEMP) Return failure if config not found
-    if not cat_config:
-        return no_completion_response()
-
-    # (TEMP) Unpack configuration parameters
-    slot_limit, completion_limit, renewal_period, eval_func = cat_config
-    # (TEMP) Determine if task requires unique slot allocation
-    is_unique = slot_limit > 0
-
-    # (TEMP) Get associated task slots (for unique tasks)
-    slots = None
-    # IMPORTANT
-    # bad outcome: unique tasks need an allocated slot before they can be accomplished
-    # (TEMP) Handle edge case where unique task is completed before creation
-    if created and is_unique:
-        # TODO: (JAKE, TASK UTILS) Should this be critical?(1)
-        # this should never happen
-        logger.critical(f"Unique Task from Module {module} with ID {category_id}"
-                        f" was asking for completion before creation.")
-        return no_completion_response()
-    elif is_unique:
-        # (TEMP) Retrieve existing task slots record
-        slots = TaskCategorySlots.objects.get(progress=progress)
-        if not slots:
+# cap for the 32-bit completion counter
+MAX_COMPLETION_COUNT = 2147483647
+
+
+class ModuleRewardRows:
+    """
+    A profile's experience, population and status rows for one module, plus the gains
+    applied to them in memory and not yet written.
+    """
+
+    def __init__(self, profile, module):
+        self.experience = ModuleExperience.objects.filter(profile=profile, module_type=module).first()
+        self.population = ModulePopulation.objects.filter(profile=profile, module_type=module).first()
+        self.status = ModuleStatus.objects.filter(profile=profile, module_type=module).first()
+        self.experience_gain = 0
+        self.population_gain = 0
+        self.status_changed = False
+
+
+class RewardState:
+    """
+    One profile's gamification state. Create it inside transaction.atomic(): the profile
+    row is locked first, so completions of the same profile are serialized, then every
+    row the rewards touch is read once (module rows on the first completion in that
+    module). complete() works purely in memory and flush() writes the changes back with
+    F() increments and bulk_update.
+    """
+
+    def __init__(self, profile, now=None):
+        self.profile = profile
+        self.now = now or timezone.now()
+        # lock the profile row (reading its summary along); every gamification write below goes through it
+        locked = (UserProfile.objects.select_for_update(of=('self',))
+                  .select_related('gamification_summary').get(pk=profile.pk))
+        try:
+            self.summary = locked.gamification_summary
+        except ProfileGamificationSummary.DoesNotExist:
+            self.summary = recompute_summary(profile.pk)
+        self.wallet = Wallet.objects.filter(profile=profile).first()
+        self.modules = {}
+        self.progress = {}
+        self.slots = {}
+        self.bounds = {}
+        self.currency_gain = 0
+        self.summary_changed = False
+        self.changed_progress = {}
+        self.changed_slots = {}
+
+    def multiplier(self):
+        return self.summary.multiplier
+
+    def experience(self):
+        return self.summary.total_experience
+
+    def _module(self, module):
+        if module not in self.modules:
+            self.modules[module] = ModuleRewardRows(self.profile, module)
+        return self.modules[module]
+
+    def _category(self, module, category_id, is_unique):
+        # progress (and slots for unique tasks) of a category, read once per state
+        key = (module, category_id)
+        if key not in self.progress:
+            progress, created = TaskCategoryProgress.objects.get_or_create(
+                profile=self.profile, module=module, category_id=category_id,
+            )
+            slots = TaskCategorySlots.objects.filter(progress=progress).first() if is_unique and not created else None
+            self.progress[key] = (progress, created)
+            self.slots[key] = slots
+        progress, created = self.progress[key]
+        return progress, created, self.slots[key]
+
+    def complete(self, module, category_id, task_slot_id=-1, data=None):
+        """
+        Applies one task completion to the in-memory state and returns its result dict.
+        """
+        # retrieve category configuration parameters
+        cat_config = get_category_config(module, category_id)
+        if not cat_config:
+            return no_completion_response()
+        slot_limit, completion_limit, renewal_period, eval_func = cat_config
+        # unique tasks need an allocated slot before they can be completed
+        is_unique = slot_limit > 0
+        key = (module, category_id)
+        progress, created, slots = self._category(module, category_id, is_unique)
+        if created and is_unique:
+            # TODO: (JAKE, TASK UTILS) Should this be critical?(1)
+            logger.critical(f"Unique Task from Module {module} with ID {category_id}"
+                            f" was asking for completion before creation.")
+            return no_completion_response()
+        if is_unique and not slots:
             # TODO: (JAKE, TASK UTILS) Should this be critical?(2)
             logger.critical(f"Unique Task from Module {module} with ID {category_id}"
                             f" was created with no slots but is asking for completion.")
             return no_completion_response()
 
-    # (TEMP) Check if task needs renewal-based reset
-    reset_if_renewed(progress, slot_limit, renewal_period, slots, now)
+        self._reset_if_renewed(key, progress, slots, renewal_period)
 
-    # (TEMP) Validate slot ID for unique tasks
-    if is_unique:
-        if task_slot_id < 0 or task_slot_id >= slot_limit:
-            return no_completion_response()
-        if not is_slot_allocated(task_slot_id, slots):
-            return no_completion_response()
-        if was_already_completed(task_slot_id, slots):
-            return no_completion_response()
-
-    # (TEMP) Assume task completion unless blocked
-    task_completed = True
-    # (TEMP) Calculate performance multiplier based on evaluation function
-    performance = calculate_performance(progress, task_slot_id, eval_func, data)
-    # (TEMP) Check if category completion limit reached
-    category_over_limit = progress.completion_count >= completion_limit
-
-    # (TEMP) Determine if reward should be granted
-    has_reward = not category_over_limit and not category_id == 0
-    # (TEMP) Initialize reward containers
-    currency, experience, population = 0, 0, 0
-    has_ranked_up = False
-
-    if has_reward:
-        # (TEMP) Generate base rewards using random values and profile multipliers
-        base_currency   = random.randint(5, 10) * profile.multiplier()
-        base_population = (random.choices([0,1,2], [20,2,1])[0]
-                           * profile.multiplier())
-        base_experience = random.randint(1,3) * profile.multiplier()
-        # (TEMP) Apply performance multiplier to rewards
-        currency = int(base_currency * performance)
-        experience = int(base_experience * performance)
-        population = int(base_population * performance)
-
-        # (TEMP) Update user wallet with currency reward
-        add_currency_to_wallet(profile, currency)
-        # (TEMP) Update module population with gain
-        update_population(profile, module, population)
-        # (TEMP) Update experience and check for rank up
-        old_module_experience = update_experience(profile, module, experience)
-
-        # (TEMP) Increment completion counter
-        inc_completion_count(progress)
-
-        # (TEMP) Check if rank increased due to new experience
-        has_ranked_up = check_rank_up(profile, experience, old_module_experience)
-
-        # (TEMP) Mark unique task slot as completed
         if is_unique:
-            mark_slot_completed(task_slot_id, slots)
-    elif category_id == 0:
-        # (TEMP) Handle non-rewarded base category completion
-        inc_completion_count(progress)
-        if progress.completion_count < 1:
-            # (TEMP) Update streak for first-time completion
-            update_streak(profile, module)
-    else:
-        # (TEMP) Increment counter for non-unique tasks
-        inc_completion_count(progress)
+            if task_slot_id < 0 or task_slot_id >= slot_limit:
+                return no_completion_response()
+            if not is_slot_allocated(task_slot_id, slots):
+                return no_completion_response()
+            if was_already_completed(task_slot_id, slots):
+                return no_completion_response()
+
+        performance = calculate_performance(self._bounds(progress, task_slot_id, eval_func), eval_func, data)
+        previous_count = progress.completion_count
+        has_reward = previous_count < completion_limit and category_id != 0
+        currency, experience, population = 0, 0, 0
+        has_ranked_up = False
+
+        if has_reward:
+            multiplier = self.multiplier()
+            currency = int(random.randint(5, 10) * multiplier * performance)
+            population = int(random.choices([0, 1, 2], [20, 2, 1])[0] * multiplier * performance)
+            experience = int(random.randint(1, 3) * multiplier * performance)
+            has_ranked_up = rank_of(self.experience() + experience) > rank_of(self.experience())
+            self._add_rewards(module, currency, experience, population)
+            if is_unique:
+                slots.completed = slots.completed | (1 << task_slot_id)
+                self.changed_slots[key] = slots
+        elif category_id == 0 and previous_count < 1:
+            # first login of the renewal period extends the module streak
+            self._update_streak(module)
+
+        self._inc_completion_count(key, progress)
+        return {
+            "task_completed": True,
+            "has_reward": has_reward,
+            "has_ranked_up": has_ranked_up,
+            "performance": performance,
+            "currency": currency,
+            "experience": experience,
+            "population": population
+        }
+
+    def _bounds(self, progress, task_slot_id, eval_func):
+        # performance bounds of all slots of a category, read once per state
+        if not eval_func:
+            return None
+        if progress.pk not in self.bounds:
+            self.bounds[progress.pk] = {
+                bounds.slot_index: json.loads(bounds.data) if isinstance(bounds.data, str) else bounds.data
+                for bounds in TaskPerformanceBounds.objects.filter(progress=progress)
+            }
+        return self.bounds[progress.pk].get(task_slot_id)
+
+    def _reset_if_renewed(self, key, progress, slots, renewal_period):
+        if (self.now - progress.last_renewed_at).days >= renewal_period:
+            progress.completion_count = 0
+            progress.last_renewed_at = self.now
+            self.changed_progress[key] = progress
+            if slots:
+                slots.completed = 0
+                self.changed_slots[key] = slots
+
+    def _inc_completion_count(self, key, progress):
+        if progress.completion_count < MAX_COMPLETION_COUNT:
+            progress.completion_count += 1
+            self.changed_progress[key] = progress
+
+    def _add_rewards(self, module, currency, experience, population):
+        rows = self._module(module)
+        if rows.experience is None:
+            rows.experience = ModuleExperience(profile=self.profile, module_type=module)
+        if rows.population is None:
+            rows.population = ModulePopulation(profile=self.profile, module_type=module)
+        old_experience = rows.experience.experience_amount
+        old_population = rows.population.population
+        rows.experience.experience_amount += experience
+        rows.population.population = max(old_population + population, 0)
+        # keep the summary in step: totals by difference, rank sum by the module's rank change
+        self.summary.total_experience += experience
+        self.summary.total_population += rows.population.population - old_population
+        self.summary.rank_sum += rank_of(rows.experience.experience_amount) - rank_of(old_experience)
+        refresh_multiplier(self.summary)
+        self.summary_changed = True
+        self.currency_gain += currency
+        rows.experience_gain += experience
+        rows.population_gain += population
+
+    def _update_streak(self, module):
+        rows = self._module(module)
+        if rows.status is None:
+            rows.status = ModuleStatus(profile=self.profile, module_type=module)
+        old_streak = rows.status.current_streak
+        advance_streak(rows.status, self.now.date())
+        rows.status_changed = True
+        new_streak = rows.status.current_streak
+        if new_streak >= self.summary.top_streak:
+            self.summary.top_streak = new_streak
+        elif old_streak == self.summary.top_streak:
+            # the top streak was reset; the next best may be another module's
+            others = [r.status.current_streak for m, r in self.modules.items() if m != module and r.status]
+            others.append(ModuleStatus.objects.filter(profile=self.profile)
+                          .exclude(module_type__in=self.modules)
+                          .aggregate(top=Max('current_streak'))['top'] or 0)
+            self.summary.top_streak = max(*others, new_streak)
+        else:
+            return
+        refresh_multiplier(self.summary)
+        self.summary_changed = True
+
+    def flush(self):
+        """
+        Writes the accumulated changes: counters with F() increments, progress and slot
+        rows with one bulk_update each, rows seen for the first time with create and the
+        gamification summary with one update.
+        """
+        with summary_deferred():
+            self._flush()
+        if self.summary_changed:
+            self.summary.save(update_fields=[*SUMMARY_FIELDS, 'updated_at'])
+            self.profile.gamification_summary = self.summary
+        self.summary_changed = False
+
+    def _flush(self):
+        if self.changed_progress:
+            TaskCategoryProgress.objects.bulk_update(
+                self.changed_progress.values(), ['completion_count', 'last_renewed_at'])
+        if self.changed_slots:
+            TaskCategorySlots.objects.bulk_update(self.changed_slots.values(), ['completed'])
+        if self.currency_gain:
+            if self.wallet is None:
+                self.wallet = Wallet.objects.create(profile=self.profile, balance=self.currency_gain)
+            else:
+                Wallet.objects.filter(pk=self.wallet.pk).update(balance=F('balance') + self.currency_gain)
+        for rows in self.modules.values():
+            if rows.experience_gain or rows.population_gain:
+                self._flush_module_row(rows.experience, 'experience_amount', rows.experience_gain)
+                self._flush_module_row(rows.population, 'population', rows.population_gain)
+            if rows.status_changed:
+                rows.status.save()
+            rows.experience_gain = rows.population_gain = 0
+            rows.status_changed = False
+        self.currency_gain = 0
+        self.changed_progress, self.changed_slots = {}, {}
+
+    @staticmethod
+    def _flush_module_row(row, field, gain):
+        if row.pk is None:
+            row.save()
+        elif field == 'population':
+            type(row).objects.filter(pk=row.pk).update(population=Greatest(F('population') + gain, 0))
+        elif gain:
+            type(row).objects.filter(pk=row.pk).update(**{field: F(field) + gain})
 
-    # (TEMP) Return final results package
-    return {
-        "task_completed": task_completed,
-        "has_reward": has_reward,
-        "has_ranked_up": has_ranked_up,
-        "performance": performance,
-        "currency": currency,
-        "experience": experience,
-        "population": population
+
+# TODO: (JAKE, TASK UTILS) Have this return BadRequest in certain scenarios
+def apply_task_rewards(profile, module, category_id, task_slot_id, data):
+    # apply one completion inside a single transaction with the profile locked
+    with transaction.atomic():
+        state = RewardState(profile)
+        result = state.complete(module, category_id, task_slot_id, data)
+        state.flush()
+    return result
+
+def apply_task_rewards_batch(profile, completions):
+    """
+    Applies a list of completions ({module, category_id, task_slot_id, data}) for one
+    profile in order, in one transaction with the gamification state loaded once.
+    Returns the per-item results and the aggregate totals.
+    """
+    with transaction.atomic():
+        state = RewardState(profile)
+        results = [
+            state.complete(item['module'], item['category_id'], item.get('task_slot_id', -1), item.get('data'))
+            for item in completions
+        ]
+        state.flush()
+    totals = {
+        "completed": sum(1 for r in results if r["task_completed"]),
+        "rewarded": sum(1 for r in results if r["has_reward"]),
+        "has_ranked_up": any(r["has_ranked_up"] for r in results),
+        "currency": sum(r["currency"] for r in results),
+        "experience": sum(r["experience"] for r in results),
+        "population": sum(r["population"] for r in results),
     }
+    return results, totals
 
 def no_completion_response():
     # (TEMP) Return default failure response
@@ -169,41 +346,19 @@ def no_completion_response():
         "population": 0
     }
 
-def inc_completion_count(progress):
-    # (TEMP) Get current completion count
-    current = progress.completion_count
-    # (TEMP) Prevent overflow beyond 32-bit integer limit
-    if current >= 2147483647:
-        return
-    # (TEMP) Increment and save progress
-    progress.completion_count = current + 1
-    progress.save()
-
-def reset_if_renewed(progress, slot_limit, renewal_period, slots, now):
-    # (TEMP) Calculate days since last renewal
-    days_diff = (now - progress.last_renewed_at).days
-    # (TEMP) Reset progress if renewal period expired
-    if days_diff >= renewal_period:
-        progress.completion_count = 0
-        progress.last_renewed_at = now
-        progress.save()
-        # (TEMP) Reset unique task slots if applicable
-        if slot_limit > 0 and slots:
-            slots.update(completed=0)
-
 def get_category_config(module, category_id):
-    # (TEMP) Retrieve configuration from task map
-    cat = TaskMap.get(module, {}).get(category_id, None)
+    # (TEMP) Retrieve configuration from the compiled task map
+    cat = get_task_config(module, category_id)
     # (TEMP) Log error and return if missing
     if not cat:
         logger.critical(f"Failed to get config for task from module {module} with ID {category_id}")
         return None
     # (TEMP) Extract configuration parameters
     return (
-        cat.get('slot_limit', 0),
-        cat.get('completion_limit', 1),
-        cat.get('renewal_period', 1),
-        cat.get('eval_func')
+        cat.slot_limit,
+        cat.completion_limit,
+        cat.renewal_period,
+        cat.eval_func
     )
 
 def is_slot_allocated(task_slot_id, slots):
@@ -214,75 +369,29 @@ def was_already_completed(task_slot_id, slots):
     # (TEMP) Check if slot was already completed using bitmask
     return slots.completed & (1 << task_slot_id) != 0
 
-def mark_slot_completed(task_slot_id, slots):
-    # (TEMP) Set completion bit in bitmask
-    slots.completed = slots.completed | (1 << task_slot_id)
-    slots.save()
-
-def calculate_performance(progress, task_slot_id, eval_func, data):
+def calculate_performance(task_bounds, eval_func, data):
     # (TEMP) Default to 1.0 if no evaluator
     if not eval_func:
         return 1.0
-
-    # (TEMP) Get stored performance bounds for this task slot
-    task_bounds = TaskPerformanceBounds.objects.filter(progress=progress, slot_index=task_slot_id).first()
-    # (TEMP) Parse stored bounds data
-    task_bounds = json.loads(task_bounds.data) if task_bounds else None
     try:
         # (TEMP) Parse incoming data from frontend
-        frontend_data = json.loads(data) if data else None
-    except:
+        frontend_data = json.loads(data) if isinstance(data, (str, bytes)) else data
+    except ValueError:
         # (TEMP) Handle invalid data format
         # TODO: (JAKE, TASK UTILS) Log when the frontend data is not formatted correctly or probably just return BadRequest
         frontend_data = None
 
-    # (TEMP) Initialize default performance
-    performance = 1.0
-    if eval_func:
-        # (TEMP) Execute evaluation function with data
-        performance = eval_func(frontend_data, task_bounds)
+    # (TEMP) Execute evaluation function with data
+    performance = eval_func(frontend_data, task_bounds)
 
     # (TEMP) Ensure valid performance value
     return performance if performance is not None else 1.0
 
-def check_rank_up(profile, gained_xp, before_module):
-    # (TEMP) Calculate old and new rank levels
-    before = profile.experience()
-    after = before + gained_xp
-    old_rank = math.floor(math.log2(before + 1)) if before > 0 else 0
-    new_rank = math.floor(math.log2(after + 1)) if after > 0 else 0
-
-    # (TEMP) Return true if rank increased
-    return new_rank > old_rank
-
 def default_eval():
     # (TEMP) Default evaluation returns base multiplier
     return 1.0
 
-def add_currency_to_wallet(profile, amount):
-    # (TEMP) Get or create user wallet
-    wallet = profile.wallet.first()
-    if not wallet:
-        wallet = Wallet.objects.create(profile=profile)
-    # (TEMP) Add currency and save
-    wallet.balance += int(amount)
-    wallet.save()
-
-def update_experience(profile, module, amount):
-    # (TEMP) Get or create module experience record
-    experience_obj, _ = ModuleExperience.objects.get_or_create(profile=profile, module_type=module)
-    # (TEMP) Record previous experience value
-    old_module_experience = experience_obj.experience_amount
-    # (TEMP) Update and save new experience
-    experience_obj.experience_amount += amount
-    experience_obj.save()
-    return old_module_experience
-
-def update_streak(profile, module):
-    # (TEMP) Get current date and module status
-    today = timezone.now().date()
-    status_obj, _ = ModuleStatus.objects.get_or_create(profile=profile, module_type=module)
-
+def advance_streak(status_obj, today):
     # (TEMP) Initialize streak if needed
     if status_obj.streak_start is None or status_obj.current_streak == 0:
         status_obj.streak_start = today
@@ -292,7 +401,7 @@ def update_streak(profile, module):
         last_streak_day = status_obj.streak_start + datetime.timedelta(days=status_obj.current_streak - 1)
         if today == last_streak_day + datetime.timedelta(days=1):
             status_obj.current_streak += 1
-        else:
+        elif today != last_streak_day:
             status_obj.streak_start = today
             status_obj.current_streak = 1
     # (TEMP) Update max streak and building level
@@ -300,68 +409,21 @@ def update_streak(profile, module):
         status_obj.max_streak = status_obj.current_streak
     if status_obj.max_streak > status_obj.building_level:
         status_obj.building_level = status_obj.max_streak
-    status_obj.save()
-
-def update_population(profile, module, population_gain):
-    # (TEMP) Get or create module population record
-    population_obj, _ = ModulePopulation.objects.get_or_create(profile=profile, module_type=module)
-    # (TEMP) Apply population change with minimum 0
-    population_obj.population += population_gain
-    population_obj.population = max(population_obj.population, 0)
-    population_obj.save()
 
 def alloc_task_slot(profile, module, task_category_id):
-    # (TEMP) Get slot limit from configuration
-    slot_limit = TaskMap[module][task_category_id]['slot_limit']
-
-    # (TEMP) Return failure if no slots available
+    # (TEMP) Return failure if the category has no slots
+    slot_limit = slot_limit_of(module, task_category_id)
     if slot_limit == 0:
         return False, 0
 
-    # (TEMP) Get existing progress record
-    task_category_progress = (TaskCategoryProgress
-                              .objects
-                              .filter(profile=profile,
-                                      module=module,
-                                      task_category_id=task_category_id)
-                              .first())
-    # (TEMP) Get or create associated slots record
-    task_slots, _ = (TaskCategorySlots
-                .objects.get_or_create(progress=task_category_progress))
-
-    # (TEMP) Iterate through slots to find first available
-    slots = task_slots.slots
-    for i in range(slot_limit):
-        if not slots & (1 << i):
-            # (TEMP) Mark slot as allocated and return
-            task_slots.slots = task_slots.slots | (1 << i)
-            task_slots.save()
-            return True, i
+    # claim the lowest free slot atomically
+    allocated = allocate_slots(profile, module, task_category_id, 1)
+    if allocated:
+        return True, allocated[0]
 
     # (TEMP) Return failure if no slots available
     return False, slot_limit + 1
 
 def dealloc_task_slot(profile, module, task_category_id, slot_id):
-    # (TEMP) Validate slot ID
-    slot_limit = TaskMap[module][task_category_id]['slot_limit']
-
-    if slot_id > slot_limit or slot_id < 0:
-        return False
-
-    # (TEMP) Get existing progress record
-    task_category_progress = (TaskCategoryProgress
-                              .objects
-                              .filter(profile=profile,
-                                      module=module,
-                                      task_category_id=task_category_id)
-                              .first())
-    # (TEMP) Get associated slots record
-    task_slots, _ = (TaskCategorySlots
-                .objects.get_or_create(progress=task_category_progress))
-
-    # (TEMP) Clear the allocated bit in bitmask
-    task_slots.slots = task_slots.slots & ~(1 << task_category_id)
-    task_slots.save()
-
-    # (TEMP) Return success
-    return True
+    # (TEMP) Clear the slot's bit; fails for slot ids outside the category's slots
+    return release_slots(profile, module, task_category_id, [slot_id])
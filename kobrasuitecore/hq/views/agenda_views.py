@@ -0,0 +1,76 @@
+# File: hq/views/agenda_views.py
+import json
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from hq.models import UserProfile
+from hq.serializers.agenda_serializers import AgendaEntrySerializer
+from hq.services.agenda_services import UPCOMING_DAYS, get_upcoming_agenda, iter_agenda
+
+MAX_AGENDA_WINDOW = timedelta(days=92)
+
+
+class AgendaViewSet(viewsets.ViewSet):
+    """
+    /users/<user_pk>/profile/<profile_pk>/agenda/?start=<iso>&end=<iso>
+    Streams the profile's calendar events, household events and assignment due
+    dates in time order as a JSON array (defaults to the next 7 days).
+
+    /users/<user_pk>/profile/<profile_pk>/agenda/upcoming/
+    The materialized next-7-days agenda.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_profile(self):
+        # an agenda is only readable by the profile's own user
+        return get_object_or_404(
+            UserProfile,
+            pk=self.kwargs.get('profile_pk'),
+            user__id=self.kwargs.get('user_pk'),
+            user=self.request.user,
+        )
+
+    def _window(self):
+        bounds = []
+        for name in ('start', 'end'):
+            raw = self.request.query_params.get(name)
+            value = parse_datetime(raw) if raw else None
+            if raw and value is None:
+                raise ValidationError({name: 'Invalid datetime.'})
+            if value is not None and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            bounds.append(value)
+        start, end = bounds
+        start = start or timezone.now()
+        end = end or start + timedelta(days=UPCOMING_DAYS)
+        if end < start or end - start > MAX_AGENDA_WINDOW:
+            raise ValidationError({'end': f'Must be within {MAX_AGENDA_WINDOW.days} days after start.'})
+        return start, end
+
+    def list(self, request, *args, **kwargs):
+        profile = self.get_profile()
+        start, end = self._window()
+
+        def stream():
+            yield '['
+            for index, entry in enumerate(iter_agenda(profile.pk, start, end)):
+                data = json.dumps(AgendaEntrySerializer(entry).data, cls=DjangoJSONEncoder)
+                yield f',{data}' if index else data
+            yield ']'
+
+        return StreamingHttpResponse(stream(), content_type='application/json')
+
+    @action(detail=False, methods=['get'])
+    def upcoming(self, request, *args, **kwargs):
+        profile = self.get_profile()
+        entries = get_upcoming_agenda(profile.pk)
+        return Response(AgendaEntrySerializer(entries, many=True).data)
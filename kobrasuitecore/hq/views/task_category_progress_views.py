@@ -10,7 +10,9 @@ Date Updated:
 2025-03-16
 
 Description:
-(TEMP) Manages task category progress for users, handling completion and reward application
+(TEMP) Manages task category progress for users, handling completion and reward application.
+complete applies one task completion; complete_batch applies a list of them in order in one
+transaction and returns per-item results with the aggregate rewards.
 
 Input:
 (TEMP) User authentication, module/task parameters, and optional task data
@@ -28,9 +30,10 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
-from hq.models import TaskCategoryProgress
-from hq.serializers.task_category_progress_serializers import TaskCategoryProgressSerializer
-from hq.utils.task_utils import apply_task_rewards
+from hq.models import TaskCategoryProgress, UserProfile
+from hq.serializers.task_category_progress_serializers import TaskCategoryProgressSerializer, \
+    TaskCompletionBatchSerializer, TaskCompletionSerializer
+from hq.utils.task_utils import apply_task_rewards, apply_task_rewards_batch
 
 
 class TaskCategoryProgressViewSet(viewsets.ModelViewSet):
@@ -39,14 +42,30 @@ class TaskCategoryProgressViewSet(viewsets.ModelViewSet):
     # (TEMP) Serializer for task category progress data
     serializer_class = TaskCategoryProgressSerializer
     # (TEMP) Permission requiring authentication or read-only access, with owner/admin checks
-    permission_classes = (IsAuthenticatedOrReadOnly)
+    permission_classes = (IsAuthenticatedOrReadOnly,)
 
-    @action(methods=['post'], detail=True)
-    def complete(self, request, module, task_category_num, task_slot_id=-1, data=None):
-        # (TEMP) Retrieve user profile from request object
-        profile = getattr(request.user, 'user_profile', None)
+    def get_profile(self):
+        # completions are only applied to the requesting user's own profile
+        return get_object_or_404(UserProfile, pk=self.kwargs.get('profile_pk'), user=self.request.user)
+
+    @action(methods=['post'], detail=False, permission_classes=[IsAuthenticated])
+    def complete(self, request, *args, **kwargs):
+        # {"module": "F", "category_id": 1, "task_slot_id": 3, "data": {...}}
+        serializer = TaskCompletionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        item = serializer.validated_data
         # (TEMP) Apply task completion logic and reward calculation
-        return apply_task_rewards(profile, module, task_category_num, task_slot_id, data)
+        result = apply_task_rewards(self.get_profile(), item['module'], item['category_id'],
+                                    item['task_slot_id'], item['data'])
+        return Response(result)
+
+    @action(methods=['post'], detail=False, permission_classes=[IsAuthenticated])
+    def complete_batch(self, request, *args, **kwargs):
+        # {"completions": [{"module": "F", "category_id": 1, "task_slot_id": 3, "data": {...}}, ...]}
+        serializer = TaskCompletionBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results, totals = apply_task_rewards_batch(self.get_profile(), serializer.validated_data['completions'])
+        return Response({'results': results, 'totals': totals})
 
     # TODO: (JAKE, TASK VIEWS) Do we need these? These methods should already exist
 
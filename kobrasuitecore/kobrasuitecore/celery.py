@@ -1,2 +1,30 @@
+import os
+from celery import Celery
+from celery.schedules import crontab
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kobrasuitecore.settings')
+
+app = Celery('kobrasuitecore')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+
 CELERY_BEAT_SCHEDULE = {
-}
\ No newline at end of file
+    'score-portfolio-risk-nightly': {
+        'task': 'finances.tasks.score_portfolio_risk',
+        'schedule': crontab(hour=6, minute=0),
+    },
+    'snapshot-portfolio-valuations': {
+        'task': 'finances.tasks.snapshot_portfolio_valuations',
+        'schedule': crontab(minute='*/15', day_of_week='mon-fri'),
+    },
+    'downsample-portfolio-valuations-daily': {
+        'task': 'finances.tasks.downsample_portfolio_valuations',
+        'schedule': crontab(hour=8, minute=0),
+    },
+    'prune-stale-prediction-models-daily': {
+        'task': 'finances.tasks.prune_stale_prediction_models',
+        'schedule': crontab(hour=7, minute=0),
+    },
+}
+
+app.conf.beat_schedule = CELERY_BEAT_SCHEDULE
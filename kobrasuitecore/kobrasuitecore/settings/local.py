@@ -154,9 +154,52 @@ SWAGGER_SETTINGS = {
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 NEWS_API_KEY = os.getenv('NEWS_API_KEY')
 
+MARKET_DATA = {
+    'PROVIDER': os.getenv('MARKET_DATA_PROVIDER', 'finances.utils.market_data.YFinanceProvider'),
+    'CACHE_ALIAS': 'default',
+    'LRU_SIZE': 1024,
+    'MAX_WORKERS': 8,
+    'TTL': {
+        'quote': 15,
+        'info': 6 * 60 * 60,
+        'history': 15 * 60,
+        'closed_history': 24 * 60 * 60,
+    },
+}
+
+PREDICTION_TRAINING = {
+    'BACKEND': os.getenv('PREDICTION_TRAINING_BACKEND', 'thread'),
+    'MAX_WORKERS': int(os.getenv('PREDICTION_TRAINING_WORKERS', 0)) or None,
+}
+
+QUOTE_STREAM = {
+    'SOURCE': 'finances.utils.stock_utils.get_current_prices',
+    'INTERVAL': int(os.getenv('QUOTE_STREAM_INTERVAL', 5)),
+}
+
+VALUATION_SNAPSHOTS = {
+    'MARKET_HOURS_ONLY': os.getenv('VALUATION_SNAPSHOTS_MARKET_HOURS_ONLY', 'True') == 'True',
+    'RAW_DAYS': int(os.getenv('VALUATION_SNAPSHOTS_RAW_DAYS', 7)),
+}
+
 DJANGO_ALLOW_ASYNC_UNSAFE = True
 TESTING = os.getenv('TESTING') == 'True' or 'pytest' in os.getenv('PYTEST_CURRENT_TEST', '')
 
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', 6379)}/1")
+CELERY_RESULT_BACKEND = CELERY_BROKER_URL
+CELERY_TASK_ALWAYS_EAGER = TESTING
+CELERY_TASK_EAGER_PROPAGATES = TESTING
+
+HOMELIFE_CALENDAR_SYNC = {
+    'EAGER': TESTING,
+    'DEBOUNCE': int(os.getenv('HOMELIFE_CALENDAR_SYNC_DEBOUNCE', 2)),
+}
+
+HQ_TASK_CONFIG = {
+    'PATH': os.getenv('HQ_TASK_CONFIG_PATH', str(BASE_DIR.parent.parent / 'config' / 'task_config.json')),
+    'RELOAD_CHECK_SECONDS': int(os.getenv('HQ_TASK_CONFIG_RELOAD_CHECK_SECONDS', 5)),
+}
+
 if TESTING:
     CHANNEL_LAYERS = {
         'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'},
@@ -147,8 +147,49 @@ SWAGGER_SETTINGS = {
 }
 
 HIPOLABS_URL = 'http://universities.hipolabs.com/search'
+
+MARKET_DATA = {
+    'PROVIDER': os.getenv('MARKET_DATA_PROVIDER', 'finances.utils.market_data.YFinanceProvider'),
+    'CACHE_ALIAS': 'default',
+    'LRU_SIZE': 1024,
+    'MAX_WORKERS': 8,
+    'TTL': {
+        'quote': 15,
+        'info': 6 * 60 * 60,
+        'history': 15 * 60,
+        'closed_history': 24 * 60 * 60,
+    },
+}
+
+PREDICTION_TRAINING = {
+    'BACKEND': os.getenv('PREDICTION_TRAINING_BACKEND', 'process'),
+    'MAX_WORKERS': int(os.getenv('PREDICTION_TRAINING_WORKERS', 0)) or None,
+}
+
+QUOTE_STREAM = {
+    'SOURCE': 'finances.utils.stock_utils.get_current_prices',
+    'INTERVAL': int(os.getenv('QUOTE_STREAM_INTERVAL', 5)),
+}
+
+VALUATION_SNAPSHOTS = {
+    'MARKET_HOURS_ONLY': os.getenv('VALUATION_SNAPSHOTS_MARKET_HOURS_ONLY', 'True') == 'True',
+    'RAW_DAYS': int(os.getenv('VALUATION_SNAPSHOTS_RAW_DAYS', 7)),
+}
+
+HOMELIFE_CALENDAR_SYNC = {
+    'EAGER': os.getenv('HOMELIFE_CALENDAR_SYNC_EAGER') == 'True',
+    'DEBOUNCE': int(os.getenv('HOMELIFE_CALENDAR_SYNC_DEBOUNCE', 2)),
+}
+
+HQ_TASK_CONFIG = {
+    'PATH': os.getenv('HQ_TASK_CONFIG_PATH', str(BASE_DIR.parent.parent / 'config' / 'task_config.json')),
+    'RELOAD_CHECK_SECONDS': int(os.getenv('HQ_TASK_CONFIG_RELOAD_CHECK_SECONDS', 5)),
+}
 DJANGO_ALLOW_ASYNC_UNSAFE = os.getenv('DJANGO_ALLOW_ASYNC_UNSAFE')
 
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', 6379)}/1")
+CELERY_RESULT_BACKEND = CELERY_BROKER_URL
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
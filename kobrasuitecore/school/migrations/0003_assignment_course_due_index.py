@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0002_alter_studydocument_file'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['course', 'due_date'], name='school_assi_course__d5e768_idx'),
+        ),
+    ]
@@ -93,6 +93,9 @@ class Assignment(models.Model):
 
     class Meta:
         ordering = ['due_date']
+        indexes = [
+            models.Index(fields=['course', 'due_date']),
+        ]
 
     def __str__(self):
         return f'{self.title} ({self.course.title})'